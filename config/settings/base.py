@@ -1,5 +1,6 @@
 """Base settings to build other settings files upon."""
 
+import datetime
 import environ
 
 ROOT_DIR = environ.Path(__file__) - 3
@@ -22,7 +23,17 @@ USE_TZ = True
 DATABASES = {
     'default': env.db('DATABASE_URL'),
 }
-DATABASES['default']['ATOMIC_REQUESTS'] = True
+# Views decide which actions run in a transaction, see cride.utils.transactions.
+# Read actions run in autocommit, or in read only transactions on PostgreSQL.
+READ_ONLY_TRANSACTIONS = env.bool('READ_ONLY_TRANSACTIONS', default=False)
+# Read replica for list and retrieve actions, see cride.utils.replicas.
+if env('DATABASE_REPLICA_URL', default=None):
+    DATABASES['replica'] = env.db('DATABASE_REPLICA_URL')
+DATABASE_ROUTERS = ['cride.utils.replicas.ReplicaRouter']
+REPLICA_DATABASE = 'replica' if 'replica' in DATABASES else None
+REPLICA_ACTIONS = ('list', 'retrieve')
+# Seconds a user reads from the primary after writing, should exceed the replication lag.
+REPLICA_PIN_SECONDS = env.int('REPLICA_PIN_SECONDS', default=10)
 
 # URLs
 ROOT_URLCONF = 'config.urls'
@@ -59,11 +70,17 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 # Django REST Framework renderer settings
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
+        'cride.utils.renderers.FastJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ),
+    'DEFAULT_PARSER_CLASSES': (
+        'cride.utils.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'cride.users.authentication.CachedTokenAuthentication',
+        'cride.users.authentication.JWTAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 15
@@ -94,14 +111,23 @@ AUTH_PASSWORD_VALIDATORS = [
 
 # Middlewares
 MIDDLEWARE = [
+    'cride.utils.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'cride.utils.replicas.ReplicaMiddleware',
+    'cride.utils.middleware.AdminMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+# Only run for ADMIN_URL requests, the API doesn't use sessions.
+ADMIN_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+# The admin checks look for the session, authentication and messages
+# middleware in MIDDLEWARE only, they are in ADMIN_MIDDLEWARE.
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
 
 # Static files
 STATIC_ROOT = str(ROOT_DIR('staticfiles'))
@@ -153,6 +179,13 @@ X_FRAME_OPTIONS = 'DENY'
 
 # Email
 EMAIL_BACKEND = env('DJANGO_EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+EMAIL_OUTBOX_BATCH_SIZE = env.int('EMAIL_OUTBOX_BATCH_SIZE', default=100)
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
+# Seconds claimed emails are hidden from other batches while being sent.
+EMAIL_OUTBOX_CLAIM_TIMEOUT = 300
+# Seconds signups wait for the drain they queued, later signups share it.
+EMAIL_OUTBOX_DRAIN_DELAY = 5
 
 # Admin
 ADMIN_URL = 'admin/'
@@ -161,6 +194,38 @@ ADMINS = [
 ]
 MANAGERS = ADMINS
 
+# Authentication
+# Seconds the user behind an API token is cached.
+TOKEN_CACHE_TIMEOUT = env.int('TOKEN_CACHE_TIMEOUT', default=60)
+# Stateless JSON Web Tokens authentication, next to API tokens. Tokens are signed
+# with the key JWT_SIGNING_KEY_ID of JWT_SIGNING_KEYS (SECRET_KEY when empty),
+# see cride.users.tokens for key rotation.
+JWT_AUTH_ENABLED = env.bool('JWT_AUTH_ENABLED', default=False)
+JWT_SIGNING_KEYS = env.dict('JWT_SIGNING_KEYS', default={})
+JWT_SIGNING_KEY_ID = env('JWT_SIGNING_KEY_ID', default='default')
+JWT_ACCESS_TOKEN_LIFETIME = datetime.timedelta(minutes=env.int('JWT_ACCESS_TOKEN_MINUTES', default=15))
+JWT_REFRESH_TOKEN_LIFETIME = datetime.timedelta(days=env.int('JWT_REFRESH_TOKEN_DAYS', default=7))
+
+# Circles
+# Seconds a circle is kept in the shared slug name cache.
+CIRCLE_CACHE_TIMEOUT = env.int('CIRCLE_CACHE_TIMEOUT', default=60 * 10)
+# Seconds a user's membership is cached across requests, 0 disables it.
+MEMBERSHIP_CACHE_TIMEOUT = env.int('MEMBERSHIP_CACHE_TIMEOUT', default=0)
+# Seconds a cached API response is served.
+RESPONSE_CACHE_TIMEOUT = env.int('RESPONSE_CACHE_TIMEOUT', default=60 * 5)
+
+# Stats
+# Buffer rides stats increments in the cache, flushed by the worker. Needs
+# a cache shared with the worker, see cride.utils.counters.
+BUFFER_STATS_COUNTERS = env.bool('BUFFER_STATS_COUNTERS', default=True)
+
+# Instrumentation
+# Per request queries and timings, see cride.utils.instrumentation.
+INSTRUMENTATION_ENABLED = env.bool('INSTRUMENTATION_ENABLED', default=False)
+# Requests taking longer or making more queries are logged.
+INSTRUMENTATION_SLOW_REQUEST_MS = env.int('INSTRUMENTATION_SLOW_REQUEST_MS', default=500)
+INSTRUMENTATION_SLOW_REQUEST_QUERIES = env.int('INSTRUMENTATION_SLOW_REQUEST_QUERIES', default=20)
+
 # Celery
 INSTALLED_APPS += ['cride.taskapp.celery.CeleryAppConfig']
 if USE_TZ:
@@ -172,3 +237,8 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERYD_TASK_TIME_LIMIT = 5 * 60
 CELERYD_TASK_SOFT_TIME_LIMIT = 60
+# Redis redelivers tasks not acknowledged within the visibility timeout, ETA
+# tasks waiting in a worker included. Tasks are never scheduled more than
+# RIDE_EXPIRY_HORIZON ahead, see cride.taskapp.tasks.schedule_ride_expiry.
+CELERY_BROKER_TRANSPORT_OPTIONS = {'visibility_timeout': 2 * 60 * 60}
+RIDE_EXPIRY_HORIZON = datetime.timedelta(minutes=env.int('RIDE_EXPIRY_HORIZON_MINUTES', default=30))
@@ -22,6 +22,10 @@ CACHES = {
     }
 }
 
+# Stats
+# LocMemCache is per process, the worker would never see buffered increments.
+BUFFER_STATS_COUNTERS = env.bool('BUFFER_STATS_COUNTERS', default=False)
+
 # Templates
 TEMPLATES[0]['OPTIONS']['debug'] = DEBUG  # NOQA
 
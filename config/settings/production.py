@@ -9,8 +9,9 @@ ALLOWED_HOSTS = env.list('DJANGO_ALLOWED_HOSTS', default=['comparteride.com'])
 
 # Databases
 DATABASES['default'] = env.db('DATABASE_URL')  # NOQA
-DATABASES['default']['ATOMIC_REQUESTS'] = True  # NOQA
 DATABASES['default']['CONN_MAX_AGE'] = env.int('CONN_MAX_AGE', default=60)  # NOQA
+if 'replica' in DATABASES:  # NOQA
+    DATABASES['replica']['CONN_MAX_AGE'] = DATABASES['default']['CONN_MAX_AGE']  # NOQA
 
 # Cache
 CACHES = {
@@ -24,6 +25,9 @@ CACHES = {
     }
 }
 
+# Django REST Framework
+REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = ('cride.utils.renderers.FastJSONRenderer', )  # noqa F405
+
 # Security
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 SECURE_SSL_REDIRECT = env.bool('DJANGO_SECURE_SSL_REDIRECT', default=True)
@@ -86,7 +90,7 @@ ANYMAIL = {
 INSTALLED_APPS += ['gunicorn']  # noqa F405
 
 # WhiteNoise
-MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')  # noqa F405
+MIDDLEWARE.insert(2, 'whitenoise.middleware.WhiteNoiseMiddleware')  # noqa F405
 
 
 # Logging
@@ -131,6 +135,11 @@ LOGGING = {
             'level': 'ERROR',
             'handlers': ['console', 'mail_admins'],
             'propagate': True
+        },
+        'cride.instrumentation': {
+            'level': 'WARNING',
+            'handlers': ['console'],
+            'propagate': False
         }
     }
 }
@@ -4,13 +4,30 @@ With these settings, tests run faster.
 """
 
 from .base import *  # NOQA
-from .base import env
+from .base import env, ROOT_DIR
 
 # Base
 DEBUG = False
 SECRET_KEY = env("DJANGO_SECRET_KEY", default="7lEaACt4wsCj8JbXYgQLf4BmdG5QbuHTMYUGir2Gc1GHqqb2Pv8w9iXwwlIIviI2")
 TEST_RUNNER = "django.test.runner.DiscoverRunner"
 
+# Databases
+# Concurrency tests run threads against the test database,
+# in-memory SQLite databases can't be shared between them.
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":  # NOQA
+    DATABASES["default"]["TEST"] = {"NAME": str(ROOT_DIR("test.sqlite3"))}  # NOQA
+
+# Replica
+# A second SQLite database stands in for the replica, only used by tests
+# enabling REPLICA_DATABASE, which copy the rows they need into it.
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":  # NOQA
+    DATABASES["replica"] = dict(  # NOQA
+        DATABASES["default"],  # NOQA
+        NAME=str(ROOT_DIR("replica.sqlite3")),
+        TEST={"NAME": str(ROOT_DIR("test_replica.sqlite3"))},
+    )
+REPLICA_DATABASE = None
+
 # Cache
 CACHES = {
     "default": {
@@ -2,16 +2,18 @@
 
 # Django
 from django.contrib import admin
-from django.http import HttpResponse
 
 # Models
 from .models import Circle
-from cride.rides.models import Ride
 
-# Utils
-import csv
-import datetime
-from django.utils import timezone
+# Resolvers
+from .resolvers import invalidate_circle
+
+# Utilities
+from cride.utils.responses import invalidate_responses
+
+# Exports
+from cride.rides.exports import get_day_range, stream_rides_csv
 
 
 @admin.register(Circle)
@@ -36,6 +38,11 @@ class CircleAdmin(admin.ModelAdmin):
 
         queryset.update(is_verified=True)
 
+        for slug_name in queryset.values_list('slug_name', flat=True):
+            invalidate_circle(slug_name)
+
+        invalidate_responses('circles')
+
     make_verified.short_description = 'Make selected circles verified.'
 
     def make_unverified(self, request, queryset):
@@ -43,43 +50,18 @@ class CircleAdmin(admin.ModelAdmin):
 
         queryset.update(is_verified=False)
 
+        for slug_name in queryset.values_list('slug_name', flat=True):
+            invalidate_circle(slug_name)
+
+        invalidate_responses('circles')
+
     make_unverified.short_description = 'Make selected circles unverified.'
 
     def download_todays_rides(self, request, queryset):
         """ Return today's rides. """
 
-        now = timezone.now()
-        start = datetime.datetime(now.year, now.month, now.day, 0, 0, 0)
-        end = start + datetime.timedelta(days=1)
-        rides = Ride.objects.filter(offered_in__in=queryset.values_list('id'),
-                                    departure_date__gte=start,
-                                    departure_date__lte=end).order_by('departure_location')
-
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="rides.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow([
-            'id',
-            'passengers',
-            'departure_location',
-            'departure_date',
-            'arrival_location',
-            'arrival_date',
-            'rating'
-        ])
-
-        for ride in rides:
-            writer.writerow([
-                ride.pk,
-                ride.passengers.count(),
-                ride.departure_location,
-                str(ride.departure_date),
-                ride.arrival_location,
-                str(ride.arrival_date),
-                ride.rating
-            ])
-
-        return response
+        start, end = get_day_range()
+
+        return stream_rides_csv(queryset, start, end)
 
     download_todays_rides.short_description = 'Download todays rides'
@@ -9,3 +9,11 @@ class CirclesConfig(AppConfig):
 
     name = 'cride.circles'
     verbose_name = 'Circle'
+
+    def ready(self):
+        """ Register searchable fields and signals. """
+
+        from cride.circles import signals  # NOQA
+        from cride.utils import search
+
+        search.register(self.get_model('Circle'), ('slug_name', 'name'))
@@ -0,0 +1,151 @@
+""" Import circles command. """
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+# Models
+from cride.circles.models import Circle
+
+# Serializers
+from cride.circles.serializers import CircleImportSerializer
+
+# Resolvers
+from cride.circles.resolvers import invalidate_circle
+
+# Utilities
+import csv
+import time
+from cride.utils.responses import invalidate_responses
+
+
+UPDATE_FIELDS = (
+    'name',
+    'about',
+    'is_verified',
+    'is_public',
+    'is_limited',
+    'members_limit',
+    'modified',
+)
+
+
+def get_row_data(row):
+    """ Return the serializer data of a circles file row.
+
+    Columns: name, slug_name, is_public, verified, members_limit
+    and, optionally, about. A members limit of 0 means the
+    circle is not limited.
+    """
+
+    data = {
+        'name': row.get('name'),
+        'slug_name': row.get('slug_name'),
+        'is_public': row.get('is_public'),
+        'is_verified': row.get('verified'),
+    }
+
+    if row.get('about'):
+        data['about'] = row['about']
+
+    members_limit = (row.get('members_limit') or '').strip()
+    if members_limit not in ('', '0'):
+        data['is_limited'] = True
+        data['members_limit'] = members_limit
+
+    return data
+
+
+class Command(BaseCommand):
+    """ Create or update circles from a CSV file.
+
+    The file is streamed and rows are written in batches, circles
+    are matched by slug name. Invalid rows are reported and
+    skipped, the rest of the file is still imported.
+    """
+
+    help = 'Import circles from a CSV file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with a header row.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('The batch size must be positive.')
+
+        self.created = self.updated = self.errors = 0
+        started = time.monotonic()
+
+        try:
+            with open(options['path'], newline='', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                batch = {}
+
+                for row in reader:
+                    data = self.validate_row(reader.line_num, row)
+                    if data is None:
+                        continue
+
+                    # Later rows win over earlier ones for the same circle.
+                    batch[data['slug_name']] = data
+
+                    if len(batch) >= options['batch_size']:
+                        self.write_batch(batch)
+                        batch = {}
+
+                if batch:
+                    self.write_batch(batch)
+        except OSError as e:
+            raise CommandError(e)
+
+        elapsed = time.monotonic() - started
+        rows = self.created + self.updated
+
+        self.stdout.write(self.style.SUCCESS(
+            'Imported {} circles ({} created, {} updated), {} errors in {:.2f}s ({:.0f} rows/s).'.format(
+                rows, self.created, self.updated, self.errors, elapsed, rows / elapsed if elapsed else 0
+            )
+        ))
+
+    def validate_row(self, line, row):
+        """ Return the validated data of a row, or None reporting its errors. """
+
+        serializer = CircleImportSerializer(data=get_row_data(row))
+
+        if not serializer.is_valid():
+            self.errors += 1
+            self.stderr.write('Line {}: {}'.format(line, dict(serializer.errors)))
+            return None
+
+        data = dict(serializer.validated_data)
+        data.setdefault('members_limit', 0)
+
+        return data
+
+    def write_batch(self, batch):
+        """ Create or update the circles of a batch. """
+
+        now = timezone.now()
+
+        with transaction.atomic():
+            existing = {circle.slug_name: circle for circle in Circle.objects.filter(slug_name__in=batch.keys())}
+
+            for circle in existing.values():
+                for field, value in batch[circle.slug_name].items():
+                    setattr(circle, field, value)
+                circle.modified = now
+
+            Circle.objects.bulk_update(existing.values(), UPDATE_FIELDS)
+            Circle.objects.bulk_create([
+                Circle(**data) for slug_name, data in batch.items() if slug_name not in existing
+            ])
+
+        for slug_name in existing:
+            invalidate_circle(slug_name)
+
+        invalidate_responses('circles')
+
+        self.updated += len(existing)
+        self.created += len(batch) - len(existing)
@@ -1 +1,2 @@
 from .invitations import *
+from .memberships import *
@@ -2,9 +2,10 @@
 
 # Django
 from django.db import models
+from django.utils import timezone
 
 # Utilities
-import random
+import secrets
 from string import ascii_uppercase, digits
 
 
@@ -15,16 +16,68 @@ class InvitationManager(models.Manager):
     """
 
     CODE_LENGTH = 10
+    CODE_POOL = ascii_uppercase + digits + '.-'
+    BATCH_SIZE = 1000
+
+    def make_code(self):
+        """ Return a random code. """
+
+        return ''.join(secrets.choice(self.CODE_POOL) for _ in range(self.CODE_LENGTH))
 
     def create(self, **kwargs):
         """ Handle code cration. """
 
-        pool = ascii_uppercase + digits + '.-'
-        code = kwargs.get('code', ''.join(random.choices(pool, k=self.CODE_LENGTH)))
+        code = kwargs.get('code') or self.make_code()
 
         while self.filter(code=code).exists():
-            code = ''.join(random.choices(pool, k=self.CODE_LENGTH))
+            code = self.make_code()
 
         kwargs['code'] = code
 
         return super(InvitationManager, self).create(**kwargs)
+
+    def create_batch(self, issued_by, circle, count):
+        """ Create `count` invitations and return their codes.
+
+        Codes are checked and inserted a batch at a time instead
+        of probing each one, inserts ignore conflicts so codes
+        taken concurrently are just generated again.
+        """
+
+        codes = []
+
+        while len(codes) < count:
+            batch = set()
+            while len(batch) < min(count - len(codes), self.BATCH_SIZE):
+                batch.add(self.make_code())
+
+            batch -= set(self.filter(code__in=batch).values_list('code', flat=True))
+
+            self.bulk_create(
+                [self.model(code=code, issued_by=issued_by, circle=circle) for code in batch],
+                ignore_conflicts=True
+            )
+
+            codes.extend(self.filter(
+                code__in=batch,
+                issued_by=issued_by,
+                circle=circle
+            ).values_list('code', flat=True))
+
+        return codes
+
+    def redeem(self, invitation, user):
+        """ Mark the invitation as used by the user.
+
+        The invitation is claimed with a conditional update so
+        concurrent redemptions of a code can only succeed
+        once, return False if it was already used.
+        """
+
+        now = timezone.now()
+        redeemed = self.filter(pk=invitation.pk, used=False).update(used=True, used_by=user, used_at=now)
+
+        if redeemed:
+            invitation.used, invitation.used_by, invitation.used_at = True, user, now
+
+        return bool(redeemed)
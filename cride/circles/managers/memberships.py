@@ -0,0 +1,65 @@
+""" Circle memberships managers. """
+
+# Django
+from django.db import models, transaction
+from django.db.models import F, Q
+
+
+class MembershipManager(models.Manager):
+    """ Membership manager.
+
+    Keeps circles' `active_members_count` in sync with their
+    active memberships, memberships must be created, added
+    and deactivated through it.
+    """
+
+    def get_circles(self, **kwargs):
+        """ Return a queryset of the circles matching `kwargs`. """
+
+        return self.model._meta.get_field('circle').related_model.objects.filter(**kwargs)
+
+    def create(self, **kwargs):
+        """ Create the membership and count it in its circle. """
+
+        with transaction.atomic():
+            membership = super(MembershipManager, self).create(**kwargs)
+
+            if membership.is_active:
+                self.get_circles(pk=membership.circle_id).update(active_members_count=F('active_members_count') + 1)
+
+        return membership
+
+    def add_member(self, circle, **kwargs):
+        """ Create an active membership in the circle if it's below its members limit.
+
+        The circle's count is checked and incremented with a single
+        conditional update so concurrent joins can never exceed
+        the limit, return None if the circle is full.
+        """
+
+        with transaction.atomic():
+            added = self.get_circles(pk=circle.pk).filter(
+                Q(is_limited=False) | Q(active_members_count__lt=F('members_limit'))
+            ).update(active_members_count=F('active_members_count') + 1)
+
+            if not added:
+                return None
+
+            return super(MembershipManager, self).create(circle=circle, is_active=True, **kwargs)
+
+    def deactivate(self, membership):
+        """ Deactivate the membership, return False if it already was inactive. """
+
+        with transaction.atomic():
+            if not self.select_for_update().filter(pk=membership.pk, is_active=True).exists():
+                return False
+
+            membership.is_active = False
+            membership.save(update_fields=('is_active', 'modified'))
+
+            self.get_circles(
+                pk=membership.circle_id,
+                active_members_count__gt=0
+            ).update(active_members_count=F('active_members_count') - 1)
+
+        return True
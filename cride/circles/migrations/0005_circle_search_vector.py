@@ -0,0 +1,48 @@
+# Full text search indexes for PostgreSQL, see cride.utils.search.
+
+from django.db import migrations
+
+
+FORWARDS = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'ALTER TABLE circles_circle ADD COLUMN search_vector tsvector',
+    "UPDATE circles_circle SET search_vector = to_tsvector("
+    "'pg_catalog.simple', coalesce(slug_name, '') || ' ' || coalesce(name, ''))",
+    'CREATE TRIGGER circles_circle_search_vector_update '
+    'BEFORE INSERT OR UPDATE OF slug_name, name ON circles_circle '
+    "FOR EACH ROW EXECUTE PROCEDURE tsvector_update_trigger("
+    "search_vector, 'pg_catalog.simple', slug_name, name)",
+    'CREATE INDEX circles_circle_search_vector_idx ON circles_circle USING gin (search_vector)',
+    'CREATE INDEX circles_circle_slug_name_trgm_idx ON circles_circle USING gin (slug_name gin_trgm_ops)',
+    'CREATE INDEX circles_circle_name_trgm_idx ON circles_circle USING gin (name gin_trgm_ops)',
+]
+
+BACKWARDS = [
+    'DROP INDEX circles_circle_name_trgm_idx',
+    'DROP INDEX circles_circle_slug_name_trgm_idx',
+    'DROP INDEX circles_circle_search_vector_idx',
+    'DROP TRIGGER circles_circle_search_vector_update ON circles_circle',
+    'ALTER TABLE circles_circle DROP COLUMN search_vector',
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0004_invitation'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(FORWARDS), run(BACKWARDS)),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.2 on 2026-10-18 17:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0005_circle_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['circle', '-created'], name='memberships_listing_idx'),
+        ),
+    ]
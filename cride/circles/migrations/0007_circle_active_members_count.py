@@ -0,0 +1,40 @@
+# Generated by Django 2.2 on 2026-10-18 17:53
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_active_members(apps, schema_editor):
+    """ Backfill the members count of existing circles. """
+
+    Circle = apps.get_model('circles', 'Circle')
+    Membership = apps.get_model('circles', 'Membership')
+    db_alias = schema_editor.connection.alias
+
+    members = Membership.objects.using(db_alias).filter(
+        circle=OuterRef('pk'),
+        is_active=True
+    ).order_by().values('circle').annotate(total=Count('*')).values('total')
+
+    Circle.objects.using(db_alias).update(active_members_count=Coalesce(Subquery(members), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0006_membership_listing_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='circle',
+            name='active_members_count',
+            field=models.PositiveIntegerField(default=0, help_text='Maintained by the memberships manager, recomputed by the reconcile_stats command.'),
+        ),
+        migrations.AddIndex(
+            model_name='circle',
+            index=models.Index(condition=models.Q(is_public=True), fields=['-active_members_count', '-rides_offered', '-rides_taken'], name='circles_public_listing_idx'),
+        ),
+        migrations.RunPython(count_active_members, migrations.RunPython.noop),
+    ]
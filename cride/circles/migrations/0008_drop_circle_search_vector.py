@@ -0,0 +1,43 @@
+# Circles are searched through their trigram indexes only, see cride.utils.search.
+
+from django.db import migrations
+
+
+FORWARDS = [
+    'DROP INDEX circles_circle_search_vector_idx',
+    'DROP TRIGGER circles_circle_search_vector_update ON circles_circle',
+    'ALTER TABLE circles_circle DROP COLUMN search_vector',
+]
+
+BACKWARDS = [
+    'ALTER TABLE circles_circle ADD COLUMN search_vector tsvector',
+    "UPDATE circles_circle SET search_vector = to_tsvector("
+    "'pg_catalog.simple', coalesce(slug_name, '') || ' ' || coalesce(name, ''))",
+    'CREATE TRIGGER circles_circle_search_vector_update '
+    'BEFORE INSERT OR UPDATE OF slug_name, name ON circles_circle '
+    "FOR EACH ROW EXECUTE PROCEDURE tsvector_update_trigger("
+    "search_vector, 'pg_catalog.simple', slug_name, name)",
+    'CREATE INDEX circles_circle_search_vector_idx ON circles_circle USING gin (search_vector)',
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0007_circle_active_members_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(FORWARDS), run(BACKWARDS)),
+    ]
@@ -33,6 +33,10 @@ class Circle(CRideModel):
     # Stats
     rides_offered = models.PositiveIntegerField(default=0)
     rides_taken = models.PositiveIntegerField(default=0)
+    active_members_count = models.PositiveIntegerField(
+        default=0,
+        help_text='Maintained by the memberships manager, recomputed by the reconcile_stats command.'
+    )
 
     is_verified = models.BooleanField(
         'verified circle',
@@ -62,3 +66,12 @@ class Circle(CRideModel):
     class Meta(CRideModel.Meta):
         """ Meta class. """
         ordering = ['-rides_taken', '-rides_offered']
+
+        indexes = [
+            # Public circles listing.
+            models.Index(
+                fields=['-active_members_count', '-rides_offered', '-rides_taken'],
+                name='circles_public_listing_idx',
+                condition=models.Q(is_public=True),
+            ),
+        ]
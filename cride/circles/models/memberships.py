@@ -7,6 +7,9 @@ from django.db import models
 from cride.circles.models import Circle
 from cride.users.models import User, Profile
 
+# Managers
+from cride.circles.managers import MembershipManager
+
 # Utilities
 from cride.utils.models import CRideModel
 
@@ -49,8 +52,18 @@ class Membership(CRideModel):
         help_text='Only active users are allowed to interact in the circle.'
     )
 
+    # Manager
+    objects = MembershipManager()
+
     def __str__(self):
         """ Return username and circle. """
 
         return '@{username} at #{circle}'.format(user=self.user.username, circle=self.circle.slug_name)
-    
+
+    class Meta(CRideModel.Meta):
+        """ Meta class. """
+
+        indexes = [
+            # Circle members listing.
+            models.Index(fields=['circle', '-created'], name='memberships_listing_idx'),
+        ]
@@ -3,8 +3,8 @@
 # Django REST Framework
 from rest_framework.permissions import BasePermission
 
-# Models
-from cride.circles.models import Membership
+# Resolvers
+from cride.circles.resolvers import get_membership
 
 
 class IsCircleAdmin(BasePermission):
@@ -13,14 +13,6 @@ class IsCircleAdmin(BasePermission):
     def has_object_permission(self, request, view, obj):
         """ Verify user have a membership in the obj. """
 
-        try:
-            Membership.objects.get(
-                user=request.user,
-                circle=obj,
-                is_admin=True,
-                is_active=True
-            )
-        except Membership.DoesNotExist:
-            return False
+        membership = get_membership(request, obj)
 
-        return True
+        return membership is not None and membership.is_admin
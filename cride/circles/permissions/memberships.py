@@ -3,8 +3,8 @@
 # Django REST Framework
 from rest_framework.permissions import BasePermission
 
-# Models
-from cride.circles.models import Membership
+# Resolvers
+from cride.circles.resolvers import get_membership
 
 
 class IsActiveCircleMember(BasePermission):
@@ -15,16 +15,7 @@ class IsActiveCircleMember(BasePermission):
     """
 
     def has_permission(self, request, view):
-        try:
-            Membership.objects.get(
-                user=request.user,
-                circle=view.circle,
-                is_active=True
-            )
-        except Membership.DoesNotExist:
-            return False
-
-        return True
+        return get_membership(request, view.circle) is not None
 
 
 class IsSelfMember(BasePermission):
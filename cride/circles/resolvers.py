@@ -0,0 +1,140 @@
+""" Circle and membership resolution.
+
+Circle scoped views resolve the circle from the URL's slug name on
+every request. `get_circle` serves it from an in-process LRU cache
+layered over the shared cache, both dropped when the circle changes.
+
+Permissions and serializers of those views need the requesting user's
+membership in the circle. `get_membership` loads it once per request
+and, when `MEMBERSHIP_CACHE_TIMEOUT` is set, caches it across requests
+until the membership is saved or deleted.
+
+Only a few fields are cached, the rest are deferred and loaded
+from the database when accessed.
+"""
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+
+# Models
+from cride.circles.models import Circle, Membership
+
+# Utilities
+from cride.utils.cache import LRUCache
+
+
+# Cached fields, in model field order.
+CIRCLE_CACHED_FIELDS = ('id', 'name', 'slug_name', 'is_verified', 'is_public', 'is_limited', 'members_limit')
+MEMBERSHIP_CACHED_FIELDS = ('id', 'user_id', 'profile_id', 'circle_id', 'is_admin', 'is_active')
+
+local_circles = LRUCache(maxsize=1024, timeout=5)
+shared_circles_stats = {'hits': 0, 'misses': 0}
+
+
+def get_circle_cache_key(slug_name):
+    """ Return the shared cache key of a circle. """
+
+    return 'circles:slug:{}'.format(slug_name)
+
+
+def get_circle(slug_name):
+    """ Return the circle with the given slug name or raise Http404. """
+
+    values = local_circles.get(slug_name)
+
+    if values is None:
+        key = get_circle_cache_key(slug_name)
+        values = cache.get(key)
+
+        if values is None:
+            shared_circles_stats['misses'] += 1
+            values = Circle.objects.filter(slug_name=slug_name).values_list(*CIRCLE_CACHED_FIELDS).first()
+
+            if values is None:
+                raise Http404('No Circle matches the given query.')
+
+            cache.set(key, values, settings.CIRCLE_CACHE_TIMEOUT)
+        else:
+            shared_circles_stats['hits'] += 1
+
+        local_circles.set(slug_name, values)
+
+    return Circle.from_db(Circle.objects.db, CIRCLE_CACHED_FIELDS, values)
+
+
+def invalidate_circle(slug_name):
+    """ Remove a circle from this process' and the shared cache. """
+
+    local_circles.delete(slug_name)
+    cache.delete(get_circle_cache_key(slug_name))
+
+
+def get_circle_cache_stats():
+    """ Return hits, misses and hit ratio of both circle cache layers. """
+
+    shared_total = shared_circles_stats['hits'] + shared_circles_stats['misses']
+
+    return {
+        'local': local_circles.stats(),
+        'shared': dict(
+            shared_circles_stats,
+            hit_ratio=shared_circles_stats['hits'] / shared_total if shared_total else 0.0
+        ),
+    }
+
+
+def get_membership_cache_key(circle_id, user_id):
+    """ Return the cache key of a user's membership in a circle. """
+
+    return 'circles:membership:{}:{}'.format(circle_id, user_id)
+
+
+def load_membership(user, circle):
+    """ Return the user's active membership in the circle, or None. """
+
+    timeout = settings.MEMBERSHIP_CACHE_TIMEOUT
+    key = get_membership_cache_key(circle.pk, user.pk)
+
+    if timeout:
+        values = cache.get(key)
+        if values is not None:
+            return Membership.from_db(Membership.objects.db, MEMBERSHIP_CACHED_FIELDS, values) if values else None
+
+    values = Membership.objects.filter(
+        user=user,
+        circle=circle,
+        is_active=True
+    ).values_list(*MEMBERSHIP_CACHED_FIELDS).first()
+
+    if timeout:
+        cache.set(key, values or (), timeout)
+
+    return Membership.from_db(Membership.objects.db, MEMBERSHIP_CACHED_FIELDS, values) if values else None
+
+
+def get_membership(request, circle):
+    """ Return the requesting user's active membership in the circle, or None.
+
+    The membership is loaded once per request.
+    """
+
+    if not request.user.is_authenticated:
+        return None
+
+    memberships = getattr(request, '_circle_memberships', None)
+
+    if memberships is None:
+        memberships = request._circle_memberships = {}
+
+    if circle.pk not in memberships:
+        memberships[circle.pk] = load_membership(request.user, circle)
+
+    return memberships[circle.pk]
+
+
+def invalidate_membership(circle_id, user_id):
+    """ Remove a membership from the cross request cache. """
+
+    cache.delete(get_membership_cache_key(circle_id, user_id))
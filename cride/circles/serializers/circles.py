@@ -45,3 +45,26 @@ class CircleModelSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('If circle is limited, a member limit must be provided.')
 
         return data
+
+
+class CircleImportSerializer(CircleModelSerializer):
+    """ Circle import serializer.
+
+    Validates rows of a circles file with the same rules as
+    the API. Visibility and verification are writable, and
+    slug names aren't checked for uniqueness since existing
+    circles get updated.
+    """
+
+    slug_name = serializers.SlugField(max_length=40)
+    about = serializers.CharField(max_length=255, required=False)
+
+    class Meta(CircleModelSerializer.Meta):
+        """ Meta class. """
+
+        fields = (
+            'name', 'slug_name', 'about',
+            'is_verified', 'is_public',
+            'is_limited', 'members_limit',
+        )
+        read_only_fields = ()
@@ -1,5 +1,10 @@
 """ Memberships serializers. """
 
+# Django
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
 # Django REST Framework
 from rest_framework import serializers
 
@@ -10,7 +15,7 @@ from cride.users.serializers import UserModelSerializer
 from cride.circles.models import Membership, Invitation
 
 # Utilities
-import datetime
+from cride.utils.serializers import CompiledListSerializer, CompiledRepresentationMixin
 
 
 class MembershipModelSerializer(serializers.ModelSerializer):
@@ -37,6 +42,19 @@ class MembershipModelSerializer(serializers.ModelSerializer):
         )
 
 
+class MembershipReadSerializer(CompiledRepresentationMixin, MembershipModelSerializer):
+    """ Membership read serializer.
+
+    Renders like `MembershipModelSerializer` through a compiled
+    plan, used by list and detail responses.
+    """
+
+    class Meta(MembershipModelSerializer.Meta):
+        """ Meta class. """
+
+        list_serializer_class = CompiledListSerializer
+
+
 class AddMemberSerializer(serializers.Serializer):
     """ Add member serializer.
 
@@ -68,49 +86,41 @@ class AddMemberSerializer(serializers.Serializer):
                 circle=self.context['circle'],
                 used=False
             )
-        except Invitation.DoesNotExists:
+        except Invitation.DoesNotExist:
             raise serializers.ValidationError('Invalid invitation code.')
 
         self.context['invitation'] = invitation
 
         return data
 
-    def validate(self, attrs):
-        """ Verify circle is capable of accepting a new member. """
-
-        circle = self.context['circle']
-
-        if circle.is_limited and circle.members.count() >= circle.members_limit:
-            raise serializers.ValidationError('Circle has reached its member limit :(')
+    def create(self, validated_data):
+        """ Create new circle member.
 
-        return attrs
+        The invitation is redeemed, the member added and the
+        issuer's invitations updated in a single transaction.
+        """
 
-    def create(self, validated_data):
-        """ Create new circle member.  """
         circle = self.context['circle']
         invitation = self.context['invitation']
         user = validated_data['user']
 
-        now = datetime.datetime.now()
+        with transaction.atomic():
+            if not Invitation.objects.redeem(invitation, user):
+                raise serializers.ValidationError('Invalid invitation code.')
 
-        # Member creation
-        member = Membership.objects.create(
-            user=user,
-            profile=user.profile,
-            circle=circle,
-            invited_by=invitation.issued_by
-        )
+            member = Membership.objects.add_member(
+                circle,
+                user=user,
+                profile=user.profile,
+                invited_by=invitation.issued_by
+            )
+            if member is None:
+                raise serializers.ValidationError('Circle has reached its member limit :(')
 
-        # Update Invitation
-        invitation.used_by = user
-        invitation.used = True
-        invitation.used_at = now
-        invitation.save()
-
-        # Update issued data
-        issuer = Membership.objects.get(user=invitation.issued_by, circle=circle)
-        issuer.user_invitations += 1
-        issuer.remaining_invitations -= 1
-        issuer.save()
+            # Update issuer data
+            Membership.objects.filter(user=invitation.issued_by, circle=circle).update(
+                user_invitations=F('user_invitations') + 1,
+                remaining_invitations=Greatest(F('remaining_invitations') - 1, 0),
+            )
 
         return member
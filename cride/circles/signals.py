@@ -0,0 +1,56 @@
+""" Circles signals. """
+
+# Django
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+# Models
+from cride.circles.models import Circle, Membership
+
+# Resolvers
+from cride.circles.resolvers import invalidate_circle, invalidate_membership
+
+# Utilities
+from cride.utils.responses import invalidate_responses
+
+
+@receiver(pre_save, sender=Circle)
+def circle_slug_changed(sender, instance, **kwargs):
+    """ Drop the cached circle under its previous slug name. """
+
+    if instance.pk is None:
+        return
+
+    previous = Circle.objects.filter(pk=instance.pk).values_list('slug_name', flat=True).first()
+    if previous and previous != instance.slug_name:
+        invalidate_circle(previous)
+
+
+@receiver(post_save, sender=Circle)
+@receiver(post_delete, sender=Circle)
+def circle_changed(sender, instance, **kwargs):
+    """ Drop the cached circle and circles responses. """
+
+    invalidate_circle(instance.slug_name)
+    invalidate_responses('circles')
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def membership_changed(sender, instance, **kwargs):
+    """ Drop the cached membership and circles responses. """
+
+    invalidate_membership(instance.circle_id, instance.user_id)
+    invalidate_responses('circles')
+
+
+@receiver(post_delete, sender=Membership)
+def membership_deleted(sender, instance, **kwargs):
+    """ Stop counting a deleted active membership in its circle. """
+
+    if instance.is_active:
+        Circle.objects.filter(
+            pk=instance.circle_id,
+            active_members_count__gt=0
+        ).update(active_members_count=F('active_members_count') - 1)
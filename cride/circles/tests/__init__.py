@@ -1 +1,4 @@
-from .test_invitations import InvitationTestCase
+from .test_invitations import InvitationTestCase, InvitationRedemptionConcurrencyTestCase
+from .test_memberships import MembershipListAPITestCase, CircleCacheTestCase, MembersCountAPITestCase
+from .test_import import ImportCirclesTestCase
+from .test_circles import CircleListAPITestCase
@@ -0,0 +1,101 @@
+""" Circles tests. """
+
+# Django
+from django.core.cache import cache
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Model
+from rest_framework.authtoken.models import Token
+from cride.circles.models import Circle, Membership
+from cride.users.models import User, Profile
+
+# Utilities
+from cride.utils.responses import get_response_cache_stats, stats
+
+
+class CircleListAPITestCase(APITestCase):
+    """ Circle list API test case. """
+
+    def setUp(self):
+        cache.clear()
+        stats.clear()
+
+        self.circles = [
+            Circle.objects.create(
+                name='Facultad {}'.format(i),
+                slug_name='facultad-{}'.format(i),
+                about='Grupo oficial de la facultad {}'.format(i),
+            )
+            for i in range(3)
+        ]
+
+        self.user = User.objects.create(email='member@comparteride.com', username='member')
+        self.profile = Profile.objects.create(user=self.user)
+
+        # Auth
+        self.token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION='Token {}'.format(self.token))
+
+        # URL
+        self.url = '/circles/'
+
+    def join(self, circle, user=None):
+        """ Add an active membership to the circle. """
+
+        Membership.objects.create(user=user or self.user, profile=self.profile, circle=circle)
+
+    def test_ordering_by_members(self):
+        # Circles with more active members are listed first, once.
+
+        other = User.objects.create(email='other@comparteride.com', username='other')
+        self.join(self.circles[1])
+        self.join(self.circles[1], user=other)
+        self.join(self.circles[2])
+
+        response = self.client.get(self.url)
+
+        slug_names = [circle['slug_name'] for circle in response.data['results']]
+        self.assertEqual(slug_names, ['facultad-1', 'facultad-2', 'facultad-0'])
+
+    def test_cached_responses(self):
+        # Repeated requests are served from the cache.
+
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+        other_page = self.client.get(self.url, {'limit': 1})
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first['ETag'], second['ETag'])
+        self.assertEqual(len(other_page.data['results']), 1)
+        self.assertEqual(get_response_cache_stats('circles'), {'hits': 1, 'misses': 2, 'hit_ratio': 1 / 3})
+
+    def test_not_modified(self):
+        # A matching If-None-Match is answered with a 304.
+
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        response = self.client.get('/circles/facultad-0/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalidation(self):
+        # Circle and membership changes drop cached responses.
+
+        etag = self.client.get(self.url)['ETag']
+
+        self.join(self.circles[2])
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['slug_name'], 'facultad-2')
+
+        self.circles[2].name = 'Facultad de Ciencias'
+        self.circles[2].save()
+        response = self.client.get('/circles/facultad-2/')
+        self.assertEqual(response.data['name'], 'Facultad de Ciencias')
@@ -0,0 +1,75 @@
+""" Circles import tests. """
+
+# Django
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+
+# Model
+from cride.circles.models import Circle
+
+# Utilities
+import os
+import tempfile
+from io import StringIO
+
+
+class ImportCirclesTestCase(TestCase):
+    """ import_circles command test case. """
+
+    def import_circles(self, path, batch_size=1000):
+        """ Run the command, return its (stdout, stderr). """
+
+        out, err = StringIO(), StringIO()
+        call_command('import_circles', path, batch_size=batch_size, stdout=out, stderr=err)
+
+        return out.getvalue(), err.getvalue()
+
+    def write_file(self, content):
+        """ Return the path of a temporary CSV file holding `content`. """
+
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+
+        return path
+
+    def test_import_circles_file(self):
+        # The shipped circles file is imported in batches.
+
+        out, err = self.import_circles(os.path.join(str(settings.ROOT_DIR), 'circles.csv'), batch_size=7)
+
+        self.assertEqual(err, '')
+        self.assertIn('21 created', out)
+        self.assertEqual(Circle.objects.count(), 21)
+
+        circle = Circle.objects.get(slug_name='inventive')
+        self.assertTrue(circle.is_verified)
+        self.assertFalse(circle.is_public)
+        self.assertTrue(circle.is_limited)
+        self.assertEqual(circle.members_limit, 30)
+
+    def test_upsert_and_errors(self):
+        # Existing circles are updated and invalid rows skipped.
+
+        Circle.objects.create(name='Old', slug_name='inventive', about='Inventive', members_limit=0)
+
+        path = self.write_file(
+            'name,slug_name,is_public,verified,members_limit\n'
+            'Inventive,inventive,0,1,30\n'
+            'Sable Digital,not a slug,0,0,30\n'
+            'Tiny,tiny,1,0,5\n'
+            'Platzi,platzi,1,1,0\n'
+        )
+        out, err = self.import_circles(path)
+
+        self.assertIn('1 created, 1 updated), 2 errors', out)
+        self.assertIn('Line 3', err)
+        self.assertIn('Line 4', err)
+
+        circle = Circle.objects.get(slug_name='inventive')
+        self.assertEqual(circle.name, 'Inventive')
+        self.assertEqual(circle.about, 'Inventive')
+        self.assertEqual(circle.members_limit, 30)
+        self.assertFalse(Circle.objects.filter(slug_name__in=['tiny', 'not a slug']).exists())
@@ -1,10 +1,13 @@
 """ Invitations tests. """
 
 # Django
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 
 # Django REST Framework
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.test import APITestCase
 
 # Model
@@ -12,6 +15,13 @@ from rest_framework.authtoken.models import Token
 from cride.circles.models import Circle, Invitation, Membership
 from cride.users.models import User, Profile
 
+# Serializers
+from cride.circles.serializers import AddMemberSerializer
+
+# Utilities
+import threading
+from unittest import mock
+
 
 class InvitationTestCase(TestCase):
     """ Invitations manager test case. """
@@ -73,6 +83,18 @@ class InvitationTestCase(TestCase):
 
         self.assertNotEqual(code, invitation.code)
 
+    def test_batch_creation_retries_collisions(self):
+        # Codes colliding with existing ones are generated again.
+
+        taken = Invitation.objects.create(issued_by=self.user, circle=self.circle).code
+        codes = iter([taken, 'CODE1', 'CODE2', 'CODE3'])
+
+        with mock.patch.object(Invitation.objects, 'make_code', side_effect=lambda: next(codes)):
+            created = Invitation.objects.create_batch(issued_by=self.user, circle=self.circle, count=3)
+
+        self.assertEqual(sorted(created), ['CODE1', 'CODE2', 'CODE3'])
+        self.assertEqual(Invitation.objects.count(), 4)
+
 
 class MemberInvitationsAPITestCase(APITestCase):
     """ Member invitation API test case. """
@@ -132,3 +154,85 @@ class MemberInvitationsAPITestCase(APITestCase):
 
         for invitation in invitations:
             self.assertIn(invitation.code, request.data['invitations'])
+
+    def test_invitations_batch_creation(self):
+        # Invitations are inserted in a single batch.
+
+        url = '/circles/{}/members/{}/invitations/'.format(self.circle.slug_name, self.user.username)
+        self.client.get(url)
+
+        Invitation.objects.all().delete()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+
+        inserts = [query for query in queries if 'INSERT' in query['sql'] and '"circles_invitation"' in query['sql']]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Invitation.objects.count(), self.membership.remaining_invitations)
+
+
+class InvitationRedemptionConcurrencyTestCase(TransactionTestCase):
+    """ Invitation redemption under concurrent joins. """
+
+    CODES = 5
+    USERS = 10
+
+    def setUp(self):
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+        )
+
+        self.issuer = User.objects.create(email='issuer@comparteride.com', username='issuer')
+        Membership.objects.create(
+            user=self.issuer,
+            profile=Profile.objects.create(user=self.issuer),
+            circle=self.circle,
+            remaining_invitations=self.CODES
+        )
+
+        self.codes = Invitation.objects.create_batch(issued_by=self.issuer, circle=self.circle, count=self.CODES)
+        self.users = []
+        for i in range(self.USERS):
+            user = User.objects.create(email='user{}@comparteride.com'.format(i), username='user{}'.format(i))
+            Profile.objects.create(user=user)
+            self.users.append(user)
+
+    def test_exactly_once(self):
+        # Every code is redeemed once, even when contested.
+
+        barrier = threading.Barrier(self.USERS)
+        results = []
+
+        def join(user, code):
+            request = mock.Mock(user=user)
+            serializer = AddMemberSerializer(
+                data={'invitation_code': code},
+                context={'circle': self.circle, 'request': request}
+            )
+            barrier.wait()
+            try:
+                serializer.is_valid(raise_exception=True)
+                results.append(serializer.save())
+            except ValidationError:
+                results.append(None)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=join, args=(user, self.codes[i % self.CODES]))
+            for i, user in enumerate(self.users)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), self.USERS)
+        self.assertEqual(len([member for member in results if member]), self.CODES)
+        self.assertEqual(Membership.objects.filter(invited_by=self.issuer).count(), self.CODES)
+        self.assertFalse(Invitation.objects.filter(used=False).exists())
+
+        issuer = Membership.objects.get(user=self.issuer)
+        self.assertEqual(issuer.user_invitations, self.CODES)
+        self.assertEqual(issuer.remaining_invitations, 0)
@@ -0,0 +1,204 @@
+""" Memberships tests. """
+
+# Django
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.http import Http404
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Model
+from rest_framework.authtoken.models import Token
+from cride.circles.models import Circle, Invitation, Membership
+from cride.users.models import User, Profile
+
+# Resolvers
+from cride.circles.resolvers import get_circle, get_circle_cache_stats, local_circles
+
+# Utilities
+from io import StringIO
+
+
+class MembershipListAPITestCase(APITestCase):
+    """ Membership list API test case. """
+
+    def setUp(self):
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+        )
+
+        for i in range(5):
+            user = User.objects.create(email='member{}@comparteride.com'.format(i), username='member{}'.format(i))
+            profile = Profile.objects.create(user=user)
+            Membership.objects.create(user=user, profile=profile, circle=self.circle)
+
+        # Auth
+        self.user = User.objects.get(username='member0')
+        self.token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION='Token {}'.format(self.token))
+
+        # URL
+        self.url = '/circles/{}/members/'.format(self.circle.slug_name)
+
+    def test_keyset_pagination(self):
+        # Keyset pages list members newest first, like limit/offset pages.
+
+        expected = [member['user']['username'] for member in self.client.get(self.url).data['results']]
+        self.assertEqual(expected, ['member4', 'member3', 'member2', 'member1', 'member0'])
+
+        response = self.client.get(self.url, {'pagination': 'keyset', 'limit': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        usernames = [member['user']['username'] for member in response.data['results']]
+
+        response = self.client.get(response.data['next'])
+        usernames += [member['user']['username'] for member in response.data['results']]
+
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(usernames, expected)
+
+
+class CircleCacheTestCase(TestCase):
+    """ Circle slug name cache test case. """
+
+    def setUp(self):
+        cache.clear()
+        local_circles.clear()
+
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+        )
+
+    def test_circle_is_cached(self):
+        # Circles are queried once.
+
+        self.assertEqual(get_circle('fciencias'), self.circle)
+
+        with self.assertNumQueries(0):
+            circle = get_circle('fciencias')
+
+        self.assertEqual(circle.name, self.circle.name)
+        self.assertEqual(get_circle_cache_stats()['local']['hits'], 1)
+
+    def test_shared_cache(self):
+        # Other processes are served from the shared cache.
+
+        get_circle('fciencias')
+        local_circles.clear()
+
+        with self.assertNumQueries(0):
+            get_circle('fciencias')
+
+        self.assertEqual(get_circle_cache_stats()['shared']['hits'], 1)
+
+    def test_slug_change(self):
+        # Circles are no longer found under their previous slug name.
+
+        get_circle('fciencias')
+        self.circle.slug_name = 'ciencias'
+        self.circle.save()
+
+        with self.assertRaises(Http404):
+            get_circle('fciencias')
+
+        self.assertEqual(get_circle('ciencias').pk, self.circle.pk)
+
+    def test_unauthenticated_requests(self):
+        # Circles aren't resolved for requests that will be rejected.
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/circles/fciencias/members/')
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(any('circles_circle' in query['sql'] for query in context.captured_queries))
+
+
+class MembersCountAPITestCase(APITestCase):
+    """ Circle active members count test case. """
+
+    def setUp(self):
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+            is_limited=True,
+            members_limit=2,
+        )
+
+        self.admin = self.create_user('admin')
+        Membership.objects.create(
+            user=self.admin,
+            profile=self.admin.profile,
+            circle=self.circle,
+            is_admin=True,
+            remaining_invitations=10
+        )
+
+    def create_user(self, username):
+        """ Create a user with profile. """
+
+        user = User.objects.create(email='{}@comparteride.com'.format(username), username=username)
+        Profile.objects.create(user=user)
+
+        return user
+
+    def join(self, user):
+        """ Join the circle with a new invitation of the admin. """
+
+        code = Invitation.objects.create(issued_by=self.admin, circle=self.circle).code
+        token = Token.objects.get_or_create(user=user)[0].key
+        self.client.credentials(HTTP_AUTHORIZATION='Token {}'.format(token))
+
+        return self.client.post('/circles/{}/members/'.format(self.circle.slug_name), {'invitation_code': code})
+
+    def assertMembersCount(self, count):
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.active_members_count, count)
+
+    def test_members_limit(self):
+        # Joins are counted and rejected once the circle is full.
+
+        self.assertMembersCount(1)
+
+        response = self.join(self.create_user('member'))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertMembersCount(2)
+
+        response = self.join(self.create_user('late'))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertMembersCount(2)
+        self.assertFalse(Membership.objects.filter(user__username='late').exists())
+
+    def test_deactivation(self):
+        # Leaving the circle frees a place, only once.
+
+        member = self.create_user('member')
+        self.join(member)
+
+        url = '/circles/{}/members/member/'.format(self.circle.slug_name)
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertMembersCount(1)
+
+        membership = Membership.objects.get(user=member)
+        self.assertFalse(Membership.objects.deactivate(membership))
+        self.assertMembersCount(1)
+
+        membership.delete()
+        self.assertMembersCount(1)
+
+    def test_reconcile(self):
+        # The reconcile_stats command recomputes the count.
+
+        Circle.objects.update(active_members_count=0)
+        call_command('reconcile_stats', stdout=StringIO())
+
+        self.assertMembersCount(1)
@@ -11,14 +11,21 @@ from cride.circles.permissions import IsCircleAdmin
 from cride.circles.serializers import CircleModelSerializer
 
 # Filters
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
+from cride.utils.search import FullTextSearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
 # Models
 from cride.circles.models import Circle, Membership
 
+# Utilities
+from cride.utils.responses import ResponseCacheMixin
+from cride.utils.transactions import TransactionPolicyMixin
 
-class CircleViewSet(mixins.CreateModelMixin,
+
+class CircleViewSet(TransactionPolicyMixin,
+                    ResponseCacheMixin,
+                    mixins.CreateModelMixin,
                     mixins.RetrieveModelMixin,
                     mixins.UpdateModelMixin,
                     mixins.ListModelMixin,
@@ -27,11 +34,12 @@ class CircleViewSet(mixins.CreateModelMixin,
 
     serializer_class = CircleModelSerializer
     lookup_field = 'slug_name'
-    filter_backends = (SearchFilter, OrderingFilter, DjangoFilterBackend)
+    filter_backends = (FullTextSearchFilter, OrderingFilter, DjangoFilterBackend)
     search_fields = ('slug_name', 'name')
-    ordering_fields = ('rides_offered', 'rides_taken', 'name', 'created', 'member_limit')
-    ordering = ('-members__count', '-rides_offered', '-rides_taken')
+    ordering_fields = ('rides_offered', 'rides_taken', 'name', 'created', 'member_limit', 'active_members_count')
+    ordering = ('-active_members_count', '-rides_offered', '-rides_taken')
     filter_fields = ('is_verified', 'is_limited')
+    response_cache_namespace = 'circles'
 
     def get_queryset(self):
         """ Restrict list to public only. """
@@ -7,29 +7,43 @@ from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 
 # Serializers
-from cride.circles.serializers import MembershipModelSerializer, AddMemberSerializer
+from cride.circles.serializers import MembershipReadSerializer, AddMemberSerializer
 
 # Permissions
 from rest_framework.permissions import IsAuthenticated
 from cride.circles.permissions import IsActiveCircleMember, IsSelfMember
 
 # Models
-from cride.circles.models import Circle, Membership, Invitation
+from cride.circles.models import Membership, Invitation
 
+# Resolvers
+from cride.circles.resolvers import get_circle
 
-class MembershipViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, mixins.RetrieveModelMixin,
-                        mixins.DestroyModelMixin, viewsets.GenericViewSet):
+# Utilities
+from django.utils.functional import cached_property
+from cride.utils.pagination import KeysetOrLimitOffsetPagination
+from cride.utils.querysets import plan_queryset
+from cride.utils.transactions import TransactionPolicyMixin
+
+
+class MembershipViewSet(TransactionPolicyMixin, mixins.ListModelMixin, mixins.CreateModelMixin,
+                        mixins.RetrieveModelMixin, mixins.DestroyModelMixin, viewsets.GenericViewSet):
     """ Circle membership view set. """
 
-    serializer_class = MembershipModelSerializer
+    serializer_class = MembershipReadSerializer
+    pagination_class = KeysetOrLimitOffsetPagination
+    # Issues the missing invitations.
+    atomic_actions = ('invitations',)
 
-    def dispatch(self, request, *args, **kwargs):
-        """ Verify that the circle exists. """
+    @cached_property
+    def circle(self):
+        """ Verify that the circle exists.
 
-        slug_name = kwargs['slug_name']
-        self.circle = get_object_or_404(Circle, slug_name=slug_name)
+        Resolved on first use, unauthenticated
+        requests are rejected before.
+        """
 
-        return super(MembershipViewSet, self).dispatch(request, *args, **kwargs)
+        return get_circle(self.kwargs['slug_name'])
 
     def get_permissions(self):
         permission_classes = [IsAuthenticated]
@@ -44,10 +58,12 @@ class MembershipViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, mixins.R
     def get_queryset(self):
         """ Return circle members. """
 
-        return Membership.objects.filter(
+        queryset = Membership.objects.filter(
             circle=self.circle,
             is_active=True,
-        )
+        ).order_by('-created', '-id')
+
+        return plan_queryset(queryset, MembershipReadSerializer)
 
     def get_object(self):
         return get_object_or_404(
@@ -60,8 +76,7 @@ class MembershipViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, mixins.R
     def perform_destroy(self, instance):
         """ Disable membership. """
 
-        instance.is_active = False
-        instance.save()
+        Membership.objects.deactivate(instance)
 
     @action(detail=True, methods=['get'])
     def invitations(self, request, *args, **kwargs):
@@ -74,10 +89,9 @@ class MembershipViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, mixins.R
 
         member = self.get_object()
 
-        invited_members = Membership.objects.filter(
-            circle=self.circle,
-            invited_by=request.user,
-            is_active=True
+        invited_members = plan_queryset(
+            Membership.objects.filter(circle=self.circle, invited_by=request.user, is_active=True),
+            MembershipReadSerializer
         )
 
         unused_invitations = Invitation.objects.filter(
@@ -90,16 +104,15 @@ class MembershipViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, mixins.R
 
         invitations = [x[0] for x in unused_invitations]
 
-        for i in range(0, diff):
-            invitations.append(
-                Invitation.objects.create(
-                    issued_by=request.user,
-                    circle=self.circle
-                ).code
+        if diff > 0:
+            invitations += Invitation.objects.create_batch(
+                issued_by=request.user,
+                circle=self.circle,
+                count=diff
             )
 
         data = {
-            'used_invitations': MembershipModelSerializer(invited_members, many=True).data,
+            'used_invitations': MembershipReadSerializer(invited_members, many=True).data,
             'invitations': invitations
         }
 
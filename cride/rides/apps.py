@@ -9,3 +9,10 @@ class RidesConfig(AppConfig):
 
     name = 'cride.rides'
     verbose_name = 'Ride'
+
+    def ready(self):
+        """ Register searchable fields. """
+
+        from cride.utils import search
+
+        search.register(self.get_model('Ride'), ('departure_location', 'arrival_location'))
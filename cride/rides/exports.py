@@ -0,0 +1,103 @@
+""" Rides exports.
+
+Exports are streamed: rows are read through a server side cursor
+in chunks and written to the response as they come, so memory
+stays flat and the first bytes are sent right away no matter
+how many rides are exported.
+"""
+
+# Django
+from django.db.models import Count
+from django.http import StreamingHttpResponse
+
+# Models
+from cride.rides.models import Ride
+
+# Utilities
+import csv
+import datetime
+from django.utils import timezone
+
+
+RIDES_CSV_HEADER = (
+    'id',
+    'passengers',
+    'departure_location',
+    'departure_date',
+    'arrival_location',
+    'arrival_date',
+    'rating',
+)
+
+CHUNK_SIZE = 2000
+
+
+class Echo:
+    """ File-like object returning what is written instead of buffering it. """
+
+    def write(self, value):
+        return value
+
+
+def get_day_range(day=None):
+    """ Return the (start, end) aware datetimes of a day in the current timezone, today by default. """
+
+    day = day or timezone.localdate()
+    start = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+    return start, start + datetime.timedelta(days=1)
+
+
+def get_rides_export_queryset(circles, start, end):
+    """ Return the rows of the rides offered in `circles` departing in [start, end).
+
+    `circles` is a circles queryset or an iterable of primary keys.
+    Passengers are counted in the same query.
+    """
+
+    return Ride.objects.filter(
+        offered_in__in=circles,
+        departure_date__gte=start,
+        departure_date__lt=end,
+    ).order_by('departure_location', 'pk').annotate(
+        passengers_count=Count('passengers'),
+    ).values_list(
+        'pk',
+        'passengers_count',
+        'departure_location',
+        'departure_date',
+        'arrival_location',
+        'arrival_date',
+        'rating',
+    )
+
+
+def iter_rides_csv(queryset, chunk_size=CHUNK_SIZE):
+    """ Yield the CSV lines of an export queryset, header first. """
+
+    writer = csv.writer(Echo())
+
+    yield writer.writerow(RIDES_CSV_HEADER)
+
+    for pk, passengers, departure_location, departure_date, arrival_location, arrival_date, rating in \
+            queryset.iterator(chunk_size=chunk_size):
+        yield writer.writerow([
+            pk,
+            passengers,
+            departure_location,
+            str(departure_date),
+            arrival_location,
+            str(arrival_date),
+            rating,
+        ])
+
+
+def stream_rides_csv(circles, start, end, filename='rides.csv'):
+    """ Return a streaming CSV attachment of the rides of `circles` departing in [start, end). """
+
+    queryset = get_rides_export_queryset(circles, start, end)
+
+    response = StreamingHttpResponse(iter_rides_csv(queryset), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="{}"'.format(filename)
+
+    return response
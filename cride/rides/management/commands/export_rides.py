@@ -0,0 +1,59 @@
+""" Export rides command. """
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+# Models
+from cride.circles.models import Circle
+
+# Exports
+from cride.rides.exports import get_day_range, get_rides_export_queryset, iter_rides_csv
+
+
+def date(value):
+    """ Parse a YYYY-MM-DD argument. """
+
+    day = parse_date(value)
+    if day is None:
+        raise ValueError(value)
+
+    return day
+
+
+class Command(BaseCommand):
+    """ Stream rides as CSV.
+
+    Rides departing from the first day at 00:00 until the
+    end of the last day, both in the current timezone.
+    """
+
+    help = 'Export the rides of one or more circles as CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('circles', nargs='+', metavar='slug_name')
+        parser.add_argument('--start', type=date, help='First day, YYYY-MM-DD. Defaults to today.')
+        parser.add_argument('--end', type=date, help='Last day, YYYY-MM-DD. Defaults to the first day.')
+        parser.add_argument('--output', help='File to write to. Defaults to stdout.')
+
+    def handle(self, *args, **options):
+        circles = Circle.objects.filter(slug_name__in=options['circles'])
+
+        missing = set(options['circles']) - set(circles.values_list('slug_name', flat=True))
+        if missing:
+            raise CommandError('Circles not found: {}.'.format(', '.join(sorted(missing))))
+
+        start, _ = get_day_range(options['start'])
+        _, end = get_day_range(options['end'] or options['start'])
+        if end <= start:
+            raise CommandError('The end date must not be before the start date.')
+
+        queryset = get_rides_export_queryset(circles.values('pk'), start, end)
+        output = open(options['output'], 'w', newline='') if options['output'] else self.stdout
+
+        try:
+            for line in iter_rides_csv(queryset):
+                output.write(line)
+        finally:
+            if options['output']:
+                output.close()
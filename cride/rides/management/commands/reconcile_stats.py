@@ -0,0 +1,68 @@
+""" Reconcile stats command. """
+
+# Django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# Models
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+from cride.users.models import Profile
+
+# Utilities
+from cride.utils import counters
+
+
+def count_of(queryset, key):
+    """ Return a subquery counting the rows of `queryset` grouped by `key`. """
+
+    queryset = queryset.order_by().values(key).annotate(total=Count('*')).values('total')
+
+    return Coalesce(Subquery(queryset), 0)
+
+
+class Command(BaseCommand):
+    """ Recompute rides stats from the rides table.
+
+    Stats are buffered and flushed periodically, increments lost
+    before reaching the database are restored by this command.
+    Circles' active members count is recomputed as well.
+    """
+
+    help = 'Recompute circles, memberships and profiles rides stats, and circles members count.'
+
+    def handle(self, *args, **options):
+        # Pending increments would be counted twice once flushed.
+        counters.flush()
+
+        passengers = Ride.passengers.through.objects
+
+        with transaction.atomic():
+            circles = Circle.objects.update(
+                rides_offered=count_of(Ride.objects.filter(offered_in=OuterRef('pk')), 'offered_in'),
+                rides_taken=count_of(passengers.filter(ride__offered_in=OuterRef('pk')), 'ride__offered_in'),
+                active_members_count=count_of(
+                    Membership.objects.filter(circle=OuterRef('pk'), is_active=True),
+                    'circle'
+                ),
+            )
+            memberships = Membership.objects.update(
+                rides_offered=count_of(
+                    Ride.objects.filter(offered_in=OuterRef('circle'), offered_by=OuterRef('user')),
+                    'offered_by'
+                ),
+                rides_taken=count_of(
+                    passengers.filter(ride__offered_in=OuterRef('circle'), user=OuterRef('user')),
+                    'user'
+                ),
+            )
+            profiles = Profile.objects.update(
+                rides_offered=count_of(Ride.objects.filter(offered_by=OuterRef('user')), 'offered_by'),
+                rides_taken=count_of(passengers.filter(user=OuterRef('user')), 'user'),
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            'Reconciled {} circles, {} memberships and {} profiles.'.format(circles, memberships, profiles)
+        ))
@@ -0,0 +1,250 @@
+""" Seed load data command. """
+
+# Django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+# Models
+from cride.circles.models import Circle, Invitation, Membership
+from cride.rides.models import Ride
+from cride.users.models import User, Profile
+
+# Utilities
+import datetime
+import os
+import random
+import time
+
+
+PASSWORD = 'comparteride123'
+
+
+class Command(BaseCommand):
+    """ Generate a synthetic dataset to measure the API at scale.
+
+    Circles are imported from the circles file, then topped up with
+    generated ones. Users join random circles, respecting members
+    limits, offer rides in them and invite each other. Rides depart
+    over the next month, some are already finished.
+
+    Rows are inserted with `bulk_create`, so no signals are sent and
+    stats are recomputed with `reconcile_stats` at the end. Users are
+    verified and share the password `comparteride123`. Runs are
+    reproducible with `--seed`; use another `--prefix` to seed
+    more data in the same database.
+    """
+
+    help = 'Generate users, circles, memberships, invitations and rides for load testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--circles', type=int, default=50, help='Total circles, including the imported ones.')
+        parser.add_argument('--circles-file', default=str(settings.ROOT_DIR('circles.csv')))
+        parser.add_argument('--memberships-per-user', type=int, default=3)
+        parser.add_argument('--rides-per-circle', type=int, default=50)
+        parser.add_argument('--passengers-per-ride', type=int, default=2)
+        parser.add_argument('--invitations-per-member', type=int, default=2)
+        parser.add_argument('--prefix', default='load', help='Prefix of the generated usernames and slug names.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, help="Rows per insert. Defaults to the database's maximum.")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] is not None and options['batch_size'] < 1:
+            raise CommandError('The batch size must be positive.')
+
+        self.options = options
+        self.random = random.Random(options['seed'])
+        self.now = timezone.now()
+        started = time.monotonic()
+
+        if User.objects.filter(username__startswith='{}-'.format(options['prefix'])).exists():
+            raise CommandError('Data with prefix "{}" was already seeded.'.format(options['prefix']))
+
+        if options['circles_file'] and os.path.exists(options['circles_file']):
+            call_command('import_circles', options['circles_file'], stdout=self.stdout, stderr=self.stderr)
+
+        with transaction.atomic():
+            circles = self.create_circles()
+            users = self.create_users()
+            members = self.create_memberships(users, circles)
+            rides = self.create_rides(members)
+            invitations = self.create_invitations(members)
+
+        call_command('reconcile_stats', stdout=self.stdout)
+
+        self.stdout.write(self.style.SUCCESS(
+            'Seeded {} users, {} circles, {} memberships, {} rides and {} invitations in {:.2f}s.'.format(
+                len(users), len(circles), sum(len(users) for users in members.values()),
+                rides, invitations, time.monotonic() - started
+            )
+        ))
+
+    def bulk_create(self, model, objs):
+        """ Insert objects in batches. """
+
+        return model.objects.bulk_create(objs, batch_size=self.options['batch_size'])
+
+    def create_circles(self):
+        """ Create the missing circles and return all of them. """
+
+        missing = self.options['circles'] - Circle.objects.count()
+
+        self.bulk_create(Circle, [
+            Circle(
+                name='Load circle {}'.format(i),
+                slug_name='{}-circle-{}'.format(self.options['prefix'], i),
+                about='Generated circle for load testing.',
+                is_verified=self.random.random() < 0.5,
+                is_public=self.random.random() < 0.8,
+            )
+            for i in range(max(missing, 0))
+        ])
+
+        return list(Circle.objects.order_by('pk'))
+
+    def create_users(self):
+        """ Create verified users with their profiles. """
+
+        password = make_password(PASSWORD)
+        prefix = self.options['prefix']
+
+        self.bulk_create(User, [
+            User(
+                username='{}-{}'.format(prefix, i),
+                email='{}-{}@comparteride.com'.format(prefix, i),
+                first_name='Load',
+                last_name=str(i),
+                password=password,
+                is_verified=True,
+            )
+            for i in range(self.options['users'])
+        ])
+
+        # Primary keys aren't set by bulk_create on every backend.
+        users = list(User.objects.filter(username__startswith='{}-'.format(prefix)).order_by('pk'))
+        self.bulk_create(Profile, [Profile(user=user) for user in users])
+        self.profiles = dict(Profile.objects.filter(user__in=users).values_list('user_id', 'pk'))
+
+        return users
+
+    def create_memberships(self, users, circles):
+        """ Join users to random circles, return the members of each circle. """
+
+        members = {circle.pk: [] for circle in circles}
+        counts = dict.fromkeys(members, 0)
+        counts.update(
+            Membership.objects.filter(is_active=True).order_by().values_list('circle').annotate(total=Count('*'))
+        )
+        memberships = []
+
+        for user in users:
+            sample = self.random.sample(circles, min(self.options['memberships_per_user'], len(circles)))
+
+            for circle in sample:
+                if circle.is_limited and counts[circle.pk] >= circle.members_limit:
+                    continue
+
+                invited_by = self.random.choice(members[circle.pk]) if members[circle.pk] else None
+                counts[circle.pk] += 1
+                members[circle.pk].append(user)
+                memberships.append(Membership(
+                    user=user,
+                    profile_id=self.profiles[user.pk],
+                    circle=circle,
+                    is_admin=invited_by is None,
+                    invited_by=invited_by,
+                    remaining_invitations=self.options['invitations_per_member'],
+                ))
+
+        self.bulk_create(Membership, memberships)
+
+        return members
+
+    def create_rides(self, members):
+        """ Create rides offered by the members of each circle, return how many. """
+
+        rides = []
+        # Passengers of each ride, in insertion order.
+        passengers = []
+
+        for circle_pk, users in members.items():
+            if not users:
+                continue
+
+            for i in range(self.options['rides_per_circle']):
+                finished = self.random.random() < 0.2
+                days = -self.random.uniform(1, 30) if finished else self.random.uniform(0.1, 30)
+                departure = self.now + datetime.timedelta(days=days)
+
+                # Drivers don't ride with themselves, seats left are sampled after passengers.
+                driver = self.random.choice(users)
+                count = min(self.options['passengers_per_ride'], len(users) - 1)
+                sample = self.random.sample(users, min(count + 1, len(users)))
+                passengers.append([user for user in sample if user.pk != driver.pk][:count])
+
+                rides.append(Ride(
+                    offered_by=driver,
+                    offered_in_id=circle_pk,
+                    available_seats=self.random.randint(1, 4),
+                    comments='Generated ride {}.'.format(i),
+                    departure_location='Origin {}'.format(self.random.randint(1, 100)),
+                    departure_date=departure,
+                    arrival_location='Destination {}'.format(self.random.randint(1, 100)),
+                    arrival_date=departure + datetime.timedelta(hours=self.random.uniform(0.5, 3)),
+                    is_active=not finished,
+                ))
+
+        self.bulk_create(Ride, rides)
+
+        # Read the inserted rides back, in insertion order, to add their passengers.
+        prefix = '{}-'.format(self.options['prefix'])
+        Passenger = Ride.passengers.through
+        pks = Ride.objects.filter(offered_by__username__startswith=prefix).order_by('pk').values_list('pk', flat=True)
+
+        self.bulk_create(Passenger, [
+            Passenger(ride_id=ride_pk, user=user)
+            for ride_pk, users in zip(pks.iterator(), passengers)
+            for user in users
+        ])
+
+        return len(rides)
+
+    def create_invitations(self, members):
+        """ Create each member's invitations, marking the ones used by invited members, return how many. """
+
+        invitations = []
+        used = {}
+
+        for circle_pk, users in members.items():
+            for user in users:
+                for i in range(self.options['invitations_per_member']):
+                    invitations.append(Invitation(
+                        code=Invitation.objects.make_code(),
+                        issued_by=user,
+                        circle_id=circle_pk,
+                    ))
+
+        invited = Membership.objects.filter(
+            circle_id__in=members,
+            user__username__startswith='{}-'.format(self.options['prefix']),
+            invited_by__isnull=False,
+        ).values_list('circle_id', 'invited_by_id', 'user_id')
+
+        for circle_pk, issuer_pk, user_pk in invited:
+            used.setdefault((circle_pk, issuer_pk), []).append(user_pk)
+
+        for invitation in invitations:
+            users = used.get((invitation.circle_id, invitation.issued_by.pk))
+            if users:
+                invitation.used = True
+                invitation.used_by_id = users.pop()
+                invitation.used_at = self.now
+
+        self.bulk_create(Invitation, invitations)
+
+        return len(invitations)
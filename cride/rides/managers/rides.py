@@ -0,0 +1,42 @@
+""" Rides managers. """
+
+# Django
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+
+
+class RideManager(models.Manager):
+    """ Ride manager.
+
+    Used to handle seat reservations.
+    """
+
+    def reserve_seat(self, ride, passenger):
+        """ Take a seat in the ride for the passenger.
+
+        The passenger is added first, so concurrent joins of the same
+        passenger collide on the passengers' unique constraint, then
+        the seat is taken with a conditional update so concurrent
+        reservations can never overbook the ride. Return False if
+        there were no seats left and None if the passenger already
+        was in the ride, nothing is changed in both cases.
+        """
+
+        Passenger = self.model.passengers.through
+
+        try:
+            with transaction.atomic():
+                Passenger.objects.create(ride_id=ride.pk, user_id=passenger.pk)
+
+                reserved = self.filter(
+                    pk=ride.pk,
+                    available_seats__gte=1
+                ).update(available_seats=F('available_seats') - 1)
+
+                if not reserved:
+                    transaction.set_rollback(True)
+                    return False
+        except IntegrityError:
+            return None
+
+        return True
@@ -0,0 +1,17 @@
+# Generated by Django 2.2 on 2026-10-18 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ride',
+            index=models.Index(condition=models.Q(('available_seats__gte', 1), ('is_active', True)), fields=['offered_in', 'departure_date'], name='rides_available_idx'),
+        ),
+    ]
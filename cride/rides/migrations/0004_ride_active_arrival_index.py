@@ -0,0 +1,17 @@
+# Generated by Django 2.2 on 2026-10-18 17:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0003_ride_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ride',
+            index=models.Index(condition=models.Q(is_active=True), fields=['arrival_date'], name='rides_active_arrival_idx'),
+        ),
+    ]
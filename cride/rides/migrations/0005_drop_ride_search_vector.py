@@ -0,0 +1,43 @@
+# Rides are searched through their trigram indexes only, see cride.utils.search.
+
+from django.db import migrations
+
+
+FORWARDS = [
+    'DROP INDEX rides_ride_search_vector_idx',
+    'DROP TRIGGER rides_ride_search_vector_update ON rides_ride',
+    'ALTER TABLE rides_ride DROP COLUMN search_vector',
+]
+
+BACKWARDS = [
+    'ALTER TABLE rides_ride ADD COLUMN search_vector tsvector',
+    "UPDATE rides_ride SET search_vector = to_tsvector("
+    "'pg_catalog.simple', coalesce(departure_location, '') || ' ' || coalesce(arrival_location, ''))",
+    'CREATE TRIGGER rides_ride_search_vector_update '
+    'BEFORE INSERT OR UPDATE OF departure_location, arrival_location ON rides_ride '
+    "FOR EACH ROW EXECUTE PROCEDURE tsvector_update_trigger("
+    "search_vector, 'pg_catalog.simple', departure_location, arrival_location)",
+    'CREATE INDEX rides_ride_search_vector_idx ON rides_ride USING gin (search_vector)',
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0004_ride_active_arrival_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(FORWARDS), run(BACKWARDS)),
+    ]
@@ -7,6 +7,9 @@ from django.db import models
 from cride.circles.models import Circle
 from cride.users.models import User
 
+# Managers
+from cride.rides.managers import RideManager
+
 # Utilities
 from cride.utils.models import CRideModel
 
@@ -35,6 +38,27 @@ class Ride(models.Model):
         help_text='Used for disabling the ride or making it as finished.'
     )
 
+    # Manager
+    objects = RideManager()
+
+    class Meta:
+        """ Meta class. """
+
+        indexes = [
+            # Upcoming rides listing, scoped by circle.
+            models.Index(
+                fields=['offered_in', 'departure_date'],
+                name='rides_available_idx',
+                condition=models.Q(is_active=True, available_seats__gte=1),
+            ),
+            # Finished rides sweep.
+            models.Index(
+                fields=['arrival_date'],
+                name='rides_active_arrival_idx',
+                condition=models.Q(is_active=True),
+            ),
+        ]
+
     def __str__(self):
         return '{_from} to {to} | {day} {i_time} - {f_time}'.format(
             _from=self.departure_location,
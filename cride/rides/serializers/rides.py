@@ -4,16 +4,24 @@
 from rest_framework import serializers
 
 # Models
-from cride.circles.models import Membership
+from cride.circles.models import Circle, Membership
 from cride.rides.models import Ride
-from cride.users.models import User
+from cride.users.models import User, Profile
 
 # Serializers
 from cride.users.serializers import UserModelSerializer
 
+# Resolvers
+from cride.circles.resolvers import get_membership
+
+# Tasks
+from cride.taskapp.tasks import schedule_ride_expiry
+
 # Utilities
 import datetime
 from django.utils import timezone
+from cride.utils import counters
+from cride.utils.serializers import CompiledListSerializer, CompiledRepresentationMixin
 
 
 class CreateRideSerializer(serializers.ModelSerializer):
@@ -50,12 +58,9 @@ class CreateRideSerializer(serializers.ModelSerializer):
         if self.context['request'].user != data['offered_by']:
             raise serializers.ValidationError('Rides offered on behalf of others are not allowed.')
 
-        user = data['offered_by']
-        circle = self.context['circle']
+        membership = get_membership(self.context['request'], self.context['circle'])
 
-        try:
-            membership = Membership.objects.get(user=user, circle=circle, is_active=True)
-        except Membership.DoesNotExists:
+        if membership is None:
             raise serializers.ValidationError('User is not an active member of the circle.')
 
         if data['arrival_date'] <= data['departure_date']:
@@ -69,20 +74,12 @@ class CreateRideSerializer(serializers.ModelSerializer):
 
         circle = self.context['circle']
         ride = Ride.objects.create(**data, offered_in=circle)
+        schedule_ride_expiry(ride)
 
-        # Circle
-        circle.rides_offered += 1
-        circle.save()
-
-        # Membership
-        membership = self.context['membership']
-        membership.rides_offered += 1
-        membership.save()
-
-        # Profile
-        profile = data['offered_by'].profile
-        profile.rides_offered += 1
-        profile.save()
+        # Stats
+        counters.increment(Circle, circle.pk, rides_offered=1)
+        counters.increment(Membership, self.context['membership'].pk, rides_offered=1)
+        counters.increment(Profile, self.context['membership'].profile_id, rides_offered=1)
 
         return data
 
@@ -114,7 +111,26 @@ class RideModelSerializer(serializers.ModelSerializer):
         if instance.departure_date <= now:
             raise serializers.ValidationError('Ongoing rides cannot be modified.')
 
-        return super(RideModelSerializer, self).update(instance, validated_data)
+        arrival_date = instance.arrival_date
+        instance = super(RideModelSerializer, self).update(instance, validated_data)
+
+        if instance.arrival_date != arrival_date:
+            schedule_ride_expiry(instance)
+
+        return instance
+
+
+class RideReadSerializer(CompiledRepresentationMixin, RideModelSerializer):
+    """ Ride read serializer.
+
+    Renders like `RideModelSerializer` through a compiled plan,
+    used by list and detail responses.
+    """
+
+    class Meta(RideModelSerializer.Meta):
+        """ Meta class. """
+
+        list_serializer_class = CompiledListSerializer
 
 
 class JoinRideSerializer(serializers.ModelSerializer):
@@ -131,16 +147,21 @@ class JoinRideSerializer(serializers.ModelSerializer):
     def validate_passenger(self, data):
         """ Verify passenger exists and is a circle member. """
 
-        try:
-            user = User.objects.get(pk=data)
-        except User.DoesNotExists:
-            raise serializers.ValidationError('Invalid passenger.')
-
+        request = self.context['request']
         circle = self.context['circle']
 
-        try:
-            member = Membership.objects.get(user=user, circle=circle, is_active=True)
-        except Membership.DoesNotExists:
+        if data == request.user.pk:
+            user = request.user
+            member = get_membership(request, circle)
+        else:
+            try:
+                user = User.objects.get(pk=data)
+            except User.DoesNotExist:
+                raise serializers.ValidationError('Invalid passenger.')
+
+            member = Membership.objects.filter(user=user, circle=circle, is_active=True).first()
+
+        if member is None:
             raise serializers.ValidationError('User is not an active member of the circle.')
 
         self.context['user'] = user
@@ -159,7 +180,7 @@ class JoinRideSerializer(serializers.ModelSerializer):
         if ride.available_seats < 1:
             raise serializers.ValidationError('Ride is already full!.')
 
-        if Ride.objects.filter(passengers__pk=attrs['passenger']):
+        if ride.passengers.filter(pk=attrs['passenger']).exists():
             raise serializers.ValidationError('Passenger is already in this trip.')
 
         return attrs
@@ -171,21 +192,19 @@ class JoinRideSerializer(serializers.ModelSerializer):
         circle = self.context['circle']
         user = self.context['user']
 
-        ride.passengers.add(user)
+        reserved = Ride.objects.reserve_seat(ride, user)
 
-        # Profile
-        profile = user.profile
-        profile.rides_taken += 1
-        profile.save()
+        if reserved is None:
+            raise serializers.ValidationError('Passenger is already in this trip.')
+        if not reserved:
+            raise serializers.ValidationError('Ride is already full!.')
 
-        # Membership
-        member = self.context['member']
-        member.rides_taken += 1
-        member.save()
+        ride.refresh_from_db(fields=('available_seats', ))
 
-        # Circle
-        circle.rides_taken += 1
-        circle.save()
+        # Stats
+        counters.increment(Circle, circle.pk, rides_taken=1)
+        counters.increment(Membership, self.context['member'].pk, rides_taken=1)
+        counters.increment(Profile, self.context['member'].profile_id, rides_taken=1)
 
         return validated_data
 
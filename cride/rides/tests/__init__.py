@@ -0,0 +1,13 @@
+from .test_rides import RideListAPITestCase, RideQueryPlanTestCase
+from .test_join import RideJoinAPITestCase, SeatReservationConcurrencyTestCase
+from .test_stats import StatsCountersTestCase
+from .test_search import RideSearchAPITestCase
+from .test_expiry import RideExpiryTestCase
+from .test_exports import RideExportTestCase
+from .test_serializers import ReadSerializersTestCase
+from .test_renderers import FastJSONRendererTestCase
+from .test_instrumentation import InstrumentationMiddlewareTestCase
+from .test_benchmarks import APIBenchmarkTestCase, ReadTransactionBenchmarkTestCase
+from .test_seed import SeedLoadDataTestCase
+from .test_transactions import TransactionPolicyTestCase
+from .test_replicas import ReplicaRoutingTestCase, ReplicaDisabledTestCase
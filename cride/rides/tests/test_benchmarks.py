@@ -0,0 +1,745 @@
+""" API hot paths benchmarks.
+
+Opt-in, run with `BENCHMARKS=1 pytest cride/rides/tests/test_benchmarks.py`
+against data generated by `seed_load_data`. Each benchmark records the
+queries made and the median time of `BENCHMARKS_ROUNDS` rounds, then
+compares them with `benchmarks.json`: queries must not grow and times
+must stay within `BENCHMARKS_TOLERANCE` times the baseline's. Some
+also record their operations per second, derived from the median
+time, or their peak memory, compared like times.
+
+Benchmarks of the old implementations run next to the new ones, like
+`ride_search_icontains` next to `ride_search_full_text`. The largest
+datasets, 200k rides or 50k members, take about a minute to seed.
+
+Timings depend on the machine, run with `BENCHMARKS=update` to store
+the current results as the new baseline.
+"""
+
+# Django
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
+from django.test import RequestFactory, TestCase, TransactionTestCase
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+
+# Model
+from rest_framework.authtoken.models import Token
+from cride.circles.models import Circle, Invitation, Membership
+from cride.rides.models import Ride
+from cride.users.models import OutboxEmail, Profile, User
+
+# Views
+from cride.rides.views.rides import RideViewSet
+from cride.users.views.users import UserViewSet
+
+# Authentication
+from cride.users.authentication import CachedTokenAuthentication
+
+# Resolvers
+from cride.circles.resolvers import get_circle, local_circles
+
+# Serializers
+from cride.circles.serializers import MembershipModelSerializer, MembershipReadSerializer
+from cride.rides.serializers import RideModelSerializer, RideReadSerializer
+
+# Tasks
+from cride.taskapp.tasks import drain_email_outbox, gen_verification_token, send_confirmation_email
+
+# Pagination
+from cride.utils.pagination import KeysetPagination
+
+# Exports
+from cride.rides.exports import stream_rides_csv
+
+# Utilities
+import datetime
+import io
+import json
+import os
+import statistics
+import threading
+import time
+import tracemalloc
+import unittest
+from unittest import mock
+from django.utils import timezone
+from cride.rides.tests.test_join import create_member, create_ride
+from cride.utils import counters, renderers
+from cride.utils.querysets import plan_queryset
+from cride.utils.responses import invalidate_responses
+
+
+BENCHMARKS = os.environ.get('BENCHMARKS')
+ROUNDS = int(os.environ.get('BENCHMARKS_ROUNDS', 10))
+TOLERANCE = float(os.environ.get('BENCHMARKS_TOLERANCE', 2))
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'benchmarks.json')
+
+# Every middleware on every route, as before `ADMIN_MIDDLEWARE`.
+FULL_MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+
+class QueryCounter:
+    """ Execute wrapper counting queries.
+
+    Unlike `CaptureQueriesContext`, not bounded by the size of the
+    connection's queries log.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class BenchmarkMixin:
+    """ Measure benchmarks and compare them with the baseline. """
+
+    results = {}
+
+    @classmethod
+    def setUpClass(cls):
+        # pytest sets up skipped test case classes, don't seed their data.
+        if not BENCHMARKS:
+            raise unittest.SkipTest('Set BENCHMARKS=1 to run benchmarks.')
+
+        super(BenchmarkMixin, cls).setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super(BenchmarkMixin, cls).tearDownClass()
+
+        if BENCHMARKS == 'update' and cls.results:
+            baseline = cls.load_baseline()
+            baseline.update(cls.results)
+            with open(BASELINE_PATH, 'w') as f:
+                json.dump(baseline, f, indent=2, sort_keys=True)
+                f.write('\n')
+
+    @classmethod
+    def load_baseline(cls):
+        """ Return the stored results. """
+
+        try:
+            with open(BASELINE_PATH) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def measure(self, name, func, setup=None, operations=None, rounds=None):
+        """ Run and time a benchmark, then compare it with the baseline.
+
+        With the `operations` each round performs, their rate per second
+        is recorded as well. Slow benchmarks can run fewer `rounds`.
+        """
+
+        durations = []
+
+        for i in range(min(rounds or ROUNDS, ROUNDS)):
+            args = (setup() or ()) if setup else ()
+
+            queries = QueryCounter()
+            with connection.execute_wrapper(queries):
+                start = time.perf_counter()
+                func(*args)
+                durations.append(time.perf_counter() - start)
+
+        result = {'queries': queries.count, 'median_ms': round(statistics.median(durations) * 1000, 2)}
+        if operations:
+            result['per_second'] = round(operations / statistics.median(durations))
+        self.results[name] = result
+
+        baseline = self.load_baseline().get(name)
+        if BENCHMARKS == 'update' or baseline is None:
+            return
+
+        self.assertLessEqual(
+            result['queries'], baseline['queries'],
+            '{} made {} queries, {} in the baseline.'.format(name, result['queries'], baseline['queries'])
+        )
+        self.assertLessEqual(
+            result['median_ms'], baseline['median_ms'] * TOLERANCE,
+            '{} took {}ms, {}ms in the baseline.'.format(name, result['median_ms'], baseline['median_ms'])
+        )
+
+    def measure_memory(self, name, func):
+        """ Record the peak memory allocated running a benchmark, then compare it with the baseline. """
+
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        result = self.results.setdefault(name, {})
+        result['peak_kb'] = round(peak / 1024)
+
+        baseline = self.load_baseline().get(name, {})
+        if BENCHMARKS == 'update' or 'peak_kb' not in baseline:
+            return
+
+        self.assertLessEqual(
+            result['peak_kb'], baseline['peak_kb'] * TOLERANCE,
+            '{} allocated {}KB, {}KB in the baseline.'.format(name, result['peak_kb'], baseline['peak_kb'])
+        )
+
+    def get(self, url):
+        """ GET a URL expecting a successful response. """
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+@unittest.skipUnless(BENCHMARKS, 'Set BENCHMARKS=1 to run benchmarks.')
+class APIBenchmarkTestCase(BenchmarkMixin, APITestCase):
+    """ API hot paths benchmarks. """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'seed_load_data',
+            users=500,
+            circles=30,
+            rides_per_circle=50,
+            stdout=io.StringIO(),
+        )
+
+        # The busiest circle and one of its generated members.
+        cls.circle = Circle.objects.order_by('-active_members_count').first()
+        memberships = Membership.objects.filter(
+            circle=cls.circle,
+            is_active=True,
+            user__username__startswith='load-',
+        ).select_related('user')
+        cls.user = memberships[0].user
+        cls.other = memberships[1].user
+
+    def setUp(self):
+        cache.clear()
+
+        self.token = Token.objects.get_or_create(user=self.user)[0].key
+        self.client.credentials(HTTP_AUTHORIZATION='Token {}'.format(self.token))
+
+        # URLs
+        self.rides_url = '/circles/{}/rides/'.format(self.circle.slug_name)
+        self.members_url = '/circles/{}/members/'.format(self.circle.slug_name)
+
+    def test_ride_list(self):
+        self.measure('ride_list', lambda: self.get(self.rides_url))
+
+    def test_ride_create(self):
+        departure = timezone.now() + datetime.timedelta(days=1)
+        data = {
+            'available_seats': 3,
+            'departure_location': 'CU',
+            'departure_date': departure,
+            'arrival_location': 'Santa Fe',
+            'arrival_date': departure + datetime.timedelta(hours=1),
+        }
+
+        def create():
+            response = self.client.post(self.rides_url, data)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.measure('ride_create', create)
+
+    def test_ride_join(self):
+        def setup():
+            departure = timezone.now() + datetime.timedelta(days=1)
+            ride = Ride.objects.create(
+                offered_by=self.other,
+                offered_in=self.circle,
+                available_seats=3,
+                departure_location='CU',
+                departure_date=departure,
+                arrival_location='Santa Fe',
+                arrival_date=departure + datetime.timedelta(hours=1),
+            )
+            return ('{}{}/join/'.format(self.rides_url, ride.pk),)
+
+        def join(url):
+            response = self.client.post(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.measure('ride_join', join, setup)
+
+    def test_circle_resolution(self):
+        # The circle of circle scoped URLs, from each cache layer and the database.
+        slug_name = self.circle.slug_name
+        lookups = 1000
+
+        def local():
+            for i in range(lookups):
+                get_circle(slug_name)
+
+        def shared():
+            for i in range(lookups):
+                local_circles.clear()
+                get_circle(slug_name)
+
+        def database():
+            for i in range(lookups):
+                get_object_or_404(Circle, slug_name=slug_name)
+
+        self.measure('circle_resolution_local', local, operations=lookups)
+        self.measure('circle_resolution_shared', shared, operations=lookups)
+        self.measure('circle_resolution_database', database, operations=lookups)
+
+    def test_ride_list_unauthenticated(self):
+        # Rejected before the circle is resolved.
+        def get():
+            self.assertEqual(self.client.get(self.rides_url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials()
+        self.measure('ride_list_unauthenticated', get)
+
+    def test_circle_list(self):
+        self.measure('circle_list', lambda: self.get('/circles/'), lambda: invalidate_responses('circles'))
+
+    def test_membership_list(self):
+        self.measure('membership_list', lambda: self.get(self.members_url))
+
+    def test_invitations(self):
+        url = '{}{}/invitations/'.format(self.members_url, self.user.username)
+        self.measure('invitations', lambda: self.get(url))
+
+    def test_invitations_batch(self):
+        # Batched codes against creating them one at a time, as before `create_batch`.
+        for count in (10, 1000, 100000):
+            rounds = 1 if count > 1000 else None
+
+            def create_batch():
+                Invitation.objects.create_batch(issued_by=self.user, circle=self.circle, count=count)
+
+            def create_each():
+                for i in range(count):
+                    Invitation.objects.create(issued_by=self.user, circle=self.circle)
+
+            self.measure('invitations_batch_{}'.format(count), create_batch, operations=count, rounds=rounds)
+            self.measure('invitations_each_{}'.format(count), create_each, operations=count, rounds=rounds)
+
+    def test_login(self):
+        data = {'email': self.user.email, 'password': 'comparteride123'}
+
+        def login():
+            response = self.client.post('/users/login/', data)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.client.credentials()
+        self.measure('login', login)
+
+    def test_middleware(self):
+        # A cached response, so the middleware stack weighs the most.
+        url = '/circles/'
+        self.get(url)
+
+        with self.settings(MIDDLEWARE=FULL_MIDDLEWARE):
+            self.client = self.client_class()
+            self.client.credentials(HTTP_AUTHORIZATION='Token {}'.format(self.token))
+            self.measure('middleware_full', lambda: self.get(url))
+
+        self.client = self.client_class()
+        self.client.credentials(HTTP_AUTHORIZATION='Token {}'.format(self.token))
+        self.measure('middleware_api', lambda: self.get(url))
+
+    def test_serializers(self):
+        # Compiled read serializers against the model serializers they extend.
+        context = {'request': RequestFactory().get('/')}
+        rides = list(plan_queryset(Ride.objects.filter(offered_in=self.circle), RideReadSerializer))
+        memberships = list(plan_queryset(Membership.objects.filter(circle=self.circle), MembershipReadSerializer))
+
+        for name, model_serializer, read_serializer, instances in (
+            ('rides', RideModelSerializer, RideReadSerializer, rides),
+            ('memberships', MembershipModelSerializer, MembershipReadSerializer, memberships),
+        ):
+            reference = 'serializer_{}_model'.format(name)
+            compiled = 'serializer_{}_read'.format(name)
+            self.measure(reference, lambda: model_serializer(instances, many=True, context=context).data)
+            self.measure(compiled, lambda: read_serializer(instances, many=True, context=context).data)
+            self.assertLess(self.results[compiled]['median_ms'], self.results[reference]['median_ms'])
+
+    @unittest.skipUnless(renderers.orjson, 'orjson is not installed.')
+    def test_renderers(self):
+        # orjson against DRF's encoder, on the busiest circle's rides.
+        rides = plan_queryset(Ride.objects.filter(offered_in=self.circle), RideReadSerializer)
+        data = RideReadSerializer(rides, many=True, context={'request': RequestFactory().get('/')}).data
+
+        self.measure('renderer_rides_drf', lambda: JSONRenderer().render(data))
+        self.measure('renderer_rides_orjson', lambda: renderers.FastJSONRenderer().render(data))
+        self.assertLess(
+            self.results['renderer_rides_orjson']['median_ms'],
+            self.results['renderer_rides_drf']['median_ms']
+        )
+
+    def test_token_authentication(self):
+        # Cached token lookups against DRF's, per request and alone.
+        url = '/users/{}/'.format(self.user.username)
+        lookups = 1000
+
+        def authenticate(authentication):
+            for i in range(lookups):
+                authentication.authenticate_credentials(self.token)
+
+        self.measure('token_authentication', lambda: self.get(url))
+        self.measure(
+            'token_authentication_lookups',
+            lambda: authenticate(CachedTokenAuthentication()),
+            operations=lookups
+        )
+
+        with mock.patch.object(UserViewSet, 'authentication_classes', (TokenAuthentication,)):
+            self.measure('token_authentication_database', lambda: self.get(url))
+        self.measure(
+            'token_authentication_database_lookups',
+            lambda: authenticate(TokenAuthentication()),
+            operations=lookups
+        )
+
+
+@unittest.skipUnless(BENCHMARKS, 'Set BENCHMARKS=1 to run benchmarks.')
+class LargeCircleBenchmarkTestCase(BenchmarkMixin, APITestCase):
+    """ Rides listings of a circle with `RIDES` rides.
+
+    Deep pages start past `DEEP_PAGE` - 1 pages. Seeding takes
+    about a minute on SQLite.
+    """
+
+    RIDES = 200000
+    DEEP_PAGE = 10000
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'seed_load_data',
+            users=200,
+            circles=1,
+            circles_file='',
+            memberships_per_user=1,
+            rides_per_circle=cls.RIDES,
+            passengers_per_ride=1,
+            invitations_per_member=0,
+            stdout=io.StringIO(),
+        )
+
+        cls.circle = Circle.objects.get()
+        cls.user = Membership.objects.filter(circle=cls.circle).select_related('user')[0].user
+
+    def setUp(self):
+        cache.clear()
+
+        self.client.force_authenticate(self.user)
+        self.rides_url = '/circles/{}/rides/'.format(self.circle.slug_name)
+
+    def test_ride_search(self):
+        # Full text search against DRF's icontains filters.
+        url = '{}?search=Destination+42'.format(self.rides_url)
+
+        self.measure('ride_search_full_text', lambda: self.get(url))
+
+        with mock.patch.object(RideViewSet, 'filter_backends', (SearchFilter, OrderingFilter)):
+            self.measure('ride_search_icontains', lambda: self.get(url))
+
+    def test_ride_export(self):
+        # Every ride of the circle, streamed.
+        start = timezone.now() - datetime.timedelta(days=31)
+        end = timezone.now() + datetime.timedelta(days=31)
+
+        def setup():
+            return (stream_rides_csv(Circle.objects.all(), start, end),)
+
+        # Closing responses sends request_finished, which closes the connection.
+        def first_row(response):
+            content = iter(response.streaming_content)
+            next(content)  # Header
+            next(content)
+
+        def export(response=None):
+            for line in (response or setup()[0]).streaming_content:
+                pass
+
+        self.measure('ride_export_first_row', first_row, setup)
+        self.measure('ride_export', export, setup, operations=self.RIDES)
+        self.measure_memory('ride_export', export)
+
+    def get_cursor(self, offset):
+        """ Return the keyset cursor of the rides listing page starting at `offset`. """
+
+        paginator = KeysetPagination()
+        queryset = Ride.objects.filter(
+            offered_in=self.circle,
+            departure_date__gte=timezone.now() + datetime.timedelta(minutes=10),
+            is_active=True,
+            available_seats__gte=1,
+        )
+        ordering = paginator.get_ordering(queryset.order_by(*RideViewSet.ordering))
+        last = queryset.order_by(*ordering)[offset - 1]
+
+        return paginator.encode_cursor([
+            paginator.get_model_field(queryset, name).value_from_object(last) for name in ordering
+        ])
+
+    def test_ride_pagination(self):
+        # First and deep pages, keyset against limit/offset.
+        offset = (self.DEEP_PAGE - 1) * settings.REST_FRAMEWORK['PAGE_SIZE']
+        cursor = self.get_cursor(offset)
+
+        self.measure('ride_page_first_limit_offset', lambda: self.get(self.rides_url))
+        self.measure('ride_page_first_keyset', lambda: self.get('{}?pagination=keyset'.format(self.rides_url)))
+        self.measure('ride_page_deep_limit_offset', lambda: self.get('{}?offset={}'.format(self.rides_url, offset)))
+        self.measure('ride_page_deep_keyset', lambda: self.get('{}?cursor={}'.format(self.rides_url, cursor)))
+
+
+@unittest.skipUnless(BENCHMARKS, 'Set BENCHMARKS=1 to run benchmarks.')
+class CrowdedCircleBenchmarkTestCase(BenchmarkMixin, APITestCase):
+    """ Members of a circle with `MEMBERS` members.
+
+    Compares `active_members_count` with counting memberships, as
+    adding members and listing circles did before.
+    """
+
+    MEMBERS = 50000
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'seed_load_data',
+            users=cls.MEMBERS,
+            circles=1,
+            circles_file='',
+            memberships_per_user=1,
+            rides_per_circle=0,
+            invitations_per_member=0,
+            stdout=io.StringIO(),
+        )
+
+        Circle.objects.update(is_limited=True, members_limit=cls.MEMBERS * 2)
+        cls.circle = Circle.objects.get()
+
+    def setUp(self):
+        self.users = iter(range(ROUNDS))
+        self.memberships = iter(Membership.objects.filter(circle=self.circle, is_active=True)[:ROUNDS * 2])
+
+    def create_user(self):
+        """ Return a new user with profile, not a member yet. """
+
+        username = 'joining-{}'.format(next(self.users))
+        user = User.objects.create(email='{}@comparteride.com'.format(username), username=username)
+
+        return user, Profile.objects.create(user=user)
+
+    def test_add_member(self):
+        def add_member(user, profile):
+            self.assertIsNotNone(Membership.objects.add_member(self.circle, user=user, profile=profile))
+
+        def add_member_counting(user, profile):
+            # Counted every membership of the circle, then created it.
+            circle = Circle.objects.get(pk=self.circle.pk)
+            self.assertLess(circle.members.count(), circle.members_limit)
+            Membership._base_manager.create(circle=circle, user=user, profile=profile)
+
+        self.measure('member_add', add_member, self.create_user)
+        self.users = iter(range(ROUNDS, ROUNDS * 2))
+        self.measure('member_add_counting', add_member_counting, self.create_user)
+
+    def test_deactivate_member(self):
+        def deactivate():
+            self.assertTrue(Membership.objects.deactivate(next(self.memberships)))
+
+        def deactivate_saving():
+            # Saved the whole membership, circles were counted when listed.
+            membership = next(self.memberships)
+            membership.is_active = False
+            membership.save()
+
+        self.measure('member_deactivate', deactivate)
+        self.measure('member_deactivate_saving', deactivate_saving)
+
+    def test_circle_list_order(self):
+        def ordered():
+            list(Circle.objects.filter(is_public=True).order_by('-active_members_count')[:15])
+
+        def counted():
+            list(Circle.objects.filter(is_public=True).annotate(
+                members_count=Count('membership', filter=Q(membership__is_active=True))
+            ).order_by('-members_count')[:15])
+
+        self.measure('circle_list_members_count', ordered)
+        self.measure('circle_list_members_counting', counted)
+
+
+@unittest.skipUnless(BENCHMARKS, 'Set BENCHMARKS=1 to run benchmarks.')
+class EmailOutboxBenchmarkTestCase(BenchmarkMixin, TestCase):
+    """ Account verification emails delivery with the locmem email backend.
+
+    The outbox is drained in batches over one connection, before it
+    each email was sent by its own task, minus the 30 seconds sleep.
+    """
+
+    EMAILS = 500
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create([
+            User(username='user{}'.format(i), email='user{}@comparteride.com'.format(i))
+            for i in range(cls.EMAILS)
+        ])
+        cls.users = list(User.objects.all())
+
+    def test_email_delivery(self):
+        def enqueue():
+            for user in self.users:
+                send_confirmation_email(user)
+
+        def drain():
+            drain_email_outbox()
+            self.assertFalse(OutboxEmail.objects.filter(sent_at__isnull=True).exists())
+
+        def send_each():
+            # The former task, once per user.
+            for user in self.users:
+                user = User.objects.get(pk=user.pk)
+                content = render_to_string('emails/users/account_verification.html', {
+                    'user': user,
+                    'token': gen_verification_token(user),
+                })
+                msg = EmailMultiAlternatives(
+                    'Welcome @{}! Verify your account to start using Comparte Ride'.format(user.username),
+                    content,
+                    'Comparte Ride <noreply@comparteride.com>',
+                    [user.email],
+                )
+                msg.attach_alternative(content, 'text/html')
+                msg.send()
+
+        self.measure('email_outbox_drain', drain, enqueue, operations=self.EMAILS)
+        self.measure('email_send_each', send_each, operations=self.EMAILS)
+
+
+@unittest.skipUnless(BENCHMARKS, 'Set BENCHMARKS=1 to run benchmarks.')
+class ReadTransactionBenchmarkTestCase(BenchmarkMixin, TransactionTestCase):
+    """ Read actions with and without a transaction per request.
+
+    Not wrapped in a transaction, so transactions really begin and commit.
+    """
+
+    def setUp(self):
+        call_command('seed_load_data', users=100, circles=5, rides_per_circle=50, stdout=io.StringIO())
+
+        circle = Circle.objects.order_by('-active_members_count').first()
+        user = Membership.objects.filter(circle=circle, is_active=True).select_related('user')[0].user
+
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        self.url = '/circles/{}/rides/'.format(circle.slug_name)
+
+    def test_ride_list(self):
+        settings_dict = connection.settings_dict
+
+        self.measure('ride_list_autocommit', lambda: self.get(self.url))
+
+        with mock.patch.dict(settings_dict, ATOMIC_REQUESTS=True):
+            self.measure('ride_list_atomic_requests', lambda: self.get(self.url))
+
+
+@unittest.skipUnless(BENCHMARKS, 'Set BENCHMARKS=1 to run benchmarks.')
+class StatsCountersBenchmarkTestCase(BenchmarkMixin, TransactionTestCase):
+    """ Buffered stats increments against direct `F()` updates.
+
+    Each round bumps the circle, membership and profile stats of 100
+    rides, each ride in its own committed transaction like a request.
+    """
+
+    rides = 100
+
+    def setUp(self):
+        cache.clear()
+
+        self.circle = Circle.objects.create(name='Benchmarks', slug_name='benchmarks', about='Benchmarks circle.')
+        self.membership = Membership.objects.get(user=create_member(self.circle, 'benchmarks'))
+
+    def bump(self):
+        """ Bump the stats of a ride per transaction. """
+
+        for i in range(self.rides):
+            with transaction.atomic():
+                counters.increment(Circle, self.circle.pk, rides_taken=1)
+                counters.increment(Membership, self.membership.pk, rides_taken=1)
+                counters.increment(Profile, self.membership.profile_id, rides_taken=1)
+
+    def test_stats_counters(self):
+        self.measure('stats_counters_buffered', self.bump)
+        self.measure('stats_counters_flush', counters.flush, self.bump)
+
+        with self.settings(BUFFER_STATS_COUNTERS=False):
+            self.measure('stats_counters_direct', self.bump)
+
+
+@unittest.skipUnless(BENCHMARKS, 'Set BENCHMARKS=1 to run benchmarks.')
+class ConcurrentJoinBenchmarkTestCase(BenchmarkMixin, TransactionTestCase):
+    """ Concurrent seat reservations on a single ride.
+
+    Threads join the same ride at once, each with its own connection,
+    so the conditional update on the ride row is contended. Run it on
+    PostgreSQL for meaningful figures, SQLite serializes every write.
+    """
+
+    threads = 8
+    joins = 25
+
+    def setUp(self):
+        self.circle = Circle.objects.create(name='Benchmarks', slug_name='benchmarks', about='Benchmarks circle.')
+        self.driver = create_member(self.circle, 'driver')
+        self.passengers = [
+            create_member(self.circle, 'passenger{}'.format(i)) for i in range(self.threads * self.joins)
+        ]
+
+    def test_reserve_seat(self):
+        def setup():
+            return (create_ride(self.circle, self.driver, seats=len(self.passengers)),)
+
+        def join(ride):
+            barrier = threading.Barrier(self.threads)
+
+            def reserve(passengers):
+                barrier.wait()
+                try:
+                    for passenger in passengers:
+                        Ride.objects.reserve_seat(ride, passenger)
+                finally:
+                    connection.close()
+
+            threads = [
+                threading.Thread(target=reserve, args=(self.passengers[i::self.threads],))
+                for i in range(self.threads)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            ride.refresh_from_db()
+            self.assertEqual(ride.available_seats, 0)
+
+        self.measure('reserve_seat_concurrent', join, setup, operations=len(self.passengers))
@@ -0,0 +1,98 @@
+""" Rides expiry tests. """
+
+# Django
+from django.conf import settings
+from django.test import TestCase
+
+# Model
+from cride.circles.models import Circle
+from cride.rides.models import Ride
+
+# Tasks
+from cride.taskapp.tasks import disable_finished_rides, disable_ride, schedule_ride_expiries, schedule_ride_expiry
+
+# Tests
+from cride.rides.tests.test_join import create_member, create_ride
+
+# Utilities
+import datetime
+from unittest import mock
+from django.utils import timezone
+
+
+class RideExpiryTestCase(TestCase):
+    """ Rides expiry test case. """
+
+    def setUp(self):
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+        )
+        self.driver = create_member(self.circle, 'driver')
+
+    def create_ride(self, arrival_date):
+        """ Create a ride arriving at the given date. """
+
+        ride = create_ride(self.circle, self.driver, seats=3)
+        Ride.objects.filter(pk=ride.pk).update(arrival_date=arrival_date)
+        ride.refresh_from_db()
+
+        return ride
+
+    def test_expiry_is_scheduled_on_arrival(self):
+        # Rides are disabled on their arrival date.
+
+        ride = self.create_ride(timezone.now() + datetime.timedelta(minutes=20))
+
+        with mock.patch('django.db.transaction.on_commit', side_effect=lambda callback: callback()), \
+                mock.patch.object(disable_ride, 'apply_async') as apply_async:
+            schedule_ride_expiry(ride)
+
+        apply_async.assert_called_once_with(args=(ride.pk, ), eta=ride.arrival_date)
+
+    def test_expiry_is_scheduled_within_horizon(self):
+        # Tasks are never held longer than the horizon, shorter than the visibility timeout.
+
+        now = timezone.now()
+        later = self.create_ride(now + datetime.timedelta(hours=2))
+        entering = self.create_ride(now + datetime.timedelta(minutes=20))
+        self.create_ride(now + datetime.timedelta(minutes=10))
+
+        with mock.patch.object(disable_ride, 'apply_async') as apply_async:
+            schedule_ride_expiry(later)
+            apply_async.assert_not_called()
+
+            schedule_ride_expiries()
+
+        apply_async.assert_called_once_with(args=(entering.pk, ), eta=entering.arrival_date)
+
+        visibility_timeout = settings.CELERY_BROKER_TRANSPORT_OPTIONS['visibility_timeout']
+        self.assertLess(settings.RIDE_EXPIRY_HORIZON.total_seconds(), visibility_timeout)
+
+    def test_disable_ride(self):
+        # Only rides that already arrived are disabled.
+
+        finished = self.create_ride(timezone.now() - datetime.timedelta(minutes=1))
+        postponed = self.create_ride(timezone.now() + datetime.timedelta(hours=1))
+
+        disable_ride(finished.pk)
+        disable_ride(postponed.pk)
+
+        finished.refresh_from_db()
+        postponed.refresh_from_db()
+        self.assertFalse(finished.is_active)
+        self.assertTrue(postponed.is_active)
+
+    def test_missed_beats_recovery(self):
+        # The sweep disables every finished ride, however long ago they arrived.
+
+        now = timezone.now()
+        finished = [self.create_ride(now - datetime.timedelta(days=i, minutes=1)) for i in range(5)]
+        upcoming = self.create_ride(now + datetime.timedelta(hours=1))
+
+        disable_finished_rides(batch_size=2)
+
+        self.assertFalse(Ride.objects.filter(pk__in=[ride.pk for ride in finished], is_active=True).exists())
+        upcoming.refresh_from_db()
+        self.assertTrue(upcoming.is_active)
@@ -0,0 +1,95 @@
+""" Rides exports tests. """
+
+# Django
+from django.contrib.admin.sites import site
+from django.core.management import call_command
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+# Model
+from cride.circles.models import Circle
+from cride.rides.models import Ride
+
+# Tests
+from cride.rides.tests.test_join import create_member, create_ride
+
+# Utilities
+import csv
+import datetime
+from io import StringIO
+from django.utils import timezone
+
+
+class RideExportTestCase(TestCase):
+    """ Rides CSV export test case. """
+
+    def setUp(self):
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+        )
+        self.other_circle = Circle.objects.create(
+            name='Facultad de Ingeniería',
+            slug_name='fi',
+            about='Grupo oficial de la Facultad de Ingeniería de la UNAM',
+        )
+        self.driver = create_member(self.circle, 'driver')
+        self.passenger = create_member(self.circle, 'passenger')
+
+    def create_ride(self, circle, departure_date):
+        """ Create a ride departing at the given date. """
+
+        ride = create_ride(circle, self.driver, seats=3)
+        Ride.objects.filter(pk=ride.pk).update(departure_date=departure_date)
+
+        return ride
+
+    def read_rows(self, content):
+        """ Return the rows of a CSV export, without the header. """
+
+        return list(csv.reader(StringIO(content)))[1:]
+
+    def test_todays_rides_action(self):
+        # The admin action streams today's rides of the selected circles.
+
+        now = timezone.localtime()
+        today = [self.create_ride(self.circle, now) for _ in range(3)]
+        self.create_ride(self.circle, now + datetime.timedelta(days=2))
+        self.create_ride(self.other_circle, now)
+        today[0].passengers.add(self.passenger)
+
+        admin = site._registry[Circle]
+        request = RequestFactory().get('/')
+        response = admin.download_todays_rides(request, Circle.objects.filter(pk=self.circle.pk))
+        self.assertIsInstance(response, StreamingHttpResponse)
+
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.read_rows(b''.join(response.streaming_content).decode())
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(sorted(int(row[0]) for row in rows), sorted(ride.pk for ride in today))
+        self.assertEqual({int(row[0]): int(row[1]) for row in rows}[today[0].pk], 1)
+
+    def test_export_command(self):
+        # Rides of several circles are exported over a date range.
+
+        now = timezone.localtime()
+        rides = [
+            self.create_ride(self.circle, now),
+            self.create_ride(self.other_circle, now + datetime.timedelta(days=1)),
+        ]
+        self.create_ride(self.circle, now + datetime.timedelta(days=3))
+
+        out = StringIO()
+        call_command(
+            'export_rides', 'fciencias', 'fi',
+            '--start', str(now.date()),
+            '--end', str(now.date() + datetime.timedelta(days=1)),
+            stdout=out
+        )
+
+        rows = self.read_rows(out.getvalue())
+        self.assertEqual(sorted(int(row[0]) for row in rows), sorted(ride.pk for ride in rides))
@@ -0,0 +1,89 @@
+""" Requests instrumentation tests. """
+
+# Django
+from django.test import override_settings
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Model
+from cride.circles.models import Circle
+
+# Tests
+from cride.rides.tests.test_join import create_member, create_ride
+
+# Utilities
+import json
+from cride.utils import instrumentation
+
+
+@override_settings(INSTRUMENTATION_ENABLED=True, INSTRUMENTATION_SLOW_REQUEST_MS=10000,
+                   INSTRUMENTATION_SLOW_REQUEST_QUERIES=1000)
+class InstrumentationMiddlewareTestCase(APITestCase):
+    """ Instrumentation middleware test case. """
+
+    def setUp(self):
+        instrumentation.stats.clear()
+
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+        )
+        self.user = create_member(self.circle, 'driver')
+        for i in range(3):
+            create_ride(self.circle, self.user, seats=3)
+
+        self.client.force_authenticate(self.user)
+
+        # URL
+        self.url = '/circles/{}/rides/'.format(self.circle.slug_name)
+
+    def get_timings(self, response):
+        """ Return the Server-Timing header metrics. """
+
+        timings = {}
+        for metric in response['Server-Timing'].split(', '):
+            name, value = metric.split(';')
+            timings[name] = value.split('=')[1]
+
+        return timings
+
+    def test_server_timing(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timings = self.get_timings(response)
+        self.assertEqual(set(timings), {'db', 'serializer', 'view', 'total', 'queries'})
+        self.assertGreater(int(timings['queries'].strip('"')), 0)
+        self.assertGreater(float(timings['serializer']), 0)
+        self.assertLessEqual(float(timings['view']), float(timings['total']))
+
+    def test_stats_by_action(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.client.get('{}{}/'.format(self.url, self.circle.ride_set.first().pk))
+
+        stats = instrumentation.get_instrumentation_stats()
+        self.assertEqual(stats['RideViewSet.list']['requests'], 2)
+        self.assertEqual(stats['RideViewSet.retrieve']['requests'], 1)
+        self.assertGreater(stats['RideViewSet.list']['queries_avg'], 0)
+
+    def test_slow_requests_are_logged(self):
+        with self.assertLogs('cride.instrumentation', 'WARNING') as logs:
+            with self.settings(INSTRUMENTATION_SLOW_REQUEST_QUERIES=1):
+                self.client.get(self.url)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'RideViewSet.list')
+        self.assertEqual(record['path'], self.url)
+        self.assertEqual(record['status'], 200)
+        self.assertGreaterEqual(record['queries'], 1)
+
+    def test_disabled(self):
+        with self.settings(INSTRUMENTATION_ENABLED=False):
+            response = self.client.get(self.url)
+
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(instrumentation.stats, {})
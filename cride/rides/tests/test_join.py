@@ -0,0 +1,193 @@
+""" Ride join tests. """
+
+# Django
+from django.core.cache import cache
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Model
+from rest_framework.authtoken.models import Token
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+from cride.users.models import User, Profile
+
+# Utilities
+import datetime
+import threading
+from django.utils import timezone
+
+
+def create_member(circle, username):
+    """ Create a user with profile and an active membership in the circle. """
+
+    user = User.objects.create(email='{}@comparteride.com'.format(username), username=username)
+    profile = Profile.objects.create(user=user)
+    Membership.objects.create(user=user, profile=profile, circle=circle)
+
+    return user
+
+
+def create_ride(circle, driver, seats):
+    """ Create a ride departing tomorrow. """
+
+    departure = timezone.now() + datetime.timedelta(days=1)
+
+    return Ride.objects.create(
+        offered_by=driver,
+        offered_in=circle,
+        available_seats=seats,
+        departure_location='CU',
+        departure_date=departure,
+        arrival_location='Santa Fe',
+        arrival_date=departure + datetime.timedelta(hours=1),
+    )
+
+
+class RideJoinAPITestCase(APITestCase):
+    """ Ride join API test case. """
+
+    def setUp(self):
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+        )
+
+        self.driver = create_member(self.circle, 'driver')
+        self.passenger = create_member(self.circle, 'passenger')
+        self.ride = create_ride(self.circle, self.driver, seats=1)
+
+        # Auth
+        self.token = Token.objects.create(user=self.passenger).key
+        self.client.credentials(HTTP_AUTHORIZATION='Token {}'.format(self.token))
+
+        # URL
+        self.url = '/circles/{}/rides/{}/join/'.format(self.circle.slug_name, self.ride.pk)
+
+    def test_join_takes_seat(self):
+        # Joining must take a seat and add the passenger.
+
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['available_seats'], 0)
+
+        self.ride.refresh_from_db()
+        self.assertEqual(self.ride.available_seats, 0)
+        self.assertTrue(self.ride.passengers.filter(pk=self.passenger.pk).exists())
+
+    def count_membership_queries(self):
+        """ Join the ride and return the number of membership queries issued. """
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sum('FROM "circles_membership"' in query['sql'] for query in context.captured_queries)
+
+    def test_membership_loaded_once(self):
+        # Permissions and serializers share the caller's membership.
+
+        self.assertEqual(self.count_membership_queries(), 1)
+
+    @override_settings(MEMBERSHIP_CACHE_TIMEOUT=60)
+    def test_membership_cache(self):
+        # Cached memberships are dropped when saved.
+
+        cache.clear()
+        self.client.get('/circles/{}/rides/'.format(self.circle.slug_name))
+        self.assertEqual(self.count_membership_queries(), 0)
+
+        Membership.objects.get(user=self.passenger).save()
+        self.ride.passengers.clear()
+        Ride.objects.filter(pk=self.ride.pk).update(available_seats=1)
+        self.assertEqual(self.count_membership_queries(), 1)
+
+    def test_join_twice(self):
+        # Joining a ride twice is rejected without taking another seat.
+
+        self.assertTrue(Ride.objects.reserve_seat(self.ride, self.passenger))
+        self.assertIsNone(Ride.objects.reserve_seat(self.ride, self.passenger))
+
+        self.ride.refresh_from_db()
+        self.assertEqual(self.ride.passengers.count(), 1)
+
+    def test_join_full_ride(self):
+        # A full ride can't be joined.
+
+        Ride.objects.filter(pk=self.ride.pk).update(available_seats=0)
+
+        self.assertFalse(Ride.objects.reserve_seat(self.ride, self.passenger))
+        self.assertFalse(self.ride.passengers.exists())
+
+
+class SeatReservationConcurrencyTestCase(TransactionTestCase):
+    """ Seat reservation under concurrent joins. """
+
+    SEATS = 5
+    PASSENGERS = 20
+
+    def setUp(self):
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+        )
+
+        driver = create_member(self.circle, 'driver')
+        self.ride = create_ride(self.circle, driver, seats=self.SEATS)
+        self.passengers = [create_member(self.circle, 'passenger{}'.format(i)) for i in range(self.PASSENGERS)]
+
+    def test_no_overbooking(self):
+        # Concurrent joins can never take more seats than offered.
+
+        barrier = threading.Barrier(self.PASSENGERS)
+        results = []
+
+        def join(passenger):
+            barrier.wait()
+            try:
+                results.append(Ride.objects.reserve_seat(self.ride, passenger))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=join, args=(passenger, )) for passenger in self.passengers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.ride.refresh_from_db()
+        self.assertEqual(results.count(True), self.SEATS)
+        self.assertEqual(self.ride.available_seats, 0)
+        self.assertEqual(self.ride.passengers.count(), self.SEATS)
+
+    def test_double_join(self):
+        # The same passenger joining twice at once takes a single seat.
+
+        barrier = threading.Barrier(2)
+        passenger = self.passengers[0]
+        results = []
+
+        def join():
+            barrier.wait()
+            try:
+                results.append(Ride.objects.reserve_seat(self.ride, passenger))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=join) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.ride.refresh_from_db()
+        self.assertEqual(results.count(True), 1)
+        self.assertEqual(results.count(None), 1)
+        self.assertEqual(self.ride.available_seats, self.SEATS - 1)
+        self.assertEqual(list(self.ride.passengers.all()), [passenger])
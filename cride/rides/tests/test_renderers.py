@@ -0,0 +1,112 @@
+""" JSON renderers tests. """
+
+# Django
+from django.test import RequestFactory, TestCase
+
+# Django REST Framework
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+# Model
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+
+# Serializers
+from cride.circles.serializers import MembershipReadSerializer
+from cride.rides.serializers import RideReadSerializer
+
+# Tests
+from cride.rides.tests.test_join import create_member, create_ride
+
+# Utilities
+import datetime
+import decimal
+from io import BytesIO
+from unittest import mock
+from django.utils import timezone
+from cride.utils import renderers
+from cride.utils.querysets import plan_queryset
+
+
+class FastJSONRendererTestCase(TestCase):
+    """ orjson backed renderer and parser test case.
+
+    Output must match DRF's renderer byte for byte, timings are
+    compared by the benchmarks.
+    """
+
+    def setUp(self):
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+        )
+        driver = create_member(self.circle, 'driver')
+        passengers = [create_member(self.circle, 'pasajero{}'.format(i)) for i in range(3)]
+
+        for i in range(15):
+            ride = create_ride(self.circle, driver, seats=4)
+            ride.passengers.add(*passengers)
+            Ride.objects.filter(pk=ride.pk).update(comments='Salida de la Fuente de Las Ranas ñ ')
+
+        context = {'request': RequestFactory().get('/')}
+        self.payloads = {
+            'rides': RideReadSerializer(
+                plan_queryset(Ride.objects.all(), RideReadSerializer),
+                many=True,
+                context=context
+            ).data,
+            'memberships': MembershipReadSerializer(
+                Membership.objects.select_related('user__profile', 'invited_by'),
+                many=True,
+                context=context
+            ).data,
+        }
+
+    def assertRendersLike(self, data):
+        """ Assert both renderers output the same bytes. """
+
+        self.assertEqual(renderers.FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_payloads(self):
+        for data in self.payloads.values():
+            self.assertRendersLike(data)
+
+    def test_special_values(self):
+        # Values orjson doesn't encode natively are left to DRF's encoder.
+
+        self.assertRendersLike({
+            'now': timezone.now(),
+            'today': datetime.date.today(),
+            'time': datetime.time(12, 30, 15, 123456),
+            'price': decimal.Decimal('10.50'),
+            1: [None, True, 1.5, 'ñ '],
+        })
+
+    def test_indent(self):
+        # Indented responses are rendered by DRF's renderer.
+
+        data = self.payloads['memberships']
+        self.assertEqual(
+            renderers.FastJSONRenderer().render(data, 'application/json; indent=4'),
+            JSONRenderer().render(data, 'application/json; indent=4'),
+        )
+
+    def test_fallback(self):
+        # Without orjson DRF's renderer and parser are used.
+
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertRendersLike(self.payloads['rides'])
+            self.assertEqual(renderers.FastJSONParser().parse(BytesIO(b'{"a": [1]}')), {'a': [1]})
+
+    def test_parser(self):
+        content = renderers.FastJSONRenderer().render(self.payloads['rides'])
+
+        self.assertEqual(
+            renderers.FastJSONParser().parse(BytesIO(content)),
+            JSONParser().parse(BytesIO(content)),
+        )
+
+        with self.assertRaises(ParseError):
+            renderers.FastJSONParser().parse(BytesIO(b'{"a": '))
@@ -0,0 +1,145 @@
+""" Read replica routing tests. """
+
+# Django
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# Model
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+from cride.users.models import User, Profile
+
+# Tests
+from cride.rides.tests.test_join import create_member, create_ride
+
+# Utilities
+import datetime
+from unittest import mock
+from django.utils import timezone
+
+
+@override_settings(REPLICA_DATABASE='replica')
+@mock.patch('cride.rides.serializers.rides.schedule_ride_expiry', mock.Mock())
+class ReplicaRoutingTestCase(TransactionTestCase):
+    """ Read replica routing test case.
+
+    Rows are copied to the replica by `replicate`,
+    changes made afterwards are lagging behind.
+    """
+
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+        )
+        self.driver = create_member(self.circle, 'driver')
+        self.passenger = create_member(self.circle, 'passenger')
+        self.ride = create_ride(self.circle, self.driver, seats=3)
+        self.replicate()
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.driver)
+
+        # URL
+        self.url = '/circles/{}/rides/'.format(self.circle.slug_name)
+
+    def replicate(self):
+        """ Copy every row to the replica. """
+
+        for model in (User, Profile, Circle, Membership, Ride, Ride.passengers.through):
+            model.objects.using('replica').all().delete()
+            model.objects.using('replica').bulk_create(model.objects.using('default').all())
+
+    def list_locations(self):
+        """ Return the departure locations of the listed rides. """
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return [ride['departure_location'] for ride in response.data['results']]
+
+    def create_ride(self):
+        """ Offer a ride through the API. """
+
+        departure = timezone.now() + datetime.timedelta(days=2)
+        return self.client.post(self.url, {
+            'available_seats': 3,
+            'departure_location': 'Primary',
+            'departure_date': departure,
+            'arrival_location': 'Santa Fe',
+            'arrival_date': departure + datetime.timedelta(hours=1),
+        })
+
+    def test_reads_go_to_replica(self):
+        Ride.objects.filter(pk=self.ride.pk).update(departure_location='Primary')
+
+        with CaptureQueriesContext(connections['replica']) as queries:
+            self.assertEqual(self.list_locations(), ['CU'])
+            response = self.client.get('{}{}/'.format(self.url, self.ride.pk))
+
+        self.assertEqual(response.data['departure_location'], 'CU')
+        self.assertTrue(queries)
+
+    def test_writes_go_to_primary(self):
+        with CaptureQueriesContext(connections['replica']) as queries:
+            response = self.create_ride()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(queries)
+        self.assertTrue(Ride.objects.using('default').filter(departure_location='Primary').exists())
+        self.assertFalse(Ride.objects.using('replica').filter(departure_location='Primary').exists())
+
+    def test_writers_read_their_writes(self):
+        self.assertEqual(self.create_ride().status_code, status.HTTP_201_CREATED)
+
+        # Pinned to the primary.
+        self.assertEqual(self.list_locations(), ['CU', 'Primary'])
+
+        # Others still read from the replica.
+        self.client.force_authenticate(self.passenger)
+        self.assertEqual(self.list_locations(), ['CU'])
+
+        # Until the pin expires.
+        cache.clear()
+        self.client.force_authenticate(self.driver)
+        self.assertEqual(self.list_locations(), ['CU'])
+
+    def test_failed_writes_dont_pin(self):
+        response = self.client.post(self.url, {'available_seats': 0})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        Ride.objects.filter(pk=self.ride.pk).update(departure_location='Primary')
+        self.assertEqual(self.list_locations(), ['CU'])
+
+    def test_outside_requests(self):
+        # Commands and tasks use the primary.
+
+        Ride.objects.filter(pk=self.ride.pk).update(departure_location='Primary')
+        self.assertEqual(Ride.objects.get(pk=self.ride.pk).departure_location, 'Primary')
+
+
+class ReplicaDisabledTestCase(TransactionTestCase):
+    """ Without REPLICA_DATABASE everything uses the primary. """
+
+    def test_reads_go_to_primary(self):
+        circle = Circle.objects.create(name='Ciencias', slug_name='fciencias', about='Facultad de Ciencias')
+        user = create_member(circle, 'driver')
+        create_ride(circle, user, seats=3)
+
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get('/circles/fciencias/rides/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
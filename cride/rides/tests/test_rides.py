@@ -0,0 +1,176 @@
+""" Rides tests. """
+
+# Django
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Model
+from rest_framework.authtoken.models import Token
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+from cride.users.models import User, Profile
+
+# Views
+from cride.rides.views.rides import RideViewSet
+
+# Utilities
+import datetime
+from django.utils import timezone
+
+
+class RideListAPITestCase(APITestCase):
+    """ Ride list API test case. """
+
+    def setUp(self):
+        self.user = User.objects.create(
+            first_name='Miguel',
+            last_name='Angelo',
+            email='mmamani2@coboser.com',
+            username='mangelo',
+            password='admin123'
+        )
+        self.profile = Profile.objects.create(user=self.user)
+
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+            is_verified=True,
+        )
+
+        self.membership = Membership.objects.create(
+            user=self.user,
+            profile=self.profile,
+            circle=self.circle,
+        )
+
+        # Auth
+        self.token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION='Token {}'.format(self.token))
+
+        # URL
+        self.url = '/circles/{}/rides/'.format(self.circle.slug_name)
+
+    def create_rides(self, count):
+        """ Create `count` rides with a passenger each. """
+
+        departure = timezone.now() + datetime.timedelta(days=1)
+        start = Ride.objects.count()
+
+        for i in range(start, start + count):
+            driver = User.objects.create(
+                email='driver{}@comparteride.com'.format(i),
+                username='driver{}'.format(i),
+            )
+            Profile.objects.create(user=driver)
+
+            passenger = User.objects.create(
+                email='passenger{}@comparteride.com'.format(i),
+                username='passenger{}'.format(i),
+            )
+            Profile.objects.create(user=passenger)
+
+            ride = Ride.objects.create(
+                offered_by=driver,
+                offered_in=self.circle,
+                available_seats=3,
+                departure_location='CU',
+                departure_date=departure,
+                arrival_location='Santa Fe',
+                arrival_date=departure + datetime.timedelta(hours=1),
+            )
+            ride.passengers.add(passenger)
+
+    def count_list_queries(self):
+        """ Return the number of queries issued to list the rides. """
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response.data
+
+    def test_query_count_is_constant(self):
+        # Listing more rides must not issue more queries.
+
+        # Warm the circle cache.
+        self.client.get(self.url)
+
+        self.create_rides(1)
+        single_queries, data = self.count_list_queries()
+        self.assertEqual(data['count'], 1)
+
+        self.create_rides(10)
+        many_queries, data = self.count_list_queries()
+        self.assertEqual(data['count'], 11)
+
+        self.assertEqual(single_queries, many_queries)
+
+    def test_nested_data(self):
+        # Prefetched relations must render the same data.
+
+        self.create_rides(1)
+        _, data = self.count_list_queries()
+        ride = data['results'][0]
+
+        self.assertEqual(ride['offered_by']['username'], 'driver0')
+        self.assertEqual(ride['offered_in'], self.circle.name)
+        self.assertEqual(ride['passengers'][0]['username'], 'passenger0')
+        self.assertEqual(ride['passengers'][0]['profile']['rides_taken'], 0)
+
+    def test_keyset_pagination(self):
+        # Walking keyset pages must return every ride once, in order.
+
+        self.create_rides(5)
+        expected = [ride['id'] for ride in self.client.get(self.url).data['results']]
+
+        ids = []
+        url = self.url + '?pagination=keyset&limit=2'
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            self.assertFalse(any('COUNT(' in query['sql'] for query in context.captured_queries))
+
+            ids += [ride['id'] for ride in response.data['results']]
+            url = response.data['next']
+
+        self.assertEqual(ids, expected)
+
+    def test_keyset_invalid_cursor(self):
+        # Tampered cursors are rejected.
+
+        response = self.client.get(self.url, {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class RideQueryPlanTestCase(TestCase):
+    """ Ride list query plan test case. """
+
+    def setUp(self):
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+        )
+
+    def test_list_uses_available_rides_index(self):
+        # Listing rides must not scan the circle's whole history.
+
+        view = RideViewSet(action='list')
+        view.circle = self.circle
+        queryset = view.get_queryset().order_by(*view.ordering)
+
+        if connection.vendor == 'postgresql':
+            # Tiny test tables are always cheaper to scan.
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+        self.assertIn('rides_available_idx', queryset.explain())
@@ -0,0 +1,86 @@
+""" Rides search tests. """
+
+# Django
+from django.db import connection
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Model
+from rest_framework.authtoken.models import Token
+from cride.circles.models import Circle
+from cride.rides.models import Ride
+
+# Tests
+from cride.rides.tests.test_join import create_member, create_ride
+
+
+class RideSearchAPITestCase(APITestCase):
+    """ Ride full text search API test case. """
+
+    def setUp(self):
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+        )
+        self.user = create_member(self.circle, 'mangelo')
+
+        self.ride = create_ride(self.circle, self.user, seats=3)
+        other = create_ride(self.circle, self.user, seats=3)
+        Ride.objects.filter(pk=other.pk).update(departure_location='Coyoacán', arrival_location='Polanco')
+
+        # Auth
+        self.token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION='Token {}'.format(self.token))
+
+        # URL
+        self.url = '/circles/{}/rides/'.format(self.circle.slug_name)
+
+    def search(self, url, term):
+        """ Return the results of searching `term`. """
+
+        response = self.client.get(url, {'search': term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return response.data['results']
+
+    def test_search_rides(self):
+        # Every term must match any of the search fields.
+
+        results = self.search(self.url, 'santa')
+        self.assertEqual([ride['id'] for ride in results], [self.ride.pk])
+
+        self.assertEqual(len(self.search(self.url, 'cu santa')), 1)
+        self.assertEqual(len(self.search(self.url, 'cu polanco')), 0)
+
+    def test_search_prefix(self):
+        # Terms match as prefixes of indexed words.
+
+        self.assertEqual(len(self.search(self.url, 'coyo')), 1)
+
+    def test_search_vendor_differences(self):
+        # PostgreSQL matches terms inside words, SQLite ignores diacritics.
+
+        postgres = connection.vendor == 'postgresql'
+
+        self.assertEqual(len(self.search(self.url, 'yoac')), 1 if postgres else 0)
+        self.assertEqual(len(self.search(self.url, 'coyoacan')), 0 if postgres else 1)
+
+    def test_search_index_is_current(self):
+        # Updated rides must be found by their new locations.
+
+        self.ride.arrival_location = 'Tlalpan'
+        self.ride.save()
+
+        self.assertEqual(len(self.search(self.url, 'santa')), 0)
+        self.assertEqual(len(self.search(self.url, 'tlalpan')), 1)
+
+    def test_search_circles(self):
+        # Circles are searched by name and slug name.
+
+        results = self.search('/circles/', 'ciencias')
+        self.assertEqual([circle['slug_name'] for circle in results], ['fciencias'])
+        self.assertEqual(len(self.search('/circles/', 'fciencias')), 1)
+        self.assertEqual(len(self.search('/circles/', 'unam')), 0)
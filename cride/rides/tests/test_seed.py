@@ -0,0 +1,59 @@
+""" Seed load data command tests. """
+
+# Django
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, F
+from django.test import TestCase
+
+# Model
+from cride.circles.models import Circle, Invitation, Membership
+from cride.rides.models import Ride
+from cride.users.models import User
+
+# Utilities
+import io
+
+
+class SeedLoadDataTestCase(TestCase):
+    """ Seed load data command test case. """
+
+    def seed(self, **options):
+        """ Run the command with a small dataset. """
+
+        options = dict(dict(users=20, circles=25, rides_per_circle=2, stdout=io.StringIO()), **options)
+        call_command('seed_load_data', **options)
+
+    def test_seed(self):
+        self.seed()
+
+        self.assertEqual(User.objects.filter(username__startswith='load-', profile__isnull=False).count(), 20)
+        # The circles file has 21 rows.
+        self.assertEqual(Circle.objects.count(), 25)
+        self.assertEqual(Membership.objects.filter(user__username__startswith='load-').count(), 60)
+        self.assertTrue(Ride.objects.exists())
+        self.assertEqual(Invitation.objects.count(), 120)
+        self.assertTrue(Invitation.objects.filter(used=True, used_by__isnull=False).exists())
+
+        # Stats are reconciled.
+        for circle in Circle.objects.all():
+            self.assertEqual(circle.active_members_count, circle.membership_set.filter(is_active=True).count())
+            self.assertEqual(circle.rides_offered, circle.ride_set.count())
+
+    def test_passengers(self):
+        # Drivers never ride with themselves, circles with few members fill fewer seats.
+
+        self.seed(passengers_per_ride=2)
+
+        self.assertFalse(Ride.objects.filter(passengers=F('offered_by')).exists())
+        counts = Ride.objects.annotate(total=Count('passengers')).values_list('total', flat=True)
+        self.assertEqual(set(counts), {0, 1, 2})
+
+    def test_prefix(self):
+        self.seed()
+
+        with self.assertRaises(CommandError):
+            self.seed()
+
+        self.seed(prefix='more')
+        self.assertEqual(User.objects.count(), 40)
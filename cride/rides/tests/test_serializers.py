@@ -0,0 +1,76 @@
+""" Read serializers tests. """
+
+# Django
+from django.test import RequestFactory, TestCase
+
+# Django REST Framework
+from rest_framework.renderers import JSONRenderer
+
+# Model
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+from cride.users.models import User
+
+# Serializers
+from cride.circles.serializers import MembershipModelSerializer, MembershipReadSerializer
+from cride.rides.serializers import RideModelSerializer, RideReadSerializer
+from cride.users.serializers import UserModelSerializer, UserReadSerializer
+
+# Tests
+from cride.rides.tests.test_join import create_member, create_ride
+
+# Utilities
+from cride.utils.querysets import plan_queryset
+
+
+class ReadSerializersTestCase(TestCase):
+    """ Compiled read serializers test case.
+
+    Each read serializer must render exactly like the model
+    serializer it extends. Timings are compared by the benchmarks.
+    """
+
+    RIDES = 15
+    PASSENGERS = 3
+
+    def setUp(self):
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+        )
+        driver = create_member(self.circle, 'driver')
+        driver.profile.picture = 'users/pictures/driver.png'
+        driver.profile.save()
+
+        passengers = [create_member(self.circle, 'passenger{}'.format(i)) for i in range(self.PASSENGERS)]
+        for i in range(self.RIDES):
+            ride = create_ride(self.circle, driver, seats=self.PASSENGERS + 1)
+            ride.passengers.add(*passengers[:i % (self.PASSENGERS + 1)])
+        Ride.objects.filter(pk=ride.pk).update(rating=4.5)
+
+        self.context = {'request': RequestFactory().get('/')}
+
+    def assertRendersLike(self, reference, compiled, instance, many=False):
+        """ Assert both serializers render the same JSON. """
+
+        def render(serializer_class):
+            return JSONRenderer().render(serializer_class(instance, many=many, context=self.context).data)
+
+        self.assertEqual(render(compiled), render(reference))
+
+    def test_rides(self):
+        rides = list(plan_queryset(Ride.objects.all(), RideModelSerializer))
+
+        self.assertRendersLike(RideModelSerializer, RideReadSerializer, rides, many=True)
+        self.assertRendersLike(RideModelSerializer, RideReadSerializer, rides[-1])
+
+    def test_memberships(self):
+        memberships = list(Membership.objects.select_related('user__profile', 'invited_by'))
+
+        self.assertRendersLike(MembershipModelSerializer, MembershipReadSerializer, memberships, many=True)
+
+    def test_users(self):
+        user = User.objects.select_related('profile').get(username='driver')
+
+        self.assertRendersLike(UserModelSerializer, UserReadSerializer, user)
@@ -0,0 +1,112 @@
+""" Rides stats tests. """
+
+# Django
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+# Model
+from cride.circles.models import Circle, Membership
+from cride.users.models import Profile
+
+# Tests
+from cride.rides.tests.test_join import create_member, create_ride
+
+# Utilities
+from io import StringIO
+from cride.utils import counters
+
+
+class StatsCountersTestCase(TestCase):
+    """ Buffered stats counters test case. """
+
+    def setUp(self):
+        cache.clear()
+
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+        )
+        self.driver = create_member(self.circle, 'driver')
+        self.passenger = create_member(self.circle, 'passenger')
+
+    def test_increments_are_buffered(self):
+        # Increments reach the database only when flushed.
+
+        counters.increment(Circle, self.circle.pk, rides_offered=1, rides_taken=2)
+        counters.increment(Circle, self.circle.pk, rides_taken=1)
+
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.rides_taken, 0)
+
+        self.assertEqual(counters.flush(), 2)
+
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.rides_offered, 1)
+        self.assertEqual(self.circle.rides_taken, 3)
+
+        # Flushed increments must not be applied twice.
+        self.assertEqual(counters.flush(), 0)
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.rides_taken, 3)
+
+    def test_flush_after_eviction(self):
+        # Counters removed from the cache are registered again.
+
+        counters.increment(Circle, self.circle.pk, rides_taken=1)
+        cache.delete(counters.counter_key(Circle, self.circle.pk, 'rides_taken', counters.get_generation()))
+        counters.increment(Circle, self.circle.pk, rides_taken=1)
+        counters.flush()
+
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.rides_taken, 1)
+
+    def test_flushed_counters_are_deleted(self):
+        # Counters and registries of flushed generations don't pile up.
+
+        counters.increment(Circle, self.circle.pk, rides_taken=1)
+        key = counters.counter_key(Circle, self.circle.pk, 'rides_taken', counters.get_generation())
+        registry = counters.sequence_key(counters.get_generation())
+        counters.flush()
+
+        # Kept until the next flush, for increments made while flushing.
+        cache.incr(key)
+        self.assertEqual(counters.flush(), 1)
+        self.assertIsNone(cache.get(key))
+        self.assertIsNone(cache.get(registry))
+
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.rides_taken, 2)
+
+    @override_settings(BUFFER_STATS_COUNTERS=False)
+    def test_unbuffered_increments(self):
+        # Without a shared cache, increments are written directly.
+
+        counters.increment(Circle, self.circle.pk, rides_offered=1, rides_taken=2)
+
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.rides_offered, 1)
+        self.assertEqual(self.circle.rides_taken, 2)
+        self.assertEqual(counters.flush(), 0)
+
+    def test_reconcile_stats(self):
+        # Counters are recomputed from the rides table.
+
+        ride = create_ride(self.circle, self.driver, seats=3)
+        ride.passengers.add(self.passenger)
+        Circle.objects.update(rides_offered=10, rides_taken=10)
+
+        call_command('reconcile_stats', stdout=StringIO())
+
+        self.circle.refresh_from_db()
+        self.assertEqual(self.circle.rides_offered, 1)
+        self.assertEqual(self.circle.rides_taken, 1)
+
+        driver = Membership.objects.get(user=self.driver)
+        self.assertEqual(driver.rides_offered, 1)
+        self.assertEqual(driver.rides_taken, 0)
+
+        passenger = Profile.objects.get(user=self.passenger)
+        self.assertEqual(passenger.rides_offered, 0)
+        self.assertEqual(passenger.rides_taken, 1)
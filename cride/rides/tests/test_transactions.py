@@ -0,0 +1,159 @@
+""" Transaction policy tests. """
+
+# Django
+from django.db import connection
+from django.test import RequestFactory, TransactionTestCase, override_settings
+
+# Django REST Framework
+from rest_framework import serializers, status
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+# Model
+from cride.circles.models import Circle, Invitation, Membership
+from cride.rides.models import Ride
+
+# Views
+from cride.rides.views.rides import RideViewSet
+
+# Tests
+from cride.rides.tests.test_join import create_member, create_ride
+
+# Utilities
+import datetime
+from unittest import mock
+from django.utils import timezone
+
+
+class TransactionPolicyTestCase(TransactionTestCase):
+    """ Per action transaction policy test case.
+
+    Not wrapped in a transaction, so views run as in production.
+    """
+
+    def setUp(self):
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='fciencias',
+            about='Grupo oficial de la Facultad de Ciencias de la UNAM',
+        )
+        self.driver = create_member(self.circle, 'driver')
+        self.passenger = create_member(self.circle, 'passenger')
+        self.ride = create_ride(self.circle, self.driver, seats=3)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.driver)
+
+        # URL
+        self.url = '/circles/{}/rides/'.format(self.circle.slug_name)
+
+    def record_atomic(self):
+        """ Return a side effect recording whether it runs in a transaction, and the records. """
+
+        records = []
+
+        def side_effect(*args, **kwargs):
+            records.append(connection.in_atomic_block)
+            return mock.DEFAULT
+
+        return side_effect, records
+
+    def create_ride_data(self):
+        """ Return a valid ride creation payload. """
+
+        departure = timezone.now() + datetime.timedelta(days=1)
+
+        return {
+            'available_seats': 3,
+            'departure_location': 'CU',
+            'departure_date': departure,
+            'arrival_location': 'Santa Fe',
+            'arrival_date': departure + datetime.timedelta(hours=1),
+        }
+
+    def test_read_actions_autocommit(self):
+        side_effect, records = self.record_atomic()
+
+        with mock.patch('cride.rides.views.rides.plan_queryset', wraps=lambda queryset, serializer: queryset) as plan:
+            plan.side_effect = side_effect
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+            self.assertEqual(self.client.get('{}{}/'.format(self.url, self.ride.pk)).status_code, status.HTTP_200_OK)
+
+        self.assertEqual(records, [False, False])
+
+    @mock.patch('cride.rides.serializers.rides.schedule_ride_expiry')
+    def test_write_actions_atomic(self, schedule_ride_expiry):
+        side_effect, records = self.record_atomic()
+        schedule_ride_expiry.side_effect = side_effect
+
+        response = self.client.post(self.url, self.create_ride_data())
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(records, [True])
+        self.assertFalse(connection.in_atomic_block)
+
+    @mock.patch('cride.rides.serializers.rides.schedule_ride_expiry')
+    @mock.patch('cride.rides.serializers.rides.counters.increment')
+    def test_failed_create_rolls_back(self, increment, schedule_ride_expiry):
+        # The ride is inserted before the error response.
+        increment.side_effect = serializers.ValidationError('Stats are unavailable.')
+
+        response = self.client.post(self.url, self.create_ride_data())
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ride.objects.count(), 1)
+
+    @mock.patch('cride.rides.serializers.rides.counters.increment')
+    def test_failed_join_rolls_back(self, increment):
+        # The seat is reserved before the error response.
+        increment.side_effect = serializers.ValidationError('Stats are unavailable.')
+        self.client.force_authenticate(self.passenger)
+
+        response = self.client.post('{}{}/join/'.format(self.url, self.ride.pk))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.ride.refresh_from_db()
+        self.assertEqual(self.ride.available_seats, 3)
+        self.assertFalse(self.ride.passengers.exists())
+
+    def test_error_response_rolls_back(self):
+        # Actions answering with an error without raising roll back as well.
+
+        def join(view, request, *args, **kwargs):
+            Ride.objects.reserve_seat(self.ride, self.passenger)
+            return Response({'detail': 'Payment declined.'}, status=status.HTTP_402_PAYMENT_REQUIRED)
+
+        with mock.patch.object(RideViewSet, 'join', join):
+            response = self.client.post('{}{}/join/'.format(self.url, self.ride.pk))
+
+        self.assertEqual(response.status_code, status.HTTP_402_PAYMENT_REQUIRED)
+        self.ride.refresh_from_db()
+        self.assertEqual(self.ride.available_seats, 3)
+        self.assertFalse(self.ride.passengers.exists())
+
+    def test_invitations_atomic(self):
+        # A GET issuing invitations.
+
+        Membership.objects.filter(user=self.driver).update(remaining_invitations=2)
+        side_effect, records = self.record_atomic()
+
+        with mock.patch.object(Invitation.objects, 'create_batch', return_value=['a', 'b']) as create_batch:
+            create_batch.side_effect = side_effect
+            response = self.client.get('/circles/{}/members/driver/invitations/'.format(self.circle.slug_name))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['invitations'], ['a', 'b'])
+        self.assertEqual(records, [True])
+
+    @override_settings(READ_ONLY_TRANSACTIONS=True)
+    def test_read_only_transactions(self):
+        # Only reads from the primary run in a read only transaction.
+
+        view = RideViewSet()
+        request = RequestFactory().get(self.url)
+
+        with mock.patch.object(connection, 'vendor', 'postgresql'):
+            self.assertTrue(view.is_read_only(request))
+
+            request.replica_reads = True
+            self.assertFalse(view.is_read_only(request))
@@ -3,14 +3,14 @@
 # Django REST Framework.
 from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
-from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 
 # Serializers
-from cride.rides.serializers import CreateRideSerializer, RideModelSerializer, JoinRideSerializer, EndRideSerializer
+from cride.rides.serializers import (CreateRideSerializer, RideModelSerializer, RideReadSerializer, JoinRideSerializer,
+                                     EndRideSerializer)
 
-# Models
-from cride.circles.models import Circle
+# Resolvers
+from cride.circles.resolvers import get_circle
 
 # Permissions
 from rest_framework.permissions import IsAuthenticated
@@ -18,29 +18,38 @@ from cride.circles.permissions import IsActiveCircleMember
 from cride.rides.permissions import IsRideOwner, IsNotRideOwner
 
 # Filters
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
+from cride.utils.search import FullTextSearchFilter
 
 # Utilities
 import datetime
 from django.utils import timezone
+from django.utils.functional import cached_property
+from cride.utils.pagination import KeysetOrLimitOffsetPagination
+from cride.utils.querysets import plan_queryset
+from cride.utils.transactions import TransactionPolicyMixin
 
 
-class RideViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.UpdateModelMixin,
-                  viewsets.GenericViewSet):
+class RideViewSet(TransactionPolicyMixin, mixins.ListModelMixin, mixins.CreateModelMixin, mixins.RetrieveModelMixin,
+                  mixins.UpdateModelMixin, viewsets.GenericViewSet):
     """ Ride view set. """
 
     serializer_class = CreateRideSerializer
-    filter_backends = (SearchFilter, OrderingFilter)
+    pagination_class = KeysetOrLimitOffsetPagination
+    filter_backends = (FullTextSearchFilter, OrderingFilter)
     search_fields = ('departure_location', 'arrival_location')
     ordering_fields = ('departure_date', 'arrival_date', 'available_seats')
     ordering = ('departure_date', 'arrival_date', 'available_seats')
 
-    def dispatch(self, request, *args, **kwargs):
-        """ Verify that the circle exists. """
+    @cached_property
+    def circle(self):
+        """ Verify that the circle exists.
 
-        slug_name = kwargs['slug_name']
-        self.circle = get_object_or_404(Circle, slug_name=slug_name)
-        return super(RideViewSet, self).dispatch(request, *args, **kwargs)
+        Resolved on first use, unauthenticated
+        requests are rejected before.
+        """
+
+        return get_circle(self.kwargs['slug_name'])
 
     def get_permissions(self):
         """ Assign permission based on action. """
@@ -71,6 +80,8 @@ class RideViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, mixins.Retriev
             return JoinRideSerializer
         if self.action == 'finish':
             return EndRideSerializer
+        if self.action in ['list', 'retrieve']:
+            return RideReadSerializer
 
         return RideModelSerializer
 
@@ -79,10 +90,11 @@ class RideViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, mixins.Retriev
 
         if self.action != 'finish':
             offset = timezone.now() + datetime.timedelta(minutes=10)
+            queryset = self.circle.ride_set.filter(departure_date__gte=offset, is_active=True, available_seats__gte=1)
+        else:
+            queryset = self.circle.ride_set.all()
 
-            return self.circle.ride_set.filter(departure_date__gte=offset, is_active=True, available_seats__gte=1)
-
-        return self.circle.ride_set.all()
+        return plan_queryset(queryset, RideModelSerializer)
 
     @action(detail=True, methods=['post'])
     def join(self, request, *args, **kwargs):
@@ -93,13 +105,13 @@ class RideViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, mixins.Retriev
         serializer = serializer_class(
             ride,
             data={'passenger': request.user.pk},
-            context={'ride': ride, 'circle': self.circle},
+            context={'ride': ride, 'circle': self.circle, 'request': request},
             partial=True,
         )
         serializer.is_valid(raise_exception=True)
         serializer.save()
 
-        data = RideModelSerializer(ride).data
+        data = RideReadSerializer(ride).data
 
         return Response(data, status=status.HTTP_200_OK)
 
@@ -122,6 +134,6 @@ class RideViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, mixins.Retriev
         serializer.is_valid(raise_exception=True)
         serializer.save()
 
-        data = RideModelSerializer(ride).data
+        data = RideReadSerializer(ride).data
 
         return Response(data, status=status.HTTP_200_OK)
@@ -2,19 +2,22 @@
 
 # Django
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.template.loader import get_template
 from celery.decorators import task, periodic_task
 
 # Models
 from cride.rides.models import Ride
-from cride.users.models import User
+from cride.users.models import OutboxEmail
 
 # Utilities
 import jwt
+import json
 import datetime
-import time
 from django.utils import timezone
+from cride.utils import counters
 
 
 def gen_verification_token(user):
@@ -32,36 +35,182 @@ def gen_verification_token(user):
     return token.decode()
 
 
-@task(name='send_confirmation_email', max_entries=3)
-def send_confirmation_email(user_pk):
-    """ Send account verification link to given user. """
+def send_confirmation_email(user):
+    """ Queue the account verification link of the given user.
 
-    for i in range(30):
-        time.sleep(1)
-        print('Sleeping', str(i+1))
+    The email is sent by a drain queued once the current transaction
+    commits, at most one per `EMAIL_OUTBOX_DRAIN_DELAY` seconds so a
+    burst of signups is sent by a single task.
+    """
 
-    user = User.objects.get(pk=user_pk)
-    verification_token = gen_verification_token(user)
+    OutboxEmail.objects.enqueue(
+        to=user.email,
+        subject='Welcome @{}! Verify your account to start using Comparte Ride'.format(user.username),
+        template_name='emails/users/account_verification.html',
+        context={
+            'user': {'username': user.username},
+            'token': gen_verification_token(user),
+        },
+        user=user,
+    )
+
+    transaction.on_commit(schedule_outbox_drain)
+
+
+def schedule_outbox_drain():
+    """ Queue an outbox drain unless one is already queued. """
+
+    delay = settings.EMAIL_OUTBOX_DRAIN_DELAY
+
+    if cache.add('email_outbox_drain', True, timeout=delay):
+        drain_email_outbox.apply_async(countdown=delay)
+
+
+def send_outbox_batch(batch_size):
+    """ Send up to `batch_size` pending outbox emails.
+
+    Emails are claimed in a short transaction by pushing their
+    `send_after` past `EMAIL_OUTBOX_CLAIM_TIMEOUT`, sent over a single
+    connection without holding any lock, and their results are saved
+    in a second transaction. Emails of a worker that died while sending
+    are claimed again once the timeout expires. Failed ones are retried
+    later with exponential backoff until they run out of attempts.
+    Return the number of emails processed.
+    """
 
-    subject = 'Welcome @{}! Verify your account to start using Comparte Ride'.format(user.username)
     from_email = 'Comparte Ride <noreply@comparteride.com>'
+    now = timezone.now()
+
+    with transaction.atomic():
+        emails = list(OutboxEmail.objects.pending(now).select_for_update(skip_locked=True)[:batch_size])
+
+        if not emails:
+            return 0
+
+        OutboxEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            send_after=now + datetime.timedelta(seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT)
+        )
+
+    # Compiled templates, by name.
+    templates = {}
+
+    try:
+        with get_connection() as connection:
+            for email in emails:
+                try:
+                    if email.template_name not in templates:
+                        templates[email.template_name] = get_template(email.template_name)
+
+                    content = templates[email.template_name].render(json.loads(email.context))
+                    msg = EmailMultiAlternatives(email.subject, content, from_email, [email.to],
+                                                 connection=connection)
+                    msg.attach_alternative(content, 'text/html')
+                    msg.send()
+                except Exception as exc:
+                    email.last_error = repr(exc)
+                else:
+                    email.sent_at = now
+    except Exception as exc:
+        # Connection could not be opened or closed.
+        for email in emails:
+            if email.sent_at is None:
+                email.last_error = repr(exc)
+
+    for email in emails:
+        if email.sent_at is None:
+            email.attempts += 1
+            email.is_failed = email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+            email.send_after = now + datetime.timedelta(
+                seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+            )
+
+    with transaction.atomic():
+        OutboxEmail.objects.bulk_update(emails, ['sent_at', 'attempts', 'is_failed', 'send_after', 'last_error'])
+
+    return len(emails)
+
+
+@periodic_task(name='drain_email_outbox', run_every=datetime.timedelta(seconds=30))
+def drain_email_outbox():
+    """ Send pending outbox emails in batches. """
+
+    batch_size = settings.EMAIL_OUTBOX_BATCH_SIZE
 
-    html_content = render_to_string('emails/users/account_verification.html', {
-        'user': user,
-        'token': verification_token
-    })
-    msg = EmailMultiAlternatives(subject, html_content, from_email, [user.email])
-    msg.attach_alternative(html_content, "text/html")
-    msg.send()
+    while send_outbox_batch(batch_size) == batch_size:
+        pass
 
 
-@periodic_task(name='disable_finished_rides', run_every=datetime.timedelta(seconds=5))
-def disable_finished_rides():
-    """ Disabled finished rides. """
+def schedule_ride_expiry(ride):
+    """ Disable the ride when it arrives.
+
+    Workers hold ETA tasks until they are due, and Redis redelivers
+    them after its visibility timeout. Only rides arriving within
+    `RIDE_EXPIRY_HORIZON` are scheduled, `schedule_ride_expiries`
+    schedules the others once they get close.
+
+    Scheduled once the current transaction commits, rides whose
+    task is lost are disabled by `disable_finished_rides`.
+    """
+
+    if ride.arrival_date > timezone.now() + settings.RIDE_EXPIRY_HORIZON:
+        return
+
+    transaction.on_commit(lambda: disable_ride.apply_async(args=(ride.pk, ), eta=ride.arrival_date))
+
+
+@periodic_task(name='schedule_ride_expiries', run_every=settings.RIDE_EXPIRY_HORIZON / 2)
+def schedule_ride_expiries():
+    """ Schedule the expiry of rides entering the horizon.
+
+    Runs every half horizon and schedules rides arriving in the second
+    half of it, earlier ones were scheduled by the previous run or when
+    saved. Rides missed by a late run are left to the sweep.
+    """
 
     now = timezone.now()
-    offset = now + datetime.timedelta(seconds=5)
+    rides = Ride.objects.filter(
+        is_active=True,
+        arrival_date__gt=now + settings.RIDE_EXPIRY_HORIZON / 2,
+        arrival_date__lte=now + settings.RIDE_EXPIRY_HORIZON,
+    ).values_list('pk', 'arrival_date')
+
+    for ride_pk, arrival_date in rides.iterator():
+        disable_ride.apply_async(args=(ride_pk, ), eta=arrival_date)
+
+
+@task(name='disable_ride')
+def disable_ride(ride_pk):
+    """ Disable a finished ride.
+
+    Rides whose arrival date was pushed back are left active,
+    the task scheduled on update will disable them.
+    """
+
+    Ride.objects.filter(pk=ride_pk, is_active=True, arrival_date__lte=timezone.now()).update(is_active=False)
+
+
+@periodic_task(name='disable_finished_rides', run_every=datetime.timedelta(minutes=5))
+def disable_finished_rides(batch_size=1000):
+    """ Disable finished rides that are still active.
+
+    Catch-up sweep for rides whose `disable_ride` task was missed,
+    processed in bounded batches.
+    """
+
+    now = timezone.now()
+
+    while True:
+        pks = list(
+            Ride.objects.filter(is_active=True, arrival_date__lte=now).values_list('pk', flat=True)[:batch_size]
+        )
+        Ride.objects.filter(pk__in=pks).update(is_active=False)
+
+        if len(pks) < batch_size:
+            break
+
+
+@periodic_task(name='flush_stats_counters', run_every=datetime.timedelta(seconds=30))
+def flush_stats_counters():
+    """ Write buffered stats increments to the database. """
 
-    # Update rides that have already finished
-    rides = Ride.objects.filter(arrival_date__gte=now, arrival_date__lte=offset, is_active=True)
-    rides.update(is_active=False)
+    counters.flush()
@@ -5,7 +5,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
 # Models
-from .models import User, Profile
+from .models import User, Profile, OutboxEmail
 
 
 class CustomUserAdmin(UserAdmin):
@@ -24,4 +24,13 @@ class ProfileAdmin(admin.ModelAdmin):
     list_filter = ('reputation', )
 
 
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    """ Outbox email model admin. """
+
+    list_display = ('to', 'subject', 'send_after', 'sent_at', 'attempts', 'is_failed', )
+    search_fields = ('to', 'subject', )
+    list_filter = ('is_failed', 'sent_at', )
+
+
 admin.site.register(User, CustomUserAdmin)
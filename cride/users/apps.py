@@ -9,3 +9,8 @@ class UsersConfig(AppConfig):
 
     name = 'cride.users'
     verbose_name = 'User'
+
+    def ready(self):
+        """ Register signals. """
+
+        from cride.users import signals  # NOQA
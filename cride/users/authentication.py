@@ -0,0 +1,136 @@
+""" Users authentication.
+
+DRF's `TokenAuthentication` loads the token and its user on every
+request. `CachedTokenAuthentication` keeps the user behind each token
+in the shared cache for `TOKEN_CACHE_TIMEOUT` seconds, dropped when
+the token is deleted or the user is saved. Changes made through
+queryset updates are only seen once the entry expires.
+
+Only a few fields are cached, the rest are deferred and loaded
+from the database when accessed.
+
+`JWTAuthentication` authenticates access tokens issued by
+`cride.users.tokens` without touching the database.
+"""
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+
+# Django REST Framework
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, TokenAuthentication, get_authorization_header
+from rest_framework.authtoken.models import Token
+
+# Models
+from cride.users.models import User
+
+# Tokens
+from cride.users.tokens import InvalidToken, decode_token
+
+
+# Cached fields, in model field order.
+USER_CACHED_FIELDS = (
+    'id', 'is_superuser', 'username', 'first_name', 'last_name', 'is_staff', 'is_active',
+    'email', 'phone_number', 'is_client', 'is_verified',
+)
+
+tokens_stats = {'hits': 0, 'misses': 0}
+
+
+def get_token_cache_key(key):
+    """ Return the cache key of a token's user. """
+
+    return 'users:token:{}'.format(key)
+
+
+def cache_token(key, user):
+    """ Cache the user a token belongs to. """
+
+    values = tuple(getattr(user, field) for field in USER_CACHED_FIELDS)
+    cache.set(get_token_cache_key(key), values, settings.TOKEN_CACHE_TIMEOUT)
+
+
+def invalidate_token(key):
+    """ Remove a token from the cache. """
+
+    cache.delete(get_token_cache_key(key))
+
+
+def invalidate_user_tokens(user):
+    """ Remove every token of a user from the cache. """
+
+    keys = Token.objects.filter(user_id=user.pk).values_list('key', flat=True)
+    cache.delete_many([get_token_cache_key(key) for key in keys])
+
+
+def get_token_cache_stats():
+    """ Return hits, misses and hit ratio of the tokens cache. """
+
+    total = tokens_stats['hits'] + tokens_stats['misses']
+
+    return dict(tokens_stats, hit_ratio=tokens_stats['hits'] / total if total else 0.0)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """ Token authentication resolving tokens from the cache before the database. """
+
+    def authenticate_credentials(self, key):
+        cache_key = get_token_cache_key(key)
+        values = cache.get(cache_key)
+
+        if values is None:
+            tokens_stats['misses'] += 1
+            values = User.objects.filter(auth_token__key=key).values_list(*USER_CACHED_FIELDS).first()
+
+            if values is None:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+            cache.set(cache_key, values, settings.TOKEN_CACHE_TIMEOUT)
+        else:
+            tokens_stats['hits'] += 1
+
+        user = User.from_db(User.objects.db, USER_CACHED_FIELDS, values)
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (user, Token(key=key, user=user))
+
+
+class JWTAuthentication(BaseAuthentication):
+    """ Stateless authentication with access tokens.
+
+    Enabled with `JWT_AUTH_ENABLED`. Clients should authenticate by
+    passing an access token in the "Authorization" HTTP header,
+    prepended with "Bearer ". The user
+    is built from the token's claims, no query is made, fields other
+    than the id and username are loaded when accessed.
+    """
+
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        if not settings.JWT_AUTH_ENABLED:
+            return None
+
+        auth = get_authorization_header(request).split()
+
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+
+        try:
+            payload = decode_token(auth[1].decode(), 'access')
+        except (InvalidToken, UnicodeError):
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        user = User.from_db(User.objects.db, ('id', 'username'), (payload['user_id'], payload['username']))
+
+        return (user, payload)
+
+    def authenticate_header(self, request):
+        return self.keyword
@@ -0,0 +1,34 @@
+""" Email outbox managers. """
+
+# Django
+from django.db import models
+
+# Utilities
+import json
+
+
+class OutboxEmailManager(models.Manager):
+    """ Outbox email manager.
+
+    Used to handle email enqueuing.
+    """
+
+    def enqueue(self, to, subject, template_name, context, user=None):
+        """ Queue an email to be sent by the outbox task.
+
+        The context must be JSON serializable,
+        it is rendered when the email is sent.
+        """
+
+        return self.create(
+            user=user,
+            to=to,
+            subject=subject,
+            template_name=template_name,
+            context=json.dumps(context),
+        )
+
+    def pending(self, now):
+        """ Return emails due to be sent, oldest first. """
+
+        return self.filter(sent_at__isnull=True, is_failed=False, send_after__lte=now).order_by('send_after', 'pk')
@@ -1,3 +1,4 @@
 # Models
 from .users import User
 from .profiles import Profile
+from .emails import OutboxEmail
@@ -0,0 +1,46 @@
+""" Email outbox model. """
+
+# Django
+from django.db import models
+from django.utils import timezone
+
+# Models
+from cride.utils.models import CRideModel
+from .users import User
+
+# Managers
+from cride.users.managers import OutboxEmailManager
+
+
+class OutboxEmail(CRideModel):
+    """ Outbox email.
+
+    Emails are queued as rows in the same transaction that
+    triggers them and delivered in batches by a celery task,
+    failed deliveries are retried with exponential backoff.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True)
+
+    to = models.EmailField()
+    subject = models.CharField(max_length=255)
+    template_name = models.CharField(max_length=255)
+    context = models.TextField(help_text='JSON encoded template context.')
+
+    # Delivery
+    send_after = models.DateTimeField(default=timezone.now, db_index=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    is_failed = models.BooleanField(
+        'failed',
+        default=False,
+        help_text='Set to true when every delivery attempt failed.'
+    )
+
+    # Manager
+    objects = OutboxEmailManager()
+
+    def __str__(self):
+        """ Return recipient and subject. """
+        return '{}: {}'.format(self.to, self.subject)
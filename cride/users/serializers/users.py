@@ -15,6 +15,10 @@ from rest_framework.validators import UniqueValidator
 # Tasks
 from cride.taskapp.tasks import send_confirmation_email
 
+# Authentication
+from cride.users.authentication import cache_token
+from cride.users.tokens import InvalidToken, decode_token, issue_token_pair, revoke_token
+
 # Serializers
 from cride.users.serializers.profiles import ProfileModelSerializer
 
@@ -24,6 +28,7 @@ from cride.users.models import User, Profile
 # Utilities
 import jwt
 import datetime
+from cride.utils.serializers import CompiledListSerializer, CompiledRepresentationMixin
 
 
 class UserModelSerializer(serializers.ModelSerializer):
@@ -38,6 +43,19 @@ class UserModelSerializer(serializers.ModelSerializer):
         fields = ('username', 'first_name', 'last_name', 'email', 'phone_number', 'profile')
 
 
+class UserReadSerializer(CompiledRepresentationMixin, UserModelSerializer):
+    """ User read serializer.
+
+    Renders like `UserModelSerializer` through a compiled plan,
+    used by detail responses.
+    """
+
+    class Meta(UserModelSerializer.Meta):
+        """ Meta class. """
+
+        list_serializer_class = CompiledListSerializer
+
+
 class UserLoginSerializer(serializers.Serializer):
     """ User login serializer.
 
@@ -66,9 +84,75 @@ class UserLoginSerializer(serializers.Serializer):
 
         token, created = Token.objects.get_or_create(user=self.context['user'])
 
+        # The first authenticated requests won't need to load the user.
+        cache_token(token.key, self.context['user'])
+
         return self.context['user'], token.key
 
 
+class TokenObtainSerializer(UserLoginSerializer):
+    """ JSON Web Tokens obtain serializer.
+
+    Handle the login request data, issuing an access
+    and refresh tokens pair instead of an API token.
+    """
+
+    def create(self, data):
+        """ Issue tokens. """
+
+        return self.context['user'], issue_token_pair(self.context['user'])
+
+
+class TokenRefreshSerializer(serializers.Serializer):
+    """ JSON Web Tokens refresh serializer.
+
+    Exchange a refresh token for a new tokens pair,
+    each refresh token can only be used once.
+    """
+
+    refresh = serializers.CharField()
+
+    def validate_refresh(self, data):
+        """ Verify token is valid. """
+
+        try:
+            self.context['payload'] = decode_token(data, 'refresh')
+        except InvalidToken:
+            raise serializers.ValidationError('Invalid token.')
+
+        return data
+
+    def create(self, data):
+        """ Revoke the refresh token and issue a new pair. """
+
+        payload = self.context['payload']
+        user = User.objects.filter(pk=payload['user_id'], is_active=True).first()
+
+        if user is None or not revoke_token(payload):
+            raise serializers.ValidationError({'refresh': 'Invalid token.'})
+
+        return issue_token_pair(user)
+
+
+class TokenRevokeSerializer(TokenRefreshSerializer):
+    """ JSON Web Tokens revoke serializer.
+
+    Revoke a refresh token and, when the request is
+    authenticated with one, its access token.
+    """
+
+    def create(self, data):
+        """ Revoke tokens. """
+
+        revoke_token(self.context['payload'])
+
+        access = self.context['request'].auth
+        if isinstance(access, dict):
+            revoke_token(access)
+
+        return data
+
+
 class UserSignUpSerializer(serializers.Serializer):
     """ User sign up serializer.
 
@@ -126,7 +210,7 @@ class UserSignUpSerializer(serializers.Serializer):
         user = User.objects.create_user(**data, is_verified=False, is_client=True)
         profile = Profile.objects.create(user=user)
 
-        send_confirmation_email.delay(user_pk=user.pk)
+        send_confirmation_email(user)
 
         return user
 
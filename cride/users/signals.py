@@ -0,0 +1,44 @@
+""" Users signals. """
+
+# Django
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+# Django REST Framework
+from rest_framework.authtoken.models import Token
+
+# Models
+from cride.users.models import User
+
+# Authentication
+from cride.users.authentication import invalidate_token, invalidate_user_tokens
+from cride.users.tokens import revoke_user_tokens
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def token_changed(sender, instance, **kwargs):
+    """ Drop the cached token, i.e. on logout. """
+
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, created, **kwargs):
+    """ Drop the user's cached tokens, i.e. on password changes or deactivation. """
+
+    if not created:
+        invalidate_user_tokens(instance)
+
+
+@receiver(pre_save, sender=User)
+def user_credentials_changed(sender, instance, **kwargs):
+    """ Revoke the user's JSON Web Tokens on password changes or deactivation. """
+
+    if instance.pk is None or not settings.JWT_AUTH_ENABLED:
+        return
+
+    previous = User.objects.filter(pk=instance.pk).values('password', 'is_active').first()
+    if previous and (previous['password'] != instance.password or previous['is_active'] and not instance.is_active):
+        revoke_user_tokens(instance)
@@ -0,0 +1,4 @@
+from .test_emails import OutboxEmailTestCase
+from .test_authentication import CachedTokenAuthenticationTestCase
+from .test_tokens import JWTAuthenticationTestCase
+from .test_middleware import AdminMiddlewareTestCase
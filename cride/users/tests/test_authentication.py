@@ -0,0 +1,86 @@
+""" Token authentication tests. """
+
+# Django
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Model
+from rest_framework.authtoken.models import Token
+from cride.users.models import User, Profile
+
+# Authentication
+from cride.users.authentication import get_token_cache_stats, tokens_stats
+
+
+class CachedTokenAuthenticationTestCase(APITestCase):
+    """ Cached token authentication test case. """
+
+    def setUp(self):
+        cache.clear()
+        tokens_stats.update(hits=0, misses=0)
+
+        self.user = User.objects.create_user(
+            email='mangelo@comparteride.com',
+            username='mangelo',
+            password='comparteride123',
+            is_verified=True,
+        )
+        Profile.objects.create(user=self.user)
+
+        # Auth
+        self.token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION='Token {}'.format(self.token))
+
+        # URL
+        self.url = '/users/{}/'.format(self.user.username)
+
+    def test_token_is_cached(self):
+        # The user is loaded once per token.
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['username'], 'mangelo')
+        self.assertFalse([query for query in queries if 'authtoken_token' in query['sql']])
+        self.assertEqual(get_token_cache_stats(), {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+    def test_login_caches_token(self):
+        self.client.credentials()
+        response = self.client.post('/users/login/', {
+            'email': 'mangelo@comparteride.com',
+            'password': 'comparteride123'
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token {}'.format(response.data['token']))
+        self.client.get(self.url)
+        self.assertEqual(get_token_cache_stats()['misses'], 0)
+
+    def test_logout(self):
+        # Deleted tokens are rejected right away.
+
+        self.client.get(self.url)
+        Token.objects.filter(key=self.token).delete()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_changes(self):
+        # Password changes and deactivations are seen right away.
+
+        self.client.get(self.url)
+
+        self.user.set_password('comparteride456')
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        self.assertEqual(tokens_stats['misses'], 2)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,117 @@
+""" Email outbox tests. """
+
+# Django
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+# Model
+from cride.users.models import User, OutboxEmail
+
+# Tasks
+from cride.taskapp.tasks import drain_email_outbox, send_outbox_batch
+
+# Utilities
+from unittest import mock
+from django.utils import timezone
+
+
+class OutboxEmailTestCase(TestCase):
+    """ Email outbox test case. """
+
+    def setUp(self):
+        cache.clear()
+
+    def signup(self, username):
+        """ Sign up a new user. """
+
+        return self.client.post('/users/signup/', {
+            'email': '{}@comparteride.com'.format(username),
+            'username': username,
+            'phone_number': '+5215512345678',
+            'password': 'comparteride123',
+            'password_confirmation': 'comparteride123',
+            'first_name': 'Miguel',
+            'last_name': 'Angelo',
+        })
+
+    def test_signup_enqueues_email(self):
+        # Sign up must not send the email itself.
+
+        response = self.signup('mangelo')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.user, User.objects.get(username='mangelo'))
+        self.assertEqual(email.to, 'mangelo@comparteride.com')
+
+    @override_settings(EMAIL_OUTBOX_BATCH_SIZE=2)
+    def test_drain_in_batches(self):
+        # Every pending email is sent, in batches, over one connection each.
+
+        for i in range(5):
+            self.signup('member{}'.format(i))
+
+        with mock.patch('cride.taskapp.tasks.get_connection', wraps=mail.get_connection) as get_connection:
+            drain_email_outbox()
+
+        self.assertEqual(get_connection.call_count, 3)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertIn('@member0', mail.outbox[0].body)
+        self.assertFalse(OutboxEmail.objects.filter(sent_at__isnull=True).exists())
+
+        # Sent emails aren't sent again.
+        drain_email_outbox()
+        self.assertEqual(len(mail.outbox), 5)
+
+    @override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2, EMAIL_OUTBOX_RETRY_DELAY=60)
+    def test_retry_with_backoff(self):
+        # Failed emails are retried later until they run out of attempts.
+
+        self.signup('mangelo')
+
+        with mock.patch('django.core.mail.EmailMultiAlternatives.send', side_effect=OSError('Unreachable')):
+            send_outbox_batch(10)
+
+            email = OutboxEmail.objects.get()
+            self.assertEqual(email.attempts, 1)
+            self.assertIn('Unreachable', email.last_error)
+            self.assertGreater(email.send_after, timezone.now())
+
+            # Not due yet.
+            self.assertEqual(send_outbox_batch(10), 0)
+
+            OutboxEmail.objects.update(send_after=timezone.now())
+            send_outbox_batch(10)
+
+        email.refresh_from_db()
+        self.assertEqual(email.attempts, 2)
+        self.assertTrue(email.is_failed)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_drain_debounce(self):
+        # A burst of signups queues a single drain.
+
+        with mock.patch('cride.taskapp.tasks.transaction.on_commit', side_effect=lambda func: func()), \
+                mock.patch('cride.taskapp.tasks.drain_email_outbox.apply_async') as apply_async:
+            for i in range(3):
+                self.signup('member{}'.format(i))
+
+        apply_async.assert_called_once_with(countdown=5)
+        self.assertEqual(OutboxEmail.objects.count(), 3)
+
+    def test_claimed_while_sending(self):
+        # Emails being sent aren't picked by other batches.
+
+        self.signup('mangelo')
+        claimed = []
+
+        def send(*args, **kwargs):
+            claimed.append(send_outbox_batch(10))
+
+        with mock.patch('django.core.mail.EmailMultiAlternatives.send', side_effect=send):
+            self.assertEqual(send_outbox_batch(10), 1)
+
+        self.assertEqual(claimed, [0])
+        self.assertIsNotNone(OutboxEmail.objects.get().sent_at)
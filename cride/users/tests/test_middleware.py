@@ -0,0 +1,61 @@
+""" Admin middleware tests. """
+
+# Django
+from django.core.management import call_command
+from django.test import Client, TestCase
+
+# Model
+from cride.users.models import User
+
+
+class AdminMiddlewareTestCase(TestCase):
+    """ Admin only middleware stack test case. """
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            email='admin@comparteride.com',
+            username='admin',
+            password='comparteride123',
+        )
+        self.client = Client(enforce_csrf_checks=True)
+
+    def test_api_skips_admin_stack(self):
+        response = self.client.post('/users/login/', {
+            'email': 'admin@comparteride.com',
+            'password': 'wrong-password'
+        })
+
+        # No CSRF check, session or user.
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.cookies)
+        self.assertFalse(hasattr(response.wsgi_request, 'session'))
+
+        # The clickjacking header is still set on every response.
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+
+    def test_system_checks(self):
+        # Raises SystemCheckError on errors.
+        call_command('check')
+
+    def test_admin_login(self):
+        response = self.client.get('/admin/login/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+        csrf_token = response.cookies['csrftoken'].value
+
+        # CSRF is enforced.
+        response = self.client.post('/admin/login/', {'username': 'admin@comparteride.com', 'password': 'x'})
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client.post('/admin/login/', {
+            'username': 'admin@comparteride.com',
+            'password': 'comparteride123',
+            'csrfmiddlewaretoken': csrf_token,
+            'next': '/admin/',
+        })
+        self.assertRedirects(response, '/admin/')
+
+        response = self.client.get('/admin/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.wsgi_request.user, self.user)
@@ -0,0 +1,138 @@
+""" JSON Web Tokens authentication tests. """
+
+# Django
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+# Model
+from cride.users.models import User, Profile
+
+
+@override_settings(JWT_AUTH_ENABLED=True, JWT_SIGNING_KEYS={'k1': 'first-secret'}, JWT_SIGNING_KEY_ID='k1')
+class JWTAuthenticationTestCase(APITestCase):
+    """ JSON Web Tokens authentication test case. """
+
+    def setUp(self):
+        cache.clear()
+
+        self.user = User.objects.create_user(
+            email='mangelo@comparteride.com',
+            username='mangelo',
+            password='comparteride123',
+            is_verified=True,
+        )
+        Profile.objects.create(user=self.user)
+
+        # URL
+        self.url = '/users/{}/'.format(self.user.username)
+
+    def obtain(self):
+        """ Return a new tokens pair. """
+
+        response = self.client.post('/users/token/', {
+            'email': 'mangelo@comparteride.com',
+            'password': 'comparteride123'
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        return response.data
+
+    def get(self, access):
+        """ Request the user's detail with an access token. """
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer {}'.format(access))
+        return self.client.get(self.url)
+
+    def test_access_token_authenticates_without_queries(self):
+        tokens = self.obtain()
+
+        # Queries made by the view itself.
+        self.client.force_authenticate(self.user)
+        with CaptureQueriesContext(connection) as view_queries:
+            self.client.get(self.url)
+        self.client.force_authenticate(None)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(tokens['access'])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['username'], 'mangelo')
+        self.assertEqual(len(queries), len(view_queries))
+
+    def test_refresh_token_is_not_an_access_token(self):
+        tokens = self.obtain()
+
+        self.assertEqual(self.get(tokens['refresh']).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.get('garbage').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_key_rotation(self):
+        tokens = self.obtain()
+
+        with self.settings(JWT_SIGNING_KEYS={'k1': 'first-secret', 'k2': 'second-secret'}, JWT_SIGNING_KEY_ID='k2'):
+            self.assertEqual(self.get(tokens['access']).status_code, status.HTTP_200_OK)
+            self.client.credentials()
+            new_tokens = self.obtain()
+
+        with self.settings(JWT_SIGNING_KEYS={'k2': 'second-secret'}, JWT_SIGNING_KEY_ID='k2'):
+            self.assertEqual(self.get(tokens['access']).status_code, status.HTTP_401_UNAUTHORIZED)
+            self.assertEqual(self.get(new_tokens['access']).status_code, status.HTTP_200_OK)
+
+    def test_refresh_rotates_tokens(self):
+        tokens = self.obtain()
+
+        response = self.client.post('/users/token/refresh/', {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.get(response.data['access']).status_code, status.HTTP_200_OK)
+
+        # Refresh tokens are used once.
+        self.client.credentials()
+        response = self.client.post('/users/token/refresh/', {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_revoke(self):
+        tokens = self.obtain()
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer {}'.format(tokens['access']))
+        response = self.client.post('/users/token/revoke/', {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(self.get(tokens['access']).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials()
+        response = self.client.post('/users/token/refresh/', {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_password_change_revokes_tokens(self):
+        tokens = self.obtain()
+
+        self.user.set_password('newpassword123')
+        self.user.save()
+
+        self.assertEqual(self.get(tokens['access']).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials()
+        response = self.client.post('/users/token/refresh/', {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # Tokens issued afterwards are valid.
+        response = self.client.post('/users/token/', {
+            'email': 'mangelo@comparteride.com',
+            'password': 'newpassword123'
+        })
+        self.assertEqual(self.get(response.data['access']).status_code, status.HTTP_200_OK)
+
+    def test_disabled(self):
+        tokens = self.obtain()
+
+        with self.settings(JWT_AUTH_ENABLED=False):
+            self.assertEqual(self.get(tokens['access']).status_code, status.HTTP_401_UNAUTHORIZED)
+            self.client.credentials()
+            response = self.client.post('/users/token/', {
+                'email': 'mangelo@comparteride.com',
+                'password': 'comparteride123'
+            })
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,117 @@
+""" API JSON Web Tokens.
+
+Optional stateless alternative to the `Token` table, enabled with
+`JWT_AUTH_ENABLED`. Clients get a short lived access token and a
+refresh token, both HS256 JWTs signed with the key `JWT_SIGNING_KEY_ID`
+of `JWT_SIGNING_KEYS` and carrying its id in the `kid` header. Tokens
+signed with any configured key are accepted, so keys are rotated by
+adding a new one, making it current and removing the old one once
+its tokens expired.
+
+Revocations live in the shared cache until the revoked tokens expire:
+single tokens by id, on logout and refresh, and every token of a user
+issued before a given time, on password changes and deactivations.
+"""
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+
+# Utilities
+import jwt
+import time
+import uuid
+
+
+class InvalidToken(Exception):
+    """ The token is malformed, expired, revoked or of another type. """
+
+
+def get_signing_keys():
+    """ Return the signing keys by id. """
+
+    return settings.JWT_SIGNING_KEYS or {'default': settings.SECRET_KEY}
+
+
+def encode_token(payload):
+    """ Sign a payload with the current key. """
+
+    key_id = settings.JWT_SIGNING_KEY_ID
+    token = jwt.encode(payload, get_signing_keys()[key_id], algorithm='HS256', headers={'kid': key_id})
+
+    return token.decode()
+
+
+def issue_token(user, token_type, lifetime):
+    """ Return a signed token of the given type for the user. """
+
+    # Sub-second issue times, tokens issued right after a revocation stay valid.
+    now = time.time()
+
+    return encode_token({
+        'type': token_type,
+        'jti': uuid.uuid4().hex,
+        'user_id': user.pk,
+        'username': user.username,
+        'iat': now,
+        'exp': int(now + lifetime.total_seconds()),
+    })
+
+
+def issue_token_pair(user):
+    """ Return a new access and refresh tokens pair for the user. """
+
+    return {
+        'access': issue_token(user, 'access', settings.JWT_ACCESS_TOKEN_LIFETIME),
+        'refresh': issue_token(user, 'refresh', settings.JWT_REFRESH_TOKEN_LIFETIME),
+    }
+
+
+def get_revoked_token_key(jti):
+    """ Return the cache key of a revoked token. """
+
+    return 'users:jwt:revoked:{}'.format(jti)
+
+
+def get_revoked_user_key(user_id):
+    """ Return the cache key of the time before which a user's tokens are revoked. """
+
+    return 'users:jwt:revoked_before:{}'.format(user_id)
+
+
+def decode_token(token, token_type):
+    """ Return the payload of a valid, unrevoked token of the given type or raise InvalidToken. """
+
+    try:
+        key_id = jwt.get_unverified_header(token).get('kid')
+        key = get_signing_keys()[key_id]
+        payload = jwt.decode(token, key, algorithms=['HS256'])
+    except (jwt.PyJWTError, KeyError):
+        raise InvalidToken()
+
+    if payload.get('type') != token_type:
+        raise InvalidToken()
+
+    revoked = cache.get_many([get_revoked_token_key(payload['jti']), get_revoked_user_key(payload['user_id'])])
+
+    if get_revoked_token_key(payload['jti']) in revoked:
+        raise InvalidToken()
+    if payload['iat'] <= revoked.get(get_revoked_user_key(payload['user_id']), 0):
+        raise InvalidToken()
+
+    return payload
+
+
+def revoke_token(payload):
+    """ Revoke a token given its payload, return False if it already was. """
+
+    timeout = max(payload['exp'] - int(time.time()), 1)
+
+    return cache.add(get_revoked_token_key(payload['jti']), True, timeout)
+
+
+def revoke_user_tokens(user):
+    """ Revoke every token issued to the user up to now. """
+
+    timeout = int(settings.JWT_REFRESH_TOKEN_LIFETIME.total_seconds())
+    cache.set(get_revoked_user_key(user.pk), time.time(), timeout)
@@ -1,8 +1,12 @@
 """ User views """
 
+# Django
+from django.conf import settings
+
 # Django REST Framework
 from rest_framework import status, mixins, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 
 # Permissions
@@ -12,14 +16,18 @@ from cride.users.permissions import IsAccountOwner
 # Serializers
 from cride.circles.serializers import CircleModelSerializer
 from cride.users.serializers import (UserLoginSerializer, UserSignUpSerializer, AccountVerificationSerializer,
-                                     UserModelSerializer, ProfileModelSerializer)
+                                     UserModelSerializer, UserReadSerializer, ProfileModelSerializer,
+                                     TokenObtainSerializer, TokenRefreshSerializer, TokenRevokeSerializer)
 
 # Models
 from cride.circles.models import Circle
 from cride.users.models import User
 
+# Utilities
+from cride.utils.transactions import TransactionPolicyMixin
+
 
-class UserViewSet(mixins.RetrieveModelMixin, mixins.UpdateModelMixin, viewsets.GenericViewSet):
+class UserViewSet(TransactionPolicyMixin, mixins.RetrieveModelMixin, mixins.UpdateModelMixin, viewsets.GenericViewSet):
     """ User view set.
 
     Handle sign up, login and account verification.
@@ -32,7 +40,7 @@ class UserViewSet(mixins.RetrieveModelMixin, mixins.UpdateModelMixin, viewsets.G
     def get_permissions(self):
         """ Assign permissions based on action. """
 
-        if self.action in ['signup', 'login', 'verify']:
+        if self.action in ['signup', 'login', 'verify', 'token', 'refresh_token', 'revoke_token']:
             permission_classes = [AllowAny]
         elif self.action in ['retrieve', 'update', 'partial_update']:
             permission_classes = [IsAuthenticated, IsAccountOwner]
@@ -41,6 +49,14 @@ class UserViewSet(mixins.RetrieveModelMixin, mixins.UpdateModelMixin, viewsets.G
 
         return [permissions() for permissions in permission_classes]
 
+    def get_serializer_class(self):
+        """ Return serializer based on action. """
+
+        if self.action == 'retrieve':
+            return UserReadSerializer
+
+        return UserModelSerializer
+
     def retrieve(self, request, *args, **kwargs):
         """ Add extra data to the response. """
 
@@ -74,7 +90,7 @@ class UserViewSet(mixins.RetrieveModelMixin, mixins.UpdateModelMixin, viewsets.G
 
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        data = UserModelSerializer(user).data
+        data = UserReadSerializer(user).data
 
         return Response(data)
 
@@ -92,6 +108,53 @@ class UserViewSet(mixins.RetrieveModelMixin, mixins.UpdateModelMixin, viewsets.G
 
         return Response(data, status=status.HTTP_201_CREATED)
 
+    def check_jwt_enabled(self):
+        """ Hide JSON Web Tokens endpoints unless enabled. """
+
+        if not settings.JWT_AUTH_ENABLED:
+            raise NotFound()
+
+    @action(detail=False, methods=['post'])
+    def token(self, request):
+        """ JSON Web Tokens login API view. """
+
+        self.check_jwt_enabled()
+
+        serializer = TokenObtainSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user, tokens = serializer.save()
+        data = {
+            'user': UserReadSerializer(user).data,
+            'access': tokens['access'],
+            'refresh': tokens['refresh'],
+        }
+
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'], url_path='token/refresh')
+    def refresh_token(self, request):
+        """ JSON Web Tokens refresh API view. """
+
+        self.check_jwt_enabled()
+
+        serializer = TokenRefreshSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.save()
+
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'], url_path='token/revoke')
+    def revoke_token(self, request):
+        """ JSON Web Tokens logout API view. """
+
+        self.check_jwt_enabled()
+
+        serializer = TokenRevokeSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
     @action(detail=False, methods=['post'])
     def signup(self, request):
         """ User sign up API view. """
@@ -99,7 +162,7 @@ class UserViewSet(mixins.RetrieveModelMixin, mixins.UpdateModelMixin, viewsets.G
         serializer = UserSignUpSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        data = UserModelSerializer(user).data
+        data = UserReadSerializer(user).data
 
         return Response(data, status=status.HTTP_201_CREATED)
 
@@ -0,0 +1,74 @@
+""" Cache utilities. """
+
+# Utilities
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """ In-process LRU cache.
+
+    Thread safe, entries expire `timeout` seconds after being set.
+    Used in front of the shared cache for hot, rarely changing values,
+    other processes can't invalidate it so `timeout` bounds how long
+    a stale value can be served.
+    """
+
+    def __init__(self, maxsize=1024, timeout=5):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """ Return the value of a key, or `default` if missing or expired. """
+
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return default
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        """ Set a key, evicting the least recently used one if full. """
+
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.timeout, value)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        """ Remove a key. """
+
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        """ Remove every key and reset stats. """
+
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """ Return hits, misses and hit ratio. """
+
+        total = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+        }
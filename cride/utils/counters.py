@@ -0,0 +1,147 @@
+""" Buffered stats counters.
+
+Stats like `rides_offered` or `rides_taken` are bumped on every ride,
+writing them straight to the database turns hot rows (circles) into
+a write bottleneck. Increments are buffered in the cache instead
+and periodically flushed in batched `F()` updates.
+
+Buffering needs a cache shared by the web processes and the worker
+flushing it, like Redis. With a per process cache, like `LocMemCache`,
+disable `BUFFER_STATS_COUNTERS` and increments are written directly.
+
+Increments are buffered in generations. Each flush starts a new one
+and writes the increments of the generation it retired, then reads
+that generation once more on the next flush, to pick increments made
+while it was being retired, before deleting its counters and registry.
+
+Buffered increments that were not flushed yet are lost if the cache
+is cleared, the `reconcile_stats` command recomputes every counter
+from the rides table.
+"""
+
+# Django
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+# Utilities
+from collections import defaultdict
+
+
+KEY_PREFIX = 'counters'
+GENERATION_KEY = '{}:generation'.format(KEY_PREFIX)
+LOCK_KEY = '{}:lock'.format(KEY_PREFIX)
+LOCK_TIMEOUT = 60
+
+
+def get_generation():
+    """ Return the generation increments are buffered in. """
+
+    return cache.get_or_set(GENERATION_KEY, 0, timeout=None)
+
+
+def counter_key(model, pk, field, generation):
+    """ Return the cache key holding the pending increments of a counter. """
+
+    return '{}:{}:{}:{}:{}'.format(KEY_PREFIX, generation, model._meta.label_lower, pk, field)
+
+
+def sequence_key(generation):
+    """ Return the cache key numbering the registry slots of a generation. """
+
+    return '{}:{}:registry'.format(KEY_PREFIX, generation)
+
+
+def registry_key(generation, slot):
+    """ Return the cache key of a registry slot. """
+
+    return '{}:{}'.format(sequence_key(generation), slot)
+
+
+def register(key, generation):
+    """ Add a counter key to the registry of its generation so it gets flushed. """
+
+    cache.add(sequence_key(generation), 0, timeout=None)
+    slot = cache.incr(sequence_key(generation))
+    cache.set(registry_key(generation, slot), key, timeout=None)
+
+
+def increment(model, pk, **fields):
+    """ Buffer increments for the given counters of a model instance.
+
+    Usage:
+        increment(Circle, circle.pk, rides_taken=1)
+    """
+
+    if not settings.BUFFER_STATS_COUNTERS:
+        model.objects.filter(pk=pk).update(**{field: F(field) + amount for field, amount in fields.items()})
+        return
+
+    generation = get_generation()
+
+    for field, amount in fields.items():
+        key = counter_key(model, pk, field, generation)
+
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            if cache.add(key, amount, timeout=None):
+                register(key, generation)
+            else:
+                cache.incr(key, amount)
+
+
+def get_registry(generation):
+    """ Return the registry keys of a generation and the counter keys they hold. """
+
+    last = cache.get(sequence_key(generation), 0)
+    slots = [registry_key(generation, slot) for slot in range(1, last + 1)]
+
+    return [sequence_key(generation)] + slots, set(cache.get_many(slots).values())
+
+
+def flush():
+    """ Write buffered increments to the database.
+
+    Counters sharing model, field and amount are written in a single
+    update. Return the number of counters flushed, or None when
+    another flush is already running.
+    """
+
+    if not cache.add(LOCK_KEY, 1, timeout=LOCK_TIMEOUT):
+        return None
+
+    try:
+        # New increments go to the next generation from now on.
+        cache.add(GENERATION_KEY, 0, timeout=None)
+        retired = cache.incr(GENERATION_KEY) - 1
+        previous_registry, previous_keys = get_registry(retired - 1)
+        keys = previous_keys | get_registry(retired)[1]
+
+        pending = {key: value for key, value in cache.get_many(keys).items() if value}
+        batches = defaultdict(list)
+
+        for key in pending:
+            _, _, label, pk, field = key.split(':')
+            batches[(label, field, pending[key])].append(pk)
+
+        with transaction.atomic():
+            for (label, field, amount), pks in batches.items():
+                model = apps.get_model(label)
+                model.objects.filter(pk__in=pks).update(**{field: F(field) + amount})
+
+        for key, value in pending.items():
+            try:
+                cache.decr(key, value)
+            except ValueError:
+                # Evicted after being read.
+                pass
+
+        # Read by the last two flushes, nothing writes to it anymore.
+        cache.delete_many(previous_registry + list(previous_keys))
+    finally:
+        cache.delete(LOCK_KEY)
+
+    return len(pending)
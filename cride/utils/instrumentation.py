@@ -0,0 +1,178 @@
+""" Requests instrumentation.
+
+`InstrumentationMiddleware` records, for each request, the number of
+queries and the time spent in the database, rendering read serializers
+and in the view, keyed by view set and action (`RideViewSet.list`).
+The view time includes the response's rendering and middleware.
+
+Timings are sent back in a `Server-Timing` header and aggregated per
+key in `stats`. Requests over `INSTRUMENTATION_SLOW_REQUEST_MS` milliseconds or
+`INSTRUMENTATION_SLOW_REQUEST_QUERIES` queries are logged to the
+`cride.instrumentation` logger as JSON records.
+
+Enabled with `INSTRUMENTATION_ENABLED`, otherwise the middleware
+removes itself on start up.
+"""
+
+# Django
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+# Utilities
+import contextlib
+import json
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger('cride.instrumentation')
+
+stats = {}
+
+local = threading.local()
+
+
+class Recorder:
+    """ Timings of the request being handled. """
+
+    def __init__(self):
+        self.key = None
+        self.queries = 0
+        self.db = 0.0
+        self.serializer = 0.0
+        self.view_start = None
+        self.depth = 0
+
+    def execute(self, execute, sql, params, many, context):
+        """ Database execute wrapper counting queries and their time. """
+
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - start
+            self.queries += 1
+
+
+@contextlib.contextmanager
+def serializer_timer():
+    """ Add the time spent in the block to the serializer time.
+
+    Nested blocks are only counted once.
+    """
+
+    recorder = getattr(local, 'recorder', None)
+
+    if recorder is None:
+        yield
+        return
+
+    recorder.depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.depth -= 1
+        if not recorder.depth:
+            recorder.serializer += time.perf_counter() - start
+
+
+def get_view_key(view_func, method):
+    """ Return the view set and action, or view name, of a view function. """
+
+    cls = getattr(view_func, 'cls', None)
+
+    if cls is None:
+        return '{}.{}'.format(view_func.__module__, view_func.__name__)
+
+    actions = getattr(view_func, 'actions', None) or {}
+
+    return '{}.{}'.format(cls.__name__, actions.get(method.lower(), method.lower()))
+
+
+def get_instrumentation_stats():
+    """ Return requests, queries and average timings in milliseconds per view. """
+
+    return {
+        key: dict(
+            entry,
+            queries_avg=entry['queries'] / entry['requests'],
+            db_avg=entry['db'] / entry['requests'],
+            serializer_avg=entry['serializer'] / entry['requests'],
+            view_avg=entry['view'] / entry['requests'],
+            total_avg=entry['total'] / entry['requests'],
+        )
+        for key, entry in stats.items()
+    }
+
+
+class InstrumentationMiddleware:
+    """ Record queries and timings of every request.
+
+    Should be the first middleware so the total time covers the others.
+    """
+
+    def __init__(self, get_response):
+        if not settings.INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = local.recorder = Recorder()
+        start = time.perf_counter()
+
+        try:
+            with contextlib.ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(recorder.execute))
+
+                response = self.get_response(request)
+        finally:
+            del local.recorder
+
+        end = time.perf_counter()
+
+        if recorder.key is not None:
+            self.record(request, response, recorder, end - recorder.view_start, end - start)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        recorder = local.recorder
+        recorder.key = get_view_key(view_func, request.method)
+        recorder.view_start = time.perf_counter()
+
+    def record(self, request, response, recorder, view, total):
+        """ Add the Server-Timing header, aggregate and log slow requests. """
+
+        timings = {
+            'db': recorder.db * 1000,
+            'serializer': recorder.serializer * 1000,
+            'view': view * 1000,
+            'total': total * 1000,
+        }
+
+        response['Server-Timing'] = ', '.join(
+            '{};dur={:.2f}'.format(name, duration) for name, duration in timings.items()
+        ) + ', queries;desc="{}"'.format(recorder.queries)
+
+        entry = stats.setdefault(recorder.key, dict.fromkeys(('requests', 'queries') + tuple(timings), 0))
+        entry['requests'] += 1
+        entry['queries'] += recorder.queries
+        for name, duration in timings.items():
+            entry[name] += duration
+
+        if (timings['total'] >= settings.INSTRUMENTATION_SLOW_REQUEST_MS or
+                recorder.queries >= settings.INSTRUMENTATION_SLOW_REQUEST_QUERIES):
+            record = dict(
+                {name: round(duration, 2) for name, duration in timings.items()},
+                view=recorder.key,
+                method=request.method,
+                path=request.path,
+                status=response.status_code,
+                queries=recorder.queries,
+            )
+            logger.warning(json.dumps(record), extra={'instrumentation': record})
@@ -0,0 +1,82 @@
+""" Middleware utilities.
+
+The API authenticates with tokens and never touches sessions, CSRF
+cookies or messages, only the admin does. `AdminMiddleware` runs
+the `ADMIN_MIDDLEWARE` stack for requests under `ADMIN_URL` and skips
+it for every other route, which only go through `MIDDLEWARE`.
+"""
+
+# Django
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+
+
+class AdminMiddleware:
+    """ Run the `ADMIN_MIDDLEWARE` stack on admin requests only.
+
+    The stack is loaded like Django loads `MIDDLEWARE`, in the
+    position this middleware takes in it. View, template response
+    and exception hooks of the stack are called for admin requests.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = '/{}'.format(settings.ADMIN_URL)
+        self.view_middleware = []
+        self.template_response_middleware = []
+        self.exception_middleware = []
+
+        handler = get_response
+        for middleware_path in reversed(settings.ADMIN_MIDDLEWARE):
+            try:
+                mw_instance = import_string(middleware_path)(handler)
+            except MiddlewareNotUsed:
+                continue
+
+            if mw_instance is None:
+                raise ImproperlyConfigured('Middleware factory {} returned None.'.format(middleware_path))
+
+            if hasattr(mw_instance, 'process_view'):
+                self.view_middleware.insert(0, mw_instance.process_view)
+            if hasattr(mw_instance, 'process_template_response'):
+                self.template_response_middleware.append(mw_instance.process_template_response)
+            if hasattr(mw_instance, 'process_exception'):
+                self.exception_middleware.append(mw_instance.process_exception)
+
+            handler = convert_exception_to_response(mw_instance)
+
+        self.admin_response = handler
+
+    def is_admin(self, request):
+        """ Return whether the request is for the admin. """
+
+        return request.path_info.startswith(self.prefix)
+
+    def __call__(self, request):
+        if self.is_admin(request):
+            return self.admin_response(request)
+
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_admin(request):
+            for process_view in self.view_middleware:
+                response = process_view(request, view_func, view_args, view_kwargs)
+                if response is not None:
+                    return response
+
+    def process_template_response(self, request, response):
+        if self.is_admin(request):
+            for process_template_response in self.template_response_middleware:
+                response = process_template_response(request, response)
+
+        return response
+
+    def process_exception(self, request, exception):
+        if self.is_admin(request):
+            for process_exception in self.exception_middleware:
+                response = process_exception(request, exception)
+                if response is not None:
+                    return response
@@ -0,0 +1,176 @@
+""" Pagination utilities. """
+
+# Django
+from django.db.models import Q
+
+# Django REST Framework
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+# Utilities
+import base64
+import json
+from collections import OrderedDict
+
+
+class KeysetPagination(BasePagination):
+    """ Keyset pagination.
+
+    Pages are fetched filtering past the last row of the previous page
+    on the queryset's ordering, with the primary key as tie breaker,
+    instead of using an offset. Every page costs the same no matter
+    how deep it is and no `COUNT(*)` is run, in exchange pages
+    can only be walked forward.
+    """
+
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def get_page_size(self, request):
+        """ Return the requested page size, bounded by `max_page_size`. """
+
+        try:
+            page_size = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """ Return the queryset's ordering, ending with the primary key. """
+
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        pk_name = queryset.model._meta.pk.name
+
+        if not any(field.lstrip('-') in ('pk', pk_name) for field in ordering):
+            descending = ordering and ordering[-1].startswith('-')
+            ordering.append('-' + pk_name if descending else pk_name)
+
+        return ordering
+
+    def get_model_field(self, queryset, name):
+        """ Return the model field an ordering name refers to. """
+
+        name = name.lstrip('-')
+        opts = queryset.model._meta
+
+        return opts.pk if name == 'pk' else opts.get_field(name)
+
+    def encode_cursor(self, values):
+        """ Return the opaque cursor for the given ordering values. """
+
+        data = json.dumps(values, default=lambda value: value.isoformat()).encode()
+
+        return base64.urlsafe_b64encode(data).decode()
+
+    def decode_cursor(self, queryset, ordering, cursor):
+        """ Return the ordering values held by a cursor. """
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            assert isinstance(values, list) and len(values) == len(ordering)
+
+            return [
+                self.get_model_field(queryset, name).to_python(value)
+                for name, value in zip(ordering, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def filter_after(self, ordering, values):
+        """ Return the condition matching rows sorted after the given values.
+
+        The first ordering field is bounded on its own as well, so
+        the index on it is used to seek instead of scanning every row.
+        """
+
+        condition = Q()
+
+        for i, (name, value) in enumerate(zip(ordering, values)):
+            field = name.lstrip('-')
+            lookup = '{}__{}'.format(field, 'lt' if name.startswith('-') else 'gt')
+            previous = {prev.lstrip('-'): prev_value for prev, prev_value in zip(ordering[:i], values[:i])}
+
+            condition |= Q(**previous) & Q(**{lookup: value})
+
+        first = ordering[0]
+        bound = '{}__{}'.format(first.lstrip('-'), 'lte' if first.startswith('-') else 'gte')
+
+        return Q(**{bound: values[0]}) & condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        ordering = self.get_ordering(queryset)
+        queryset = queryset.order_by(*ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            values = self.decode_cursor(queryset, ordering, cursor)
+            queryset = queryset.filter(self.filter_after(ordering, values))
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if self.has_next:
+            last = self.page[-1]
+            self.next_values = [
+                self.get_model_field(queryset, name).value_from_object(last)
+                for name in ordering
+            ]
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_values))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+
+class KeysetOrLimitOffsetPagination(LimitOffsetPagination):
+    """ Limit/offset pagination that switches to keyset pagination on request.
+
+    Clients opt in with `?pagination=keyset`, `next` links keep
+    them in keyset mode through the `cursor` parameter.
+    """
+
+    mode_query_param = 'pagination'
+    keyset_class = KeysetPagination
+
+    def use_keyset(self, request):
+        """ Return whether the client asked for keyset pagination. """
+
+        return (
+            request.query_params.get(self.mode_query_param) == 'keyset' or
+            self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.keyset_class() if self.use_keyset(request) else None
+
+        if self.keyset:
+            return self.keyset.paginate_queryset(queryset, request, view=view)
+
+        return super(KeysetOrLimitOffsetPagination, self).paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        if self.keyset:
+            return self.keyset.get_paginated_response(data)
+
+        return super(KeysetOrLimitOffsetPagination, self).get_paginated_response(data)
@@ -0,0 +1,68 @@
+""" Queryset utilities. """
+
+# Django
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+
+# Django REST Framework
+from rest_framework import serializers
+
+
+def get_related_lookups(serializer, model, prefix=''):
+    """ Walk a serializer tree and return the lookups it will traverse.
+
+    Return a tuple of (select_related, prefetch_related) lookups needed
+    to render `serializer` over instances of `model` without issuing
+    a query per object. Single-valued relations rendered by a nested
+    serializer or a related field are joined, while many-valued
+    relations are prefetched using a `Prefetch` object whose queryset
+    is itself planned from the nested serializer.
+    """
+
+    select_related, prefetch_related = [], []
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*' or '.' in field.source:
+            continue
+
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+
+        if not model_field.is_relation:
+            continue
+
+        lookup = prefix + field.source
+        related_model = model_field.related_model
+
+        if isinstance(field, serializers.ListSerializer):
+            child_select, child_prefetch = get_related_lookups(field.child, related_model)
+            queryset = related_model._default_manager.select_related(*child_select).prefetch_related(*child_prefetch)
+            prefetch_related.append(Prefetch(lookup, queryset=queryset))
+        elif isinstance(field, serializers.ManyRelatedField):
+            prefetch_related.append(lookup)
+        elif isinstance(field, serializers.BaseSerializer):
+            child_select, child_prefetch = get_related_lookups(field, related_model, prefix=lookup + '__')
+            select_related.append(lookup)
+            select_related.extend(child_select)
+            prefetch_related.extend(child_prefetch)
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            # The key is read from the local column, nothing to join.
+            continue
+        elif isinstance(field, serializers.RelatedField):
+            select_related.append(lookup)
+
+    return select_related, prefetch_related
+
+
+def plan_queryset(queryset, serializer_class):
+    """ Return `queryset` ready to be rendered by `serializer_class`.
+
+    The number of queries needed to serialize the result
+    stays constant regardless of how many objects it holds.
+    """
+
+    select_related, prefetch_related = get_related_lookups(serializer_class(), queryset.model)
+
+    return queryset.select_related(*select_related).prefetch_related(*prefetch_related)
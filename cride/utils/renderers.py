@@ -0,0 +1,69 @@
+""" JSON renderers and parsers.
+
+Encode and decode JSON with orjson when it's installed, falling
+back to DRF's stdlib based implementation otherwise. Output is the
+same as `rest_framework.renderers.JSONRenderer`'s compact output.
+"""
+
+# Django REST Framework
+from rest_framework import renderers, parsers
+from rest_framework.exceptions import ParseError
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Dates are left to DRF's encoder, which formats them differently.
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+encoder = encoders.JSONEncoder()
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """ JSON renderer backed by orjson.
+
+    Indented responses, like the browsable API's, or settings
+    orjson can't honor are rendered by DRF's renderer.
+    """
+
+    def use_orjson(self, accepted_media_type, renderer_context):
+        """ Return whether orjson can render the response. """
+
+        return (
+            orjson is not None and
+            self.get_indent(accepted_media_type, renderer_context or {}) is None and
+            api_settings.COMPACT_JSON and
+            api_settings.UNICODE_JSON
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        if not self.use_orjson(accepted_media_type, renderer_context):
+            return super(FastJSONRenderer, self).render(data, accepted_media_type, renderer_context)
+
+        # orjson leaves U+2028 and U+2029 unescaped, like JSONRenderer
+        # does with `ensure_ascii` off before it replaces them.
+        ret = orjson.dumps(data, default=encoder.default, option=ORJSON_OPTIONS)
+
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONParser(parsers.JSONParser):
+    """ JSON parser backed by orjson. """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', 'utf-8')
+
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super(FastJSONParser, self).parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,110 @@
+""" Read replica routing.
+
+Reads of list and retrieve actions, `REPLICA_ACTIONS`, are sent to
+the `REPLICA_DATABASE` alias once the request is authenticated,
+everything else, writes and authentication included, goes to the
+primary database.
+
+Replicas lag behind, so users are pinned to the primary for
+`REPLICA_PIN_SECONDS` after each successful write request and read
+their own writes. Pins live in the shared cache.
+
+`ReplicaMiddleware` tracks the request being handled and pins
+users, `ReplicaRouter` routes the queries. Both do nothing unless
+`REPLICA_DATABASE` is set.
+"""
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+
+# Django REST Framework
+from rest_framework.permissions import SAFE_METHODS
+
+# Utilities
+import threading
+
+
+local = threading.local()
+
+
+def get_pin_key(user):
+    """ Return the cache key of a user's pin to the primary. """
+
+    return 'replicas:pin:{}'.format(user.pk)
+
+
+def pin_user(user):
+    """ Send the user's reads to the primary for a while. """
+
+    cache.set(get_pin_key(user), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user):
+    """ Return whether the user's reads go to the primary. """
+
+    return cache.get(get_pin_key(user), False)
+
+
+def get_read_database(request):
+    """ Return the alias reads of a request go to, None for the primary.
+
+    Decided once the request is authenticated, when DRF sets its user.
+    """
+
+    if not getattr(request, 'replica_reads', False) or 'user' not in request.__dict__:
+        return None
+
+    if not hasattr(request, 'read_database'):
+        user = request.user
+        request.read_database = None if user.is_authenticated and is_pinned(user) else settings.REPLICA_DATABASE
+
+    return request.read_database
+
+
+class ReplicaRouter:
+    """ Route the reads of the current request's read actions to the replica. """
+
+    def db_for_read(self, model, **hints):
+        request = getattr(local, 'request', None)
+
+        return get_read_database(request) if request is not None else None
+
+    def db_for_write(self, model, **hints):
+        # Objects read from the replica are saved to the primary.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every database is a copy of the primary.
+        return True
+
+
+class ReplicaMiddleware:
+    """ Track the request being handled and pin users after writes. """
+
+    def __init__(self, get_response):
+        if not settings.REPLICA_DATABASE:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        local.request = request
+
+        try:
+            response = self.get_response(request)
+        finally:
+            local.request = None
+
+        user = request.__dict__.get('user')
+
+        if request.method not in SAFE_METHODS and response.status_code < 400 and user and user.is_authenticated:
+            pin_user(user)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        actions = getattr(view_func, 'actions', None) or {}
+        request.replica_reads = actions.get(request.method.lower()) in settings.REPLICA_ACTIONS
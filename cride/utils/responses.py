@@ -0,0 +1,144 @@
+""" Response caching.
+
+Read actions of a view set render the same data for every user
+until the underlying models change. `ResponseCacheMixin` caches
+the data of those responses in the shared cache, keyed by the
+absolute URL including query and pagination params, with an
+ETag so unchanged responses are answered with a 304.
+
+Keys embed a per namespace version, `invalidate_responses` bumps
+it making every cached response of the namespace unreachable,
+entries left behind expire after their timeout.
+"""
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.response import Response
+
+# Utilities
+import hashlib
+import json
+from collections import defaultdict
+
+
+stats = defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+
+def get_version_key(namespace):
+    """ Return the cache key holding a namespace's version. """
+
+    return 'responses:{}:version'.format(namespace)
+
+
+def get_version(namespace):
+    """ Return the current version of a namespace. """
+
+    key = get_version_key(namespace)
+    cache.add(key, 1, timeout=None)
+
+    return cache.get(key, 1)
+
+
+def invalidate_responses(namespace):
+    """ Drop every cached response of a namespace. """
+
+    key = get_version_key(namespace)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def get_etag(data):
+    """ Return the ETag of the given response data. """
+
+    content = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True).encode()
+
+    return '"{}"'.format(hashlib.md5(content).hexdigest())
+
+
+def get_response_cache_stats(namespace):
+    """ Return hits, misses and hit ratio of a namespace. """
+
+    total = stats[namespace]['hits'] + stats[namespace]['misses']
+
+    return dict(stats[namespace], hit_ratio=stats[namespace]['hits'] / total if total else 0.0)
+
+
+class ResponseCacheMixin:
+    """ Cache the responses of the view set's `cached_actions`.
+
+    Only for actions whose output doesn't depend on the requesting
+    user. Authentication and permissions still run on every request.
+    """
+
+    cached_actions = ('list', 'retrieve')
+    response_cache_namespace = None
+    response_cache_timeout = None
+
+    def get_response_cache_key(self, request):
+        """ Return the cache key of the request's response. """
+
+        url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+
+        return 'responses:{}:{}:{}:{}'.format(
+            self.response_cache_namespace,
+            get_version(self.response_cache_namespace),
+            self.action,
+            url,
+        )
+
+    def get_cached_response(self, request, render):
+        """ Return the cached response of the request, rendering and caching it on misses. """
+
+        namespace = self.response_cache_namespace
+        key = self.get_response_cache_key(request)
+        entry = cache.get(key)
+
+        if entry is None:
+            stats[namespace]['misses'] += 1
+            response = render()
+
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+            entry = (get_etag(response.data), response.data)
+            timeout = self.response_cache_timeout or settings.RESPONSE_CACHE_TIMEOUT
+            cache.set(key, entry, timeout)
+        else:
+            stats[namespace]['hits'] += 1
+
+        etag, data = entry
+
+        if etag in [tag.strip() for tag in request.META.get('HTTP_IF_NONE_MATCH', '').split(',')]:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+
+        response['ETag'] = etag
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        if 'list' not in self.cached_actions:
+            return super(ResponseCacheMixin, self).list(request, *args, **kwargs)
+
+        return self.get_cached_response(
+            request,
+            lambda: super(ResponseCacheMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        if 'retrieve' not in self.cached_actions:
+            return super(ResponseCacheMixin, self).retrieve(request, *args, **kwargs)
+
+        return self.get_cached_response(
+            request,
+            lambda: super(ResponseCacheMixin, self).retrieve(request, *args, **kwargs)
+        )
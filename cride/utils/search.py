@@ -0,0 +1,160 @@
+""" Full text search.
+
+DRF's `SearchFilter` compiles to `UPPER(field) LIKE UPPER('%term%')`
+over every search field, which can't use regular indexes. Searchable
+models register their fields here and views use `FullTextSearchFilter`
+instead:
+
+    + PostgreSQL: `ILIKE` over trigram GIN indexes on every field,
+      created by the models migrations. Terms match anywhere in the
+      fields, like DRF's filter.
+    + SQLite: an external content FTS5 table kept current by triggers,
+      installed after every migration run. Terms match the start of
+      words only, ignoring diacritics: "coyo" finds "Coyoacán" but
+      "yoac" doesn't. FTS5's trigram tokenizer would match substrings
+      but is slower than a scan for terms found in most rows.
+
+SQLite is only used for development and tests. Models that aren't
+registered, or other databases, fall back to DRF's `SearchFilter`.
+"""
+
+# Django
+from django.db import connections
+from django.db.models.signals import post_migrate
+
+# Django REST Framework
+from rest_framework.filters import SearchFilter
+
+
+indexes = {}
+
+
+def register(model, fields):
+    """ Make `fields` of `model` searchable. """
+
+    indexes[model] = tuple(fields)
+    post_migrate.connect(install_sqlite_indexes, dispatch_uid='cride.utils.search')
+
+
+def get_search_table(model):
+    """ Return the name of the SQLite FTS5 table of a model. """
+
+    return '{}_search'.format(model._meta.db_table)
+
+
+def install_sqlite_indexes(sender, using='default', **kwargs):
+    """ Create the FTS5 table and its triggers for every searchable model of the app.
+
+    Statements are idempotent, since SQLite drops a table's triggers
+    whenever a migration rebuilds it they are recreated after
+    every migration run.
+    """
+
+    connection = connections[using]
+
+    if connection.vendor != 'sqlite':
+        return
+
+    for model, fields in indexes.items():
+        if model._meta.app_label != sender.label:
+            continue
+
+        table = model._meta.db_table
+        search_table = get_search_table(model)
+        columns = ', '.join(model._meta.get_field(field).column for field in fields)
+        new_values = ', '.join('new.' + model._meta.get_field(field).column for field in fields)
+        old_values = ', '.join('old.' + model._meta.get_field(field).column for field in fields)
+
+        statements = [
+            "CREATE VIRTUAL TABLE IF NOT EXISTS {search_table} USING fts5({columns}, content='{table}', "
+            "content_rowid='{pk}', tokenize='unicode61 remove_diacritics 1')",
+            "CREATE TRIGGER IF NOT EXISTS {search_table}_insert AFTER INSERT ON {table} BEGIN "
+            "INSERT INTO {search_table}(rowid, {columns}) VALUES (new.{pk}, {new_values}); END",
+            "CREATE TRIGGER IF NOT EXISTS {search_table}_delete AFTER DELETE ON {table} BEGIN "
+            "INSERT INTO {search_table}({search_table}, rowid, {columns}) VALUES ('delete', old.{pk}, {old_values}); "
+            "END",
+            "CREATE TRIGGER IF NOT EXISTS {search_table}_update AFTER UPDATE OF {columns} ON {table} BEGIN "
+            "INSERT INTO {search_table}({search_table}, rowid, {columns}) VALUES ('delete', old.{pk}, {old_values}); "
+            "INSERT INTO {search_table}(rowid, {columns}) VALUES (new.{pk}, {new_values}); END",
+            "INSERT INTO {search_table}({search_table}) VALUES ('rebuild')",
+        ]
+
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement.format(
+                    table=table,
+                    pk=model._meta.pk.column,
+                    search_table=search_table,
+                    columns=columns,
+                    new_values=new_values,
+                    old_values=old_values,
+                ))
+
+
+class PostgresSearchBackend:
+    """ Match terms as substrings of the trigram indexed fields. """
+
+    def filter(self, queryset, fields, terms):
+        model = queryset.model
+        table = model._meta.db_table
+        connection = connections[queryset.db]
+        columns = ['"{}"."{}"'.format(table, model._meta.get_field(field).column) for field in fields]
+
+        for term in terms:
+            like = '%{}%'.format(connection.ops.prep_for_like_query(term))
+            conditions = ['{} ILIKE %s'.format(column) for column in columns]
+
+            queryset = queryset.extra(where=['({})'.format(' OR '.join(conditions))], params=[like] * len(columns))
+
+        return queryset
+
+
+class SQLiteSearchBackend:
+    """ Match terms as word prefixes through the FTS5 table. """
+
+    def filter(self, queryset, fields, terms):
+        model = queryset.model
+        columns = ' '.join(model._meta.get_field(field).column for field in fields)
+        query = ' AND '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+        search_table = get_search_table(model)
+
+        return queryset.extra(
+            where=['"{}"."{}" IN (SELECT rowid FROM {table} WHERE {table} MATCH %s)'.format(
+                model._meta.db_table,
+                model._meta.pk.column,
+                table=search_table
+            )],
+            params=['{{{}}} : ({})'.format(columns, query)],
+        )
+
+
+class FullTextSearchFilter(SearchFilter):
+    """ Drop-in replacement of DRF's `SearchFilter` backed by the database's full text search. """
+
+    backends = {
+        'postgresql': PostgresSearchBackend,
+        'sqlite': SQLiteSearchBackend,
+    }
+
+    def get_backend(self, queryset):
+        """ Return the search backend for the queryset's database, if any. """
+
+        if queryset.model not in indexes:
+            return None
+
+        backend_class = self.backends.get(connections[queryset.db].vendor)
+
+        return backend_class() if backend_class else None
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        backend = self.get_backend(queryset)
+
+        if not search_fields or not search_terms:
+            return queryset
+
+        if backend is None or not set(search_fields) <= set(indexes[queryset.model]):
+            return super(FullTextSearchFilter, self).filter_queryset(request, queryset, view)
+
+        return backend.filter(queryset, search_fields, search_terms)
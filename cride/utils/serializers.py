@@ -0,0 +1,153 @@
+""" Serializer utilities.
+
+Rendering a list through a `ModelSerializer` introspects the model
+to build its fields on every request, then resolves and converts
+every field of every object through several layers of calls.
+
+Read serializers built with `CompiledRepresentationMixin` render
+through a plan compiled once per serializer class: a flat list of
+(name, getter, converter) steps with nested serializers inlined.
+Output is the same as the serializer they extend, field by field.
+"""
+
+# Django
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+
+# Django REST Framework
+from rest_framework import serializers
+from rest_framework.fields import Field, SkipField, get_attribute
+from rest_framework.relations import HyperlinkedRelatedField, PKOnlyObject
+from rest_framework.settings import api_settings
+
+# Utilities
+from collections import OrderedDict
+from cride.utils.instrumentation import serializer_timer
+
+
+plans = {}
+
+
+def represent_file(field, value, context):
+    """ Represent a file like `FileField.to_representation`, using the rendering context's request. """
+
+    if not value:
+        return None
+
+    if not getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+        return value.name
+
+    try:
+        url = value.url
+    except AttributeError:
+        return None
+
+    request = context.get('request', None)
+
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def compile_field(field):
+    """ Return a function converting an attribute value like `field.to_representation`. """
+
+    if isinstance(field, serializers.ListSerializer):
+        plan = compile_serializer(field.child)
+
+        def represent(value, context):
+            iterable = value.all() if isinstance(value, models.Manager) else value
+            return [render(plan, item, context) for item in iterable]
+
+        return represent
+
+    if isinstance(field, serializers.BaseSerializer):
+        plan = compile_serializer(field)
+        return lambda value, context: render(plan, value, context)
+
+    if isinstance(field, serializers.FileField):
+        return lambda value, context: represent_file(field, value, context)
+
+    if isinstance(field, (HyperlinkedRelatedField, serializers.SerializerMethodField)):
+        raise ImproperlyConfigured('Fields depending on the serializer context can not be compiled.')
+
+    to_representation = field.to_representation
+    return lambda value, context: to_representation(value)
+
+
+def compile_serializer(serializer):
+    """ Return the rendering plan of a serializer instance's readable fields. """
+
+    return [
+        (
+            field.field_name,
+            field,
+            field.source_attrs,
+            # Fields overriding `get_attribute` need it called.
+            type(field).get_attribute is Field.get_attribute,
+            compile_field(field),
+        )
+        for field in serializer._readable_fields
+    ]
+
+
+def get_plan(serializer):
+    """ Return the cached rendering plan of a serializer's class.
+
+    Compiled from an instance of its own, fields don't
+    keep a reference to the rendering context.
+    """
+
+    serializer_class = type(serializer)
+    plan = plans.get(serializer_class)
+
+    if plan is None:
+        plan = plans[serializer_class] = compile_serializer(serializer_class())
+
+    return plan
+
+
+def render(plan, instance, context):
+    """ Render an instance following a plan, like `Serializer.to_representation`. """
+
+    ret = OrderedDict()
+
+    for name, field, source_attrs, plain, represent in plan:
+        try:
+            if plain:
+                try:
+                    attribute = get_attribute(instance, source_attrs)
+                except (KeyError, AttributeError):
+                    # Let the field apply its default or skip itself.
+                    attribute = field.get_attribute(instance)
+            else:
+                attribute = field.get_attribute(instance)
+        except SkipField:
+            continue
+
+        check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+        ret[name] = None if check_for_none is None else represent(attribute, context)
+
+    return ret
+
+
+class CompiledListSerializer(serializers.ListSerializer):
+    """ List serializer rendering its items through the child's compiled plan. """
+
+    def to_representation(self, data):
+        plan = get_plan(self.child)
+        iterable = data.all() if isinstance(data, models.Manager) else data
+
+        with serializer_timer():
+            return [render(plan, item, self.context) for item in iterable]
+
+
+class CompiledRepresentationMixin:
+    """ Render through a compiled plan of the serializer's fields.
+
+    Serializers using it must set `list_serializer_class` to
+    `CompiledListSerializer` in their `Meta`. Only for serializers
+    whose fields don't change between instances.
+    """
+
+    def to_representation(self, instance):
+        with serializer_timer():
+            return render(get_plan(self), instance, self.context)
@@ -0,0 +1,66 @@
+""" Transaction policies.
+
+With `ATOMIC_REQUESTS` every request, reads included, runs in a
+transaction held until the view returns. `TransactionPolicyMixin`
+decides per action instead: actions with an unsafe method and the
+view set's `atomic_actions` run in a transaction, rolled back when
+the view fails or answers with an error. Every other action runs in
+autocommit, or in a read only transaction on PostgreSQL when
+`READ_ONLY_TRANSACTIONS` is on. Reads routed to the replica, see
+`cride.utils.replicas`, stay in autocommit: the transaction would be
+opened on the primary.
+
+Responses are rendered after the transaction ends, in both cases.
+"""
+
+# Django
+from django.conf import settings
+from django.db import connection, transaction
+
+# Django REST Framework
+from rest_framework.permissions import SAFE_METHODS
+
+
+class TransactionPolicyMixin:
+    """ Run write actions in a transaction and read actions in autocommit.
+
+    `atomic_actions` lists actions with a safe method that write anyway.
+    """
+
+    atomic_actions = ()
+
+    def is_atomic(self, request):
+        """ Return whether the requested action writes. """
+
+        action = getattr(self, 'action_map', {}).get(request.method.lower())
+
+        return request.method not in SAFE_METHODS or action in self.atomic_actions
+
+    def is_read_only(self, request):
+        """ Return whether the requested read action runs in a read only transaction. """
+
+        return (
+            settings.READ_ONLY_TRANSACTIONS and
+            connection.vendor == 'postgresql' and
+            not connection.in_atomic_block and
+            not getattr(request, 'replica_reads', False)
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.is_atomic(request):
+            with transaction.atomic():
+                response = super(TransactionPolicyMixin, self).dispatch(request, *args, **kwargs)
+
+                # Handled exceptions and error responses returned by the action alike.
+                if response.status_code >= 400:
+                    transaction.set_rollback(True)
+
+            return response
+
+        if self.is_read_only(request):
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute('SET TRANSACTION READ ONLY')
+                return super(TransactionPolicyMixin, self).dispatch(request, *args, **kwargs)
+
+        return super(TransactionPolicyMixin, self).dispatch(request, *args, **kwargs)